@@ -1,58 +1,103 @@
 # app/app.py
-import streamlit as st
-import pandas as pd
-from pathlib import Path
-import hashlib
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from langdetect import detect, detect_langs, LangDetectException, DetectorFactory
+import time
 
-from prompts import SYSTEM_PROMPT, EXIT_KEYWORDS, FIELD_ORDER, FIELD_QUESTIONS
-from helpers import (
-    llm_chat, extract_candidate_json, generate_tech_questions,
-    Candidate, validate_email, validate_phone, clean_list
-)
+import streamlit as st
 
-# Make langdetect deterministic
-DetectorFactory.seed = 0
+from prompts import LANG_NAMES
+from helpers import Candidate, DATA_DIR
+from engine import ScreeningSession, iter_turn
+from llm_client import ClientManager, set_manager
+from storage import CandidateStore, candidate_row, open_store
+from preview import PAGE_SIZE, make_preview, page, page_count
+from metrics import configure_logging, set_readiness_probe, start_metrics_server
+from resources import warm_up, warm_up_in_background
+from background import SentimentTimeline, WriteBehind, get_executor, mood
+from session_store import SessionStore
+from archive import ARCHIVE_ENABLED, archive_writes
+from search import JobQuery, SkillIndex, result_rows
+from stream_render import StreamRenderer
 
 # ---------------------------- App / Paths ----------------------------
 st.set_page_config(page_title="TalentScout - Hiring Assistant", page_icon="🧭", layout="centered")
-analyzer = SentimentIntensityAnalyzer()
 
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_DIR = BASE_DIR / "data"
+@st.cache_resource
+def shared_llm_clients() -> ClientManager:
+    """One pooled Groq client manager per server process, shared by all sessions."""
+    return ClientManager.from_env()
+
+set_manager(shared_llm_clients())
+
+@st.cache_resource
+def metrics_endpoint():
+    """JSON metric logs + optional Prometheus /metrics and /ready (TALENTSCOUT_METRICS_PORT)."""
+    configure_logging()
+    set_readiness_probe(warm_up)
+    return start_metrics_server()
+
+metrics_endpoint()
+
+@st.cache_resource
+def warm_resources():
+    """Build Groq clients, langdetect profiles, sentiment lexicon, pandas off the first page load."""
+    return warm_up_in_background()
+
+warm_resources()
+
 DATA_DIR.mkdir(parents=True, exist_ok=True)
-CSV_PATH = DATA_DIR / "candidates.csv"
-
-# Language code → nice name (ISO 639-1 for langdetect)
-LANG_NAMES = {
-    # English + major Indian languages
-    "en": "English", "hi": "Hindi", "bn": "Bengali", "ta": "Tamil", "te": "Telugu",
-    "ml": "Malayalam", "kn": "Kannada", "mr": "Marathi", "pa": "Punjabi",
-    "gu": "Gujarati", "or": "Odia", "as": "Assamese", "ur": "Urdu",
-    # A few common world languages
-    "es": "Spanish", "fr": "French", "de": "German", "pt": "Portuguese",
-    "it": "Italian", "ru": "Russian", "ja": "Japanese", "zh-cn": "Chinese (Simplified)"
-}
+
+@st.cache_resource
+def candidate_store() -> CandidateStore:
+    """Configured storage backend (TALENTSCOUT_STORE=csv|sqlite), shared per process."""
+    return open_store()
+
+store = candidate_store()
+
+@st.cache_resource
+def candidate_archive():
+    """TALENTSCOUT_ARCHIVE=1: every save is also appended to the Parquet archive (data/archive)."""
+    return archive_writes(store) if ARCHIVE_ENABLED else None
+
+candidate_archive()
+
+@st.cache_resource
+def candidate_preview():
+    """Row-offset index over the store; refreshed incrementally on each rerun."""
+    return make_preview(store)
+
+preview = candidate_preview()
+
+@st.cache_resource
+def candidate_writer() -> WriteBehind:
+    """Batched background saves to the store; the preview index catches up after each flush."""
+    writer = WriteBehind(store, get_executor())
+    writer.subscribe(preview.refresh)
+    return writer
+
+@st.cache_resource
+def candidate_search() -> SkillIndex:
+    """Skill/position/location index over the store; built on first search, then updated on each save."""
+    return SkillIndex(store)
+
+@st.cache_resource
+def screening_sessions() -> SessionStore:
+    """Sessions of every tab: recently used ones in memory, idle ones spilled to data/sessions.db."""
+    return SessionStore()
 
 # ---------------------------- Session State ----------------------------
-if "messages" not in st.session_state:
-    st.session_state.messages = [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        {"role": "assistant", "content": "Hi! I’m TalentScout. I’ll collect a few details and ask tech questions to begin your screening."},
-    ]
-if "candidate" not in st.session_state:
-    st.session_state.candidate = Candidate()
-if "ended" not in st.session_state:
-    st.session_state.ended = False
-if "tech_questions" not in st.session_state:
-    st.session_state.tech_questions = {}
+if "session_id" not in st.session_state:
+    # All conversation state (messages, candidate, language, questions) lives in the engine;
+    # the tab only keeps the id, so an idle tab costs no session memory once spilled.
+    st.session_state.session_id = screening_sessions().create().id
 if "saved_rows" not in st.session_state:
     st.session_state.saved_rows = 0
-if "lang" not in st.session_state:
-    st.session_state.lang = "en"  # default English
 if "hashed_pii" not in st.session_state:
     st.session_state.hashed_pii = False
+if "sentiment" not in st.session_state:
+    st.session_state.sentiment = SentimentTimeline()
+if "pending_save" not in st.session_state:
+    st.session_state.pending_save = None  # Future of the last queued save
+
+session: ScreeningSession = screening_sessions().get_or_create(st.session_state.session_id)
 
 # ---------------------------- Sidebar ----------------------------
 with st.sidebar:
@@ -60,7 +105,7 @@ with st.sidebar:
     save_opt = st.checkbox(
         "Save anonymized candidate data locally (CSV)",
         value=False,
-        help=f"Saves to {CSV_PATH}"
+        help=f"Saves to {store.location}"
     )
     st.session_state.hashed_pii = st.checkbox(
         "Hash email/phone before saving (GDPR-friendly)", value=True,
@@ -74,179 +119,128 @@ with st.sidebar:
         "Auto-detected language (you can override):",
         options=["auto"] + codes,
         format_func=lambda c: "Auto" if c == "auto" else f"{LANG_NAMES.get(c, c)} ({c})",
-        index=(["auto"] + codes).index(st.session_state.lang) if st.session_state.lang in codes else 0
+        index=(["auto"] + codes).index(session.lang) if session.lang in codes else 0
     )
-    if selected != "auto" and selected != st.session_state.lang:
-        st.session_state.lang = selected
-        st.session_state.messages.insert(1, {
-            "role": "system",
-            "content": f"From now on, respond in {LANG_NAMES.get(selected, selected)}. Keep answers concise and friendly."
-        })
+    if selected != "auto" and selected != session.lang:
+        session.set_language(selected)
 
     st.caption("We only store data locally on your machine. For demos, use anonymized data.")
 
+    # Filled in after the turn with whatever the background scorer has finished.
+    sentiment_slot = st.empty()
+
+    show_debug = st.checkbox("Show performance debug panel", value=False)
+    debug_slot = st.empty() if show_debug else None
+
     # Data management utilities
     colA, colB = st.columns(2)
     with colA:
         if st.button("🔄 Start New Candidate"):
-            st.session_state.messages = st.session_state.messages[:1] + [
-                {"role": "assistant", "content": "Hi again! Let’s start fresh. I’ll collect your details and then ask a few technical questions."}
-            ]
-            st.session_state.candidate = Candidate()
-            st.session_state.tech_questions = {}
-            st.session_state.ended = False
+            session.reset()
+            st.session_state.sentiment = SentimentTimeline()
     with colB:
-        delete_disabled = not CSV_PATH.exists() or CSV_PATH.stat().st_size == 0
+        delete_disabled = store.is_empty()
         if st.button("🗑️ Delete last saved row", disabled=delete_disabled):
             try:
-                df = pd.read_csv(CSV_PATH)
-                if len(df) > 0:
-                    df = df.iloc[:-1]
-                    df.to_csv(CSV_PATH, index=False, encoding="utf-8")
+                if store.delete_last():
                     st.success("Last row deleted.")
                 else:
                     st.info("CSV is empty.")
             except Exception as e:
                 st.error(f"Failed to delete last row: {e}")
 
+    # Outcome of the last background save (shown once, on the first rerun after the flush)
+    pending = st.session_state.pending_save
+    if pending is not None:
+        if not pending.done():
+            st.caption(f"Saving to {store.location}…")
+        else:
+            st.session_state.pending_save = None
+            if pending.exception() is not None:
+                st.error(f"Failed to save: {pending.exception()}")
+            else:
+                st.success(f"Saved to {store.location}")
+
     # CSV preview if file exists
-    if CSV_PATH.exists():
+    if store.path.exists():
         try:
             st.markdown("#### 📄 Saved Candidates (Preview)")
-            prev = pd.read_csv(CSV_PATH)
-            st.dataframe(prev, use_container_width=True, height=200)
+            pages = page_count(preview)
+            page_no = st.number_input(
+                f"Page (of {pages}, {PAGE_SIZE} rows each)", min_value=1, max_value=pages, value=pages, step=1
+            )
+            st.dataframe(page(preview, int(page_no)), use_container_width=True, height=200)
         except Exception as e:
             st.caption(f"Preview unavailable: {e}")
 
+        with st.expander("🔎 Search candidates"):
+            with st.form("candidate_search"):
+                skills_q = st.text_input("Skills", placeholder="python:3, +django, k8s",
+                                         help="Comma-separated. '+' = must have, ':3' = weight (default 1).")
+                position_q = st.text_input("Position", placeholder="backend developer")
+                location_q = st.text_input("Location (any of)", placeholder="pune, bangalore")
+                years_q = st.slider("Years of experience", 0, 40, (0, 40), help="Full range = no filter.")
+                searched = st.form_submit_button("Search")
+            if searched:
+                lo, hi = years_q
+                q = JobQuery.parse(skills_q, position_q, location_q, lo if lo > 0 else None, hi if hi < 40 else None)
+                try:
+                    hits = result_rows(candidate_search().search(q), q)
+                except Exception as e:
+                    st.caption(f"Search unavailable: {e}")
+                else:
+                    if hits:
+                        st.dataframe(hits, use_container_width=True, height=240)
+                    else:
+                        st.caption("No matching candidates.")
+
 # ---------------------------- Helpers ----------------------------
 def show_chat():
-    for m in st.session_state.messages[1:]:
+    for m in session.messages[1:]:
+        if m["role"] == "system":  # language directive
+            continue
         with st.chat_message("assistant" if m["role"] == "assistant" else "user"):
             st.write(m["content"])
 
-def next_missing_field(c: Candidate):
-    for f in FIELD_ORDER:
-        val = getattr(c, f)
-        if (f in ("desired_positions", "tech_stack") and not val) or (
-            f not in ("desired_positions", "tech_stack") and not val
-        ):
-            return f
-    return None
-
-def append_assistant(text: str):
-    st.session_state.messages.append({"role": "assistant", "content": text})
-    with st.chat_message("assistant"):
-        st.write(text)
-
 def end_conversation():
-    st.session_state.ended = True
-    append_assistant("Thanks! That’s all for now. Our team will review your information and contact you about next steps. 👋")
-
-def hash_if_needed(value: str) -> str:
-    """Return SHA-256(hex) if hashing is enabled; otherwise raw value."""
-    if not value:
-        return value
-    if not st.session_state.hashed_pii:
-        return value
-    h = hashlib.sha256(value.strip().lower().encode("utf-8")).hexdigest()
-    return f"hash:{h[:12]}…"
+    farewell = session.finish()
+    with st.chat_message("assistant"):
+        st.write(farewell)
 
 def save_candidate_row(candidate: Candidate) -> bool:
-    """Append the candidate to CSV_PATH safely (with optional hashing)."""
+    """Queue the candidate for the next batched upsert (returning candidates merge into their row)."""
     try:
-        row_dict = candidate.as_row()
-        row_dict["email"] = hash_if_needed(row_dict["email"])
-        row_dict["phone"] = hash_if_needed(row_dict["phone"])
-        row = pd.DataFrame([row_dict])
-
-        if CSV_PATH.exists():
-            row.to_csv(CSV_PATH, mode="a", header=False, index=False, encoding="utf-8")
-        else:
-            row.to_csv(CSV_PATH, index=False, encoding="utf-8")
+        row_dict = candidate_row(candidate, hashed=st.session_state.hashed_pii)
+        st.session_state.pending_save = candidate_writer().add(row_dict)
         return True
     except Exception as e:
         st.error(f"Failed to save CSV: {e}")
         return False
 
-# ---------- Robust language detection (ignore short/low-confidence text) ----------
-def _clean_alpha_spaces(text: str) -> str:
-    return "".join(ch for ch in text if ch.isalpha() or ch.isspace())
-
-def guess_language_code(text: str) -> str | None:
-    """
-    Robust, language-agnostic detector.
-
-    Returns the top ISO-639-1 code (e.g., 'hi', 'ta', 'ar', 'zh-cn') iff:
-      - The text has enough signal:
-          • >= 10 alphabetic chars for Latin-script text, OR
-          • >= 3 alphabetic chars if it contains any non-Latin letters (e.g., देवनागरी, العربية)
-      - The top detected language has probability >= 0.80
-      - The top language is not English ('en')
-    Otherwise returns None (keep English).
-    """
-    sanitized = _clean_alpha_spaces(text)
-    if not sanitized:
-        return None
-
-    # Heuristic: allow shorter threshold for non-Latin scripts
-    has_non_latin = any(ord(ch) > 127 and ch.isalpha() for ch in sanitized)
-    alpha_count = sum(1 for ch in sanitized if ch.isalpha())
-    min_len = 3 if has_non_latin else 10
-    if alpha_count < min_len:
-        return None
+def save_and_preview():
+    if save_candidate_row(session.candidate):
+        st.info(f"Saving to {store.location}; the preview updates once it is written.")
 
-    try:
-        candidates = detect_langs(sanitized)  # e.g., [hi:0.92, en:0.06]
-        if not candidates:
-            return None
-        top = max(candidates, key=lambda lp: lp.prob)
-        # Accept ANY supported language code from langdetect (not just those in LANG_NAMES)
-        if top.lang != "en" and top.prob >= 0.80:
-            return top.lang
-    except LangDetectException:
-        pass
-
-    return None
-
-
-def detect_and_set_language(user_text: str):
-    """
-    Robust language detection:
-    - Skip very short messages (like 'hi')
-    - Only switch if high-confidence, supported, non-English detection
-    """
-    if st.session_state.lang != "en":  # already set or manually overridden
-        return
-    code = guess_language_code(user_text)
-    if not code:
-        return
-    st.session_state.lang = code
-    lang_name = LANG_NAMES.get(code, code)
-    st.session_state.messages.insert(1, {
-        "role": "system",
-        "content": f"From now on, respond in {lang_name}. Keep answers concise and friendly."
-    })
-    with st.sidebar:
-        st.success(f"Language detected: {lang_name}")
-
-def localized_question(text: str) -> str:
-    """
-    Translate field prompts ONLY if we have a supported non-English language.
-    Otherwise, return the English prompt as-is.
-    """
-    code = st.session_state.lang
-    if not code or code == "en" or code not in LANG_NAMES:
-        return text
-    lang_name = LANG_NAMES.get(code, code)
-    msgs = [
-        {"role": "system", "content": f"Translate the following short prompt into {lang_name}. Output only the translation."},
-        {"role": "user", "content": text},
-    ]
-    try:
-        resp = llm_chat(msgs, stream=False)
-        return resp.choices[0].message.content.strip() if resp and resp.choices else text
-    except Exception:
-        return text
+def questions_view():
+    """Progressive render_questions(): one slot per technology, rewritten as its questions arrive."""
+    box = st.chat_message("assistant")
+    box.markdown("**Here are your tailored questions (answer any you like):**")
+    slots, items = {}, {}
+
+    def add(tech: str, question: str):
+        if tech not in slots:
+            slots[tech], items[tech] = box.empty(), []
+        items[tech].append(question)
+        slots[tech].markdown("\n".join([f"- **{tech}**"] + [f"    {i}. {q}" for i, q in enumerate(items[tech], 1)]))
+    return add
+
+def render_questions(qs):
+    with st.chat_message("assistant"):
+        st.markdown("**Here are your tailored questions (answer any you like):**")
+        for tech, items in qs.items():
+            st.markdown(f"- **{tech}**")
+            for i, q in enumerate(items, 1):
+                st.markdown(f"    {i}. {q}")
 
 # ---------------------------- Main UI ----------------------------
 st.title("🧭 TalentScout — Hiring Assistant (Groq)")
@@ -254,128 +248,107 @@ st.caption("Built with Streamlit + Groq’s fast LLM API. This assistant collect
 
 show_chat()
 
-if not st.session_state.ended:
+if not session.ended:
     user_input = st.chat_input("Type here… (say 'bye' to end)")
 else:
     user_input = None
 
-if user_input:
-    detect_and_set_language(user_input)
-
-    # Sentiment (bonus): quick gauge in sidebar
-    s = analyzer.polarity_scores(user_input)["compound"]
-    mood = "🙂 positive" if s > 0.2 else ("😐 neutral" if s >= -0.2 else "🙁 negative")
-    with st.sidebar:
-        st.caption(f"Sentiment guess: **{mood}**")
-
-    # Early end?
-    if user_input.strip().lower() in EXIT_KEYWORDS:
-        st.session_state.messages.append({"role": "user", "content": user_input})
-        with st.chat_message("user"):
-            st.write(user_input)
-        if save_opt and st.session_state.candidate.full_name:
-            if save_candidate_row(st.session_state.candidate):
-                st.success(f"Saved to {CSV_PATH}")
-                # Preview update
-                try:
-                    prev = pd.read_csv(CSV_PATH)
-                    st.sidebar.dataframe(prev, use_container_width=True, height=200)
-                except Exception:
-                    pass
-        end_conversation()
-        st.stop()
+def handle_turn(user_input: str):
+    t0 = time.perf_counter()  # time to first token is measured from here
+    # Sentiment (bonus) is scored off the reply path; render_sentiment() shows it after the turn.
+    st.session_state.sentiment.score(user_input)
 
-    # Add user message to history
-    st.session_state.messages.append({"role": "user", "content": user_input})
     with st.chat_message("user"):
         st.write(user_input)
 
-    # Extract candidate snapshot
-    cand_snapshot = extract_candidate_json(st.session_state.messages)
-    c = st.session_state.candidate
-
-    if cand_snapshot.full_name:
-        c.full_name = cand_snapshot.full_name.strip()
-    if cand_snapshot.email and validate_email(cand_snapshot.email):
-        c.email = cand_snapshot.email.strip()
-    if cand_snapshot.phone and validate_phone(cand_snapshot.phone):
-        c.phone = cand_snapshot.phone.strip()
-    if cand_snapshot.years_experience is not None:
-        c.years_experience = cand_snapshot.years_experience
-    if cand_snapshot.desired_positions:
-        c.desired_positions = [p for p in cand_snapshot.desired_positions if p]
-    if cand_snapshot.location:
-        c.location = cand_snapshot.location.strip()
-    if cand_snapshot.tech_stack:
-        c.tech_stack = [t for t in cand_snapshot.tech_stack if t]
-
-    # Ask for missing fields (localized)
-    missing = next_missing_field(c)
-    if missing:
-        q = FIELD_QUESTIONS[missing]
-        append_assistant(localized_question(q))
-        st.stop()
-
-    # Generate tech questions (printed in current language by LLM)
-    if c.tech_stack and not st.session_state.tech_questions:
-        qs = generate_tech_questions(c.tech_stack)
-        st.session_state.tech_questions = qs
-        # Stream a short acknowledgement
-        ack_msgs = st.session_state.messages[:1] + [
-            {"role": "assistant", "content": "Great, I’ll generate a few tailored questions on your stack."}
+    # The engine runs the turn on the shared event loop; we only render its events.
+    # Streamed replies repaint one placeholder in coalesced batches (the engine keeps the full text in history).
+    renderer, add_question = None, None
+    try:
+        for ev in iter_turn(session, user_input):
+            if ev.type == "language":
+                with st.sidebar:
+                    st.success(f"Language detected: {LANG_NAMES.get(ev.data, ev.data)}")
+            elif ev.type == "message":
+                with st.chat_message("assistant"):
+                    st.write(ev.text)
+            elif ev.type == "stream_start":
+                renderer = StreamRenderer(st.chat_message("assistant").empty(), t0=t0)
+            elif ev.type == "token":
+                renderer.add(ev.text)
+            elif ev.type == "stream_end":
+                renderer.close(session.last_trace)
+            elif ev.type == "question":
+                if add_question is None:
+                    add_question = questions_view()
+                add_question(ev.data, ev.text)
+            elif ev.type == "questions":
+                if add_question is None:  # no per-question events preceded it
+                    render_questions(ev.data)
+            elif ev.type == "ended":
+                if save_opt and session.candidate.full_name:
+                    save_and_preview()
+    finally:
+        if renderer is not None:
+            renderer.close(session.last_trace)  # no-op if the stream already ended
+
+def render_sentiment():
+    timeline: SentimentTimeline = st.session_state.sentiment
+    latest = timeline.latest()
+    if latest is None:
+        return
+    with sentiment_slot.container():
+        st.caption(f"Sentiment guess: **{mood(latest)}**")
+        scores = [s for _, s in timeline.points()]
+        if len(scores) > 1:
+            st.line_chart(scores, height=120)
+
+def render_debug_panel(trace):
+    with debug_slot.container():
+        st.markdown("#### 🔬 Last turn")
+        rows = [
+            {
+                "event": e.get("stage") or e.get("kind") or e.get("cache") or e["event"],
+                "type": e["event"],
+                "ms": round(e["seconds"] * 1000, 1) if "seconds" in e else None,
+                "ttft_ms": round(e["ttft"] * 1000, 1) if e.get("ttft") is not None else None,
+                "tokens": (e.get("prompt_tokens") or 0) + (e.get("completion_tokens") or 0) if e["event"] == "llm_call" else e.get("tokens"),
+                "tok/s": e.get("tokens_per_sec"),
+                "hit": e.get("hit"),
+            }
+            for e in trace
         ]
-        stream = llm_chat(ack_msgs, stream=True)
-        with st.chat_message("assistant"):
-            placeholder = st.empty()
-            acc = ""
-            for chunk in stream:
-                token = chunk.choices[0].delta.content or ""
-                acc += token
-                placeholder.write(acc)
-        with st.chat_message("assistant"):
-            st.markdown("**Here are your tailored questions (answer any you like):**")
-            for tech, items in qs.items():
-                st.markdown(f"- **{tech}**")
-                for i, q in enumerate(items, 1):
-                    st.markdown(f"    {i}. {q}")
-        st.stop()
-
-    # Otherwise continue conversation
-    stream = llm_chat(st.session_state.messages, stream=True)
-    with st.chat_message("assistant"):
-        acc = ""
-        for chunk in stream:
-            token = chunk.choices[0].delta.content or ""
-            acc += token
-            st.write(acc)
+        st.dataframe(rows, use_container_width=True, height=220)
+        mem = screening_sessions().report()
+        st.caption(
+            f"This session: {next((x['bytes'] for x in mem['sessions'] if x['id'] == session.id), 0) / 1024:.1f} KiB · "
+            f"{mem['resident']} sessions in memory ({mem['resident_bytes'] / 1024:.0f} KiB), {mem['spilled']} spilled"
+        )
+
+if user_input:
+    try:
+        handle_turn(user_input)
+    finally:
+        if debug_slot is not None:
+            render_debug_panel(session.last_trace)
+elif debug_slot is not None and session.last_trace:
+    render_debug_panel(session.last_trace)
+render_sentiment()
 
 # ---------------------------- Footer ----------------------------
 col1, col2 = st.columns(2)
 
 with col1:
     if st.button("✅ Finish & Thank Candidate"):
-        if save_opt and st.session_state.candidate.full_name:
-            if save_candidate_row(st.session_state.candidate):
-                st.success(f"Saved to {CSV_PATH}")
-                # Live preview after save
-                try:
-                    prev = pd.read_csv(CSV_PATH)
-                    st.sidebar.dataframe(prev, use_container_width=True, height=200)
-                except Exception:
-                    pass
+        if save_opt and session.candidate.full_name:
+            save_and_preview()
         end_conversation()
 
 with col2:
-    save_disabled = not st.session_state.candidate.full_name or not save_opt
+    save_disabled = not session.candidate.full_name or not save_opt
     if st.button("💾 Save Candidate (CSV)", disabled=save_disabled):
-        if save_candidate_row(st.session_state.candidate):
+        if save_candidate_row(session.candidate):
             st.session_state.saved_rows += 1
-            st.success(f"Saved to {CSV_PATH} (total saves this session: {st.session_state.saved_rows})")
-            # Live preview after save
-            try:
-                prev = pd.read_csv(CSV_PATH)
-                st.sidebar.dataframe(prev, use_container_width=True, height=200)
-            except Exception:
-                pass
+            st.success(f"Queued for {store.location} (total saves this session: {st.session_state.saved_rows})")
 
 st.caption("Type 'bye' to end anytime.")
@@ -0,0 +1,354 @@
+# app/archive.py
+"""
+Columnar candidate archive for analytics (Parquet, partitioned by save date).
+
+candidates.csv keeps positions and tech stack as comma-joined strings and
+years as text, and every analytics run re-parses all of it. The archive keeps
+one record per row the store writes (a returning candidate's merged row is
+recorded again), typed:
+
+    full_name, location            string
+    email, phone                   string, PII hashes only (raw values are hashed on the way in)
+    years_experience               float64 (null if unknown)
+    desired_positions, tech_stack  list<string>
+    saved_at                       timestamp (UTC)
+
+under data/archive/saved_date=YYYY-MM-DD/ (hive layout), so a query reads
+only the columns it selects and the partitions its date range touches.
+
+Records of one candidate are told apart by identity key: the email hash,
+else the phone hash, else the normalized name + location. read() (and so
+top_skills) keeps only the newest saved_at per key in the range it reads, and
+`compact` drops the older ones within a partition, so re-saves, a migrate
+followed by live appends, or a migrate run twice are not counted twice.
+
+New saves are appended as small files, written on the background executor
+when TALENTSCOUT_ARCHIVE=1: rows the store writes wait in a bounded spill
+list (never written under the store's write lock) and go out in one file per
+flush. `compact` rewrites each partition's files into one. pyarrow is
+optional: only this module needs it, and only when it is used.
+
+Tunables (env):
+    TALENTSCOUT_ARCHIVE_DIR             archive root (default data/archive)
+    TALENTSCOUT_ARCHIVE                 1 = append every save (server and app)
+    TALENTSCOUT_ARCHIVE_FLUSH_INTERVAL  seconds between spill flushes (default 5)
+    TALENTSCOUT_ARCHIVE_MAX_SPILL       rows waiting before new ones are dropped (default 10000)
+
+    python app/archive.py migrate                       # one-shot: data/candidates.csv -> archive
+    python app/archive.py migrate --store sqlite --date 2026-01-31
+    python app/archive.py compact                        # every partition with more than one file
+    python app/archive.py top-skills --since 2026-10-01 --limit 15
+    python app/archive.py stats
+"""
+from __future__ import annotations
+import argparse, logging, os, threading, uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from helpers import DATA_DIR, LIST_FIELDS
+from identity import email_key, phone_keys
+from metrics import REGISTRY
+
+log = logging.getLogger("talentscout.archive")
+
+ARCHIVE_DIR = Path(os.getenv("TALENTSCOUT_ARCHIVE_DIR", str(DATA_DIR / "archive")))
+ARCHIVE_ENABLED = os.getenv("TALENTSCOUT_ARCHIVE", "0") == "1"
+PARTITION = "saved_date"
+BATCH_ROWS = 100_000
+FLUSH_INTERVAL = float(os.getenv("TALENTSCOUT_ARCHIVE_FLUSH_INTERVAL", "5"))
+MAX_SPILL = int(os.getenv("TALENTSCOUT_ARCHIVE_MAX_SPILL", "10000"))
+IDENTITY_COLUMNS = ["email", "phone", "full_name", "location"]
+
+def _pa():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("the Parquet archive needs pyarrow (pip install pyarrow)") from None
+    return pa, pq
+
+def schema():
+    pa, _ = _pa()
+    return pa.schema([
+        ("full_name", pa.string()), ("email", pa.string()), ("phone", pa.string()),
+        ("years_experience", pa.float64()), ("desired_positions", pa.list_(pa.string())),
+        ("location", pa.string()), ("tech_stack", pa.list_(pa.string())),
+        ("saved_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+def _years(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+def _items(value) -> List[str]:
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value or "").split(",") if v.strip()]
+
+def to_table(rows: Iterable[Dict], saved_at: datetime):
+    """Stored rows -> typed Arrow table (list columns split, years numeric, PII hashed)."""
+    pa, _ = _pa()
+    cols: Dict[str, list] = {f.name: [] for f in schema()}
+    for row in rows:
+        cols["full_name"].append(row.get("full_name") or "")
+        cols["email"].append(email_key(row.get("email") or ""))
+        cols["phone"].append((phone_keys(row.get("phone") or "") or [""])[0])  # raw phones: normalized hash
+        cols["years_experience"].append(_years(row.get("years_experience")))
+        cols["location"].append(row.get("location") or "")
+        for f in LIST_FIELDS:
+            cols[f].append(_items(row.get(f)))
+    cols["saved_at"] = [saved_at] * len(cols["full_name"])
+    return pa.table(cols, schema=schema())
+
+def identity_key(table):
+    """Per-record identity: 'e:<email hash>', else 'p:<phone hash>', else 'f:<name>|<location>', else null."""
+    pa, _ = _pa()
+    import pyarrow.compute as pc
+    none = pa.scalar(None, pa.string())
+
+    def present(col):
+        return pc.fill_null(pc.not_equal(table.column(col), ""), False)
+
+    def text(col):
+        return pc.utf8_trim_whitespace(pc.utf8_lower(pc.fill_null(table.column(col), "")))
+
+    email, phone = present("email"), present("phone")
+    key = pc.if_else(email, pc.binary_join_element_wise("e:", table.column("email"), ""),
+                     pc.if_else(phone, pc.binary_join_element_wise("p:", table.column("phone"), ""), none))
+    if pc.any(pc.invert(pc.or_(email, phone))).as_py():  # name + location only where needed: it is the slow part
+        name, loc = text("full_name"), text("location")
+        fp = pc.if_else(pc.and_(pc.not_equal(name, ""), pc.not_equal(loc, "")),
+                        pc.binary_join_element_wise("f:", name, "|", loc, ""), none)
+        key = pc.coalesce(key, fp)
+    return key
+
+def latest(table):
+    """Only the newest record (by saved_at; later rows win ties) of each identity; row order kept."""
+    pa, _ = _pa()
+    import pyarrow.compute as pc
+    if table.num_rows < 2:
+        return table
+    key = identity_key(table)
+    order = pc.sort_indices(table, sort_keys=[("saved_at", "ascending")])  # stable
+    keyed = pa.table({"key": key.take(order), "pos": order})
+    keyed = keyed.filter(pc.is_valid(keyed.column("key")))
+    # Rows are in saved_at order, so the last row of each key group is its newest record.
+    newest = keyed.group_by("key", use_threads=False).aggregate([("pos", "last")]).column("pos_last")
+    keep = pa.chunked_array([newest.cast(pa.uint64()), pc.indices_nonzero(pc.is_null(key))], pa.uint64())
+    return table.take(keep.take(pc.sort_indices(keep)))  # records without any identity are all kept
+
+class CandidateArchive:
+    """Date-partitioned Parquet files under one root directory."""
+
+    def __init__(self, root: Path = ARCHIVE_DIR):
+        self.root = Path(root)
+
+    def partition_dir(self, day: date) -> Path:
+        return self.root / f"{PARTITION}={day.isoformat()}"
+
+    def partitions(self) -> List[Path]:
+        if not self.root.exists():
+            return []
+        return sorted(p for p in self.root.glob(f"{PARTITION}=*") if p.is_dir())
+
+    @staticmethod
+    def files(partition: Path) -> List[Path]:
+        return sorted(partition.glob("*.parquet"))
+
+    def _write(self, table, partition: Path, prefix: str) -> Path:
+        _, pq = _pa()
+        partition.mkdir(parents=True, exist_ok=True)
+        dest = partition / f"{prefix}-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp = dest.with_name("." + dest.name + ".tmp")  # dot files are ignored by readers
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, dest)
+        return dest
+
+    # ------------- Writes -------------
+    def append(self, rows: List[Dict], saved_at: Optional[datetime] = None) -> Optional[Path]:
+        """Write one small file for these rows into today's (or `saved_at`'s) partition."""
+        if not rows:
+            return None
+        saved_at = saved_at or datetime.now(timezone.utc)
+        return self._write(to_table(rows, saved_at), self.partition_dir(saved_at.date()), "part")
+
+    def migrate(self, rows: Iterable[Dict], day: date, batch_rows: int = BATCH_ROWS) -> Tuple[int, Optional[Path]]:
+        """Bulk import (e.g. the whole CSV) into one file of `day`'s partition; returns (rows, file)."""
+        _, pq = _pa()
+        saved_at = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        partition = self.partition_dir(day)
+        partition.mkdir(parents=True, exist_ok=True)
+        dest = partition / f"migrated-{uuid.uuid4().hex[:8]}.parquet"
+        tmp = dest.with_name("." + dest.name + ".tmp")
+        total, batch = 0, []
+        with pq.ParquetWriter(tmp, schema(), compression="zstd") as writer:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_rows:
+                    writer.write_table(to_table(batch, saved_at))
+                    total, batch = total + len(batch), []
+            if batch:
+                writer.write_table(to_table(batch, saved_at))
+                total += len(batch)
+        if not total:
+            tmp.unlink()
+            return 0, None
+        os.replace(tmp, dest)
+        return total, dest
+
+    def compact(self, partition: Optional[str] = None) -> List[Tuple[str, int, int]]:
+        """
+        Rewrite every partition (or just `partition`, YYYY-MM-DD) that has more
+        than one file into a single file sorted by saved_at, keeping only the
+        newest record of each candidate. Files appended while this runs are left
+        for the next compaction. Returns [(partition, files, rows kept)].
+        """
+        pa, pq = _pa()
+        done = []
+        for part in self.partitions():
+            day = part.name.split("=", 1)[1]
+            if partition and day != partition:
+                continue
+            inputs = self.files(part)
+            if len(inputs) < 2:
+                continue
+            table = latest(pa.concat_tables(pq.read_table(f, schema=schema(), partitioning=None) for f in inputs))
+            table = table.sort_by("saved_at")
+            self._write(table, part, "compacted")
+            for f in inputs:
+                f.unlink()
+            done.append((day, len(inputs), table.num_rows))
+        return done
+
+    # ------------- Reads -------------
+    def dataset(self):
+        """pyarrow dataset over the archive (saved_date is a string partition key)."""
+        pa, _ = _pa()
+        import pyarrow.dataset as ds
+        return ds.dataset(self.root, format="parquet", schema=schema().append(pa.field(PARTITION, pa.string())),
+                          partitioning=ds.partitioning(pa.schema([(PARTITION, pa.string())]), flavor="hive"))
+
+    def read(self, columns: Optional[List[str]] = None, since: Optional[str] = None, until: Optional[str] = None,
+             dedupe: bool = True):
+        """
+        Table of `columns` for saves between `since` and `until` (YYYY-MM-DD,
+        inclusive): the newest record of each candidate in that range, or every
+        record with dedupe=False.
+        """
+        dataset = self.dataset()
+        import pyarrow.dataset as ds
+        flt = None
+        for op, bound in ((lambda f, v: f >= v, since), (lambda f, v: f <= v, until)):
+            if bound:
+                cond = op(ds.field(PARTITION), bound)
+                flt = cond if flt is None else flt & cond
+        if not dedupe:
+            return dataset.to_table(columns=columns, filter=flt)
+        wanted = columns or dataset.schema.names
+        extra = [c for c in IDENTITY_COLUMNS + ["saved_at"] if c not in wanted]
+        return latest(dataset.to_table(columns=list(wanted) + extra, filter=flt)).select(wanted)
+
+    def top_skills(self, since: Optional[str] = None, until: Optional[str] = None, limit: int = 20) -> List[Tuple[str, int]]:
+        """Most common technologies among candidates saved in the range (their newest record each)."""
+        table = self.read(["tech_stack"], since, until)
+        import pyarrow.compute as pc
+        techs = pc.utf8_lower(pc.list_flatten(table.column("tech_stack")))
+        counts = pc.value_counts(techs).to_pylist()
+        counts.sort(key=lambda c: -c["counts"])
+        return [(c["values"], c["counts"]) for c in counts[:limit]]
+
+    def stats(self) -> List[Tuple[str, int, int]]:
+        """[(partition, files, rows)] from the Parquet footers (no data pages read)."""
+        _, pq = _pa()
+        out = []
+        for part in self.partitions():
+            files = self.files(part)
+            out.append((part.name.split("=", 1)[1], len(files), sum(pq.ParquetFile(f).metadata.num_rows for f in files)))
+        return out
+
+# ------------- Store hook -------------
+def archive_writes(store, archive: Optional[CandidateArchive] = None, executor=None,
+                   interval: float = FLUSH_INTERVAL, max_spill: int = MAX_SPILL) -> CandidateArchive:
+    """Append every row the store writes to the archive, on the background executor."""
+    from background import get_executor
+    archive = archive or CandidateArchive()
+    executor = executor or get_executor()
+    spill: List[Dict] = []
+    lock = threading.Lock()
+
+    def flush():
+        with lock:
+            rows = spill[:]
+            del spill[:]
+        if not rows:
+            return
+        try:
+            archive.append(rows)
+        except Exception:
+            with lock:
+                spill[:0] = rows[:max(0, max_spill - len(spill))]  # retried on the next flush
+            raise
+
+    def on_write(written, before, after):
+        # Called under the store's write lock: only queue the rows, never write or wait here.
+        rows = [row for _, row in written if row is not None]
+        if not rows:
+            return
+        with lock:
+            room = max(0, max_spill - len(spill))
+            spill.extend(rows[:room])
+        if len(rows) > room:
+            REGISTRY.inc("talentscout_archive_dropped_rows_total", len(rows) - room)
+            log.warning("archive spill full, dropped %d rows", len(rows) - room)
+        executor.submit("archive", flush)  # if rejected, the next tick flushes
+
+    store.subscribe(on_write)
+    executor.every("archive", interval, flush)
+    executor.on_shutdown(flush)
+    return archive
+
+def main(argv=None):
+    from storage import open_store
+
+    parser = argparse.ArgumentParser(description="TalentScout Parquet candidate archive")
+    parser.add_argument("--root", type=Path, default=ARCHIVE_DIR, help="archive directory (default: data/archive)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    mg = sub.add_parser("migrate", help="import every row of a candidate store")
+    mg.add_argument("--store", choices=["csv", "sqlite"], help="backend (default: $TALENTSCOUT_STORE or csv)")
+    mg.add_argument("--path", type=Path, help="store file (default: data/candidates.csv|.db)")
+    mg.add_argument("--date", type=date.fromisoformat, help="partition for the imported rows (default: store file's mtime)")
+    cp = sub.add_parser("compact", help="merge each partition's small files into one")
+    cp.add_argument("--partition", help="only this date (YYYY-MM-DD)")
+    ts = sub.add_parser("top-skills", help="most common technologies")
+    ts.add_argument("--since")
+    ts.add_argument("--until")
+    ts.add_argument("--limit", type=int, default=20)
+    sub.add_parser("stats", help="files and rows per partition")
+    args = parser.parse_args(argv)
+
+    archive = CandidateArchive(args.root)
+    if args.cmd == "migrate":
+        store = open_store(args.store, args.path)
+        if not store.path.exists():
+            parser.error(f"{store.path} does not exist")
+        day = args.date or datetime.fromtimestamp(store.path.stat().st_mtime, timezone.utc).date()
+        n, dest = archive.migrate(store.iter_rows(), day)
+        print(f"Migrated {n} rows from {store.location} -> {dest or archive.root}")
+    elif args.cmd == "compact":
+        done = archive.compact(args.partition)
+        for day, files, rows in done:
+            print(f"{day}: {files} files -> 1 ({rows} rows)")
+        if not done:
+            print("Nothing to compact.")
+    elif args.cmd == "top-skills":
+        for tech, n in archive.top_skills(args.since, args.until, args.limit):
+            print(f"{n:8d}  {tech}")
+    elif args.cmd == "stats":
+        for day, files, rows in archive.stats():
+            print(f"{day}  {files:4d} files  {rows:9d} rows")
+
+if __name__ == "__main__":
+    main()
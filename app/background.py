@@ -0,0 +1,288 @@
+# app/background.py
+"""
+Background work that no reply waits on.
+
+A turn used to score sentiment, upsert the candidate and refresh the preview
+before the candidate saw anything. BackgroundExecutor is one bounded thread
+pool per process for that kind of work:
+
+- SentimentTimeline scores each message on the pool and keeps the per-session
+  timeline the sidebar draws (it shows whatever has been scored so far).
+- WriteBehind queues candidate rows and writes them with one upsert_many()
+  per flush (every FLUSH_INTERVAL seconds, or once FLUSH_ROWS rows wait);
+  listeners such as the preview refresh run after each flush.
+
+Backpressure: submit() rejects work when the queue is full (sentiment is
+best-effort and just skipped), while a WriteBehind with MAX_PENDING rows
+waiting makes the caller flush inline instead of dropping rows. A row whose
+flush fails is retried with the next flushes; after WRITE_RETRIES failed
+attempts its Future fails with the store error, so the UI can report it. Queue depth,
+wait/run time and rejections are exported as talentscout_background_* metrics.
+
+On shutdown (atexit) timers stop, pending rows get a last flush and queued
+tasks are drained for up to DRAIN_TIMEOUT seconds.
+
+Tunables (env):
+    TALENTSCOUT_BG_WORKERS         worker threads (default 2)
+    TALENTSCOUT_BG_QUEUE           queued tasks before submit() rejects (default 256)
+    TALENTSCOUT_FLUSH_INTERVAL     seconds between write flushes (default 1.0)
+    TALENTSCOUT_FLUSH_ROWS         flush early once this many rows wait (default 50)
+    TALENTSCOUT_WRITE_MAX_PENDING  rows waiting before add() flushes inline (default 1000)
+    TALENTSCOUT_WRITE_RETRIES      failed flushes before a row's Future fails (default 3)
+    TALENTSCOUT_DRAIN_TIMEOUT      seconds to drain on shutdown (default 10)
+"""
+from __future__ import annotations
+import atexit, logging, os, queue, threading, time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics import REGISTRY
+
+log = logging.getLogger("talentscout.background")
+
+BG_WORKERS = int(os.getenv("TALENTSCOUT_BG_WORKERS", "2"))
+BG_QUEUE = int(os.getenv("TALENTSCOUT_BG_QUEUE", "256"))
+FLUSH_INTERVAL = float(os.getenv("TALENTSCOUT_FLUSH_INTERVAL", "1.0"))
+FLUSH_ROWS = int(os.getenv("TALENTSCOUT_FLUSH_ROWS", "50"))
+MAX_PENDING = int(os.getenv("TALENTSCOUT_WRITE_MAX_PENDING", "1000"))
+WRITE_RETRIES = int(os.getenv("TALENTSCOUT_WRITE_RETRIES", "3"))
+DRAIN_TIMEOUT = float(os.getenv("TALENTSCOUT_DRAIN_TIMEOUT", "10"))
+
+# ------------- Executor -------------
+class BackgroundExecutor:
+    """Fixed worker threads over a bounded queue; submit() returns a Future, or None if rejected."""
+
+    def __init__(self, workers: int = BG_WORKERS, max_queue: int = BG_QUEUE, name: str = "talentscout-bg"):
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._idle = threading.Condition()
+        self._outstanding = 0           # queued + running tasks
+        self._stop = threading.Event()  # stops the every() timers
+        self._shutdown_hooks: List[Callable[[], object]] = []
+        self.closed = False
+        self._threads = [threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+                         for i in range(max(1, workers))]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, kind: str, fn: Callable, *args, timeout: Optional[float] = 0.0, **kwargs) -> Optional[Future]:
+        """
+        Queue fn(*args, **kwargs) under a metrics label `kind`. With the queue
+        full, wait up to `timeout` seconds (None: until there is room, 0: not
+        at all) and then reject: the task is dropped and None is returned.
+        """
+        if self.closed:
+            REGISTRY.inc("talentscout_background_tasks_total", kind=kind, status="rejected")
+            return None
+        fut: Future = Future()
+        with self._idle:
+            self._outstanding += 1
+        try:
+            self._queue.put((kind, fn, args, kwargs, fut, time.perf_counter()),
+                            block=timeout != 0, timeout=timeout or None)
+        except queue.Full:
+            self._done()
+            REGISTRY.inc("talentscout_background_tasks_total", kind=kind, status="rejected")
+            log.warning("background queue full, dropped %s task", kind)
+            return None
+        REGISTRY.observe("talentscout_background_queue_depth", self._queue.qsize())
+        return fut
+
+    def every(self, kind: str, interval: float, fn: Callable[[], object]):
+        """Submit fn every `interval` seconds until shutdown (a tick waits for queue room)."""
+        def tick():
+            while not self._stop.wait(interval):
+                self.submit(kind, fn, timeout=None)
+        threading.Thread(target=tick, name=f"talentscout-bg-{kind}", daemon=True).start()
+
+    def on_shutdown(self, fn: Callable[[], object]):
+        """Run fn (on the caller's thread) at shutdown, before the queue is drained."""
+        self._shutdown_hooks.append(fn)
+
+    def _done(self):
+        with self._idle:
+            self._outstanding -= 1
+            if not self._outstanding:
+                self._idle.notify_all()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            kind, fn, args, kwargs, fut, queued = item
+            start = time.perf_counter()
+            REGISTRY.observe("talentscout_background_wait_seconds", start - queued, kind=kind)
+            status = "ok"
+            try:
+                if fut.set_running_or_notify_cancel():
+                    fut.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                status = "error"
+                fut.set_exception(e)
+                log.warning("background %s task failed: %s", kind, e)
+            finally:
+                REGISTRY.observe("talentscout_background_run_seconds", time.perf_counter() - start, kind=kind)
+                REGISTRY.inc("talentscout_background_tasks_total", kind=kind, status=status)
+                self._done()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued task has run; False if `timeout` passed first."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._outstanding, timeout)
+
+    def shutdown(self, timeout: float = DRAIN_TIMEOUT) -> bool:
+        """Stop timers, run shutdown hooks, drain the queue and stop the workers."""
+        if self.closed:
+            return True
+        self._stop.set()
+        for hook in self._shutdown_hooks:
+            try:
+                hook()
+            except Exception as e:
+                log.warning("shutdown hook failed: %s", e)
+        drained = self.drain(timeout)
+        if not drained:
+            log.warning("background queue not drained after %.1fs (%d tasks left)", timeout, self._outstanding)
+        self.closed = True
+        if drained:
+            for _ in self._threads:
+                self._queue.put(None)
+            for t in self._threads:
+                t.join(1.0)
+        return drained
+
+_executor: Optional[BackgroundExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> BackgroundExecutor:
+    """The process-wide executor; drained at interpreter exit."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BackgroundExecutor()
+                atexit.register(_executor.shutdown)
+    return _executor
+
+# ------------- Sentiment timeline -------------
+def mood(score: float) -> str:
+    return "🙂 positive" if score > 0.2 else ("😐 neutral" if score >= -0.2 else "🙁 negative")
+
+def score_sentiment(text: str) -> float:
+    from resources import sentiment_analyzer
+    return sentiment_analyzer().polarity_scores(text)["compound"]
+
+class SentimentTimeline:
+    """VADER compound score per candidate message of one session, filled in as scoring finishes."""
+
+    def __init__(self, maxlen: int = 500):
+        self._points: deque = deque(maxlen=maxlen)  # (message number, score)
+        self._count = 0
+
+    def score(self, text: str, executor: Optional[BackgroundExecutor] = None) -> Optional[Future]:
+        """Score `text` in the background (skipped when the queue is full)."""
+        self._count += 1
+        n = self._count
+        fut = (executor or get_executor()).submit("sentiment", score_sentiment, text)
+        if fut is not None:
+            fut.add_done_callback(lambda f: self._record(n, f))
+        return fut
+
+    def _record(self, n: int, fut: Future):
+        if not fut.cancelled() and fut.exception() is None:
+            self._points.append((n, fut.result()))
+
+    def points(self) -> List[Tuple[int, float]]:
+        return sorted(self._points)
+
+    def latest(self) -> Optional[float]:
+        pts = self.points()
+        return pts[-1][1] if pts else None
+
+# ------------- Write-behind persistence -------------
+class WriteBehind:
+    """Candidate rows for one store, upserted in batches on the executor."""
+
+    def __init__(self, store, executor: Optional[BackgroundExecutor] = None, interval: float = FLUSH_INTERVAL,
+                 max_rows: int = FLUSH_ROWS, max_pending: int = MAX_PENDING, retries: int = WRITE_RETRIES):
+        self.store = store
+        self.executor = executor or get_executor()
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self.retries = max(1, retries)
+        self.last_error: Optional[BaseException] = None  # error of the last failed flush; None once one succeeds
+        self._pending: List[Tuple[Dict, Future, int]] = []  # (row, future, failed attempts)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one flush at a time keeps rows in order
+        self._listeners: List[Callable[[], object]] = []
+        self.executor.every("flush", interval, self.flush)
+        self.executor.on_shutdown(self.close)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def subscribe(self, listener: Callable[[], object]):
+        """listener() runs on the flushing thread after each successful flush."""
+        self._listeners.append(listener)
+
+    def add(self, row: Dict) -> Future:
+        """Queue a row; the Future resolves to True once it is in the store."""
+        fut: Future = Future()
+        with self._lock:
+            self._pending.append((row, fut, 0))
+            waiting = len(self._pending)
+        REGISTRY.observe("talentscout_write_pending_rows", waiting)
+        if waiting >= self.max_pending:
+            # The store is falling behind: the producer pays for the write instead of growing the backlog.
+            REGISTRY.inc("talentscout_write_inline_flushes_total")
+            self.flush()
+        elif waiting >= self.max_rows:
+            self.executor.submit("flush", self.flush)  # if rejected, the next tick flushes
+        return fut
+
+    def flush(self) -> int:
+        """Write everything pending in one upsert_many(); returns rows written (0 on failure, rows kept)."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                self.store.upsert_many([row for row, _, _ in batch])
+            except Exception as e:
+                self.last_error = e
+                retry = [(row, fut, tries + 1) for row, fut, tries in batch if tries + 1 < self.retries]
+                given_up = [fut for _, fut, tries in batch if tries + 1 >= self.retries]
+                with self._lock:
+                    self._pending[:0] = retry  # retried on the next flush
+                for fut in given_up:
+                    fut.set_exception(e)
+                REGISTRY.inc("talentscout_write_flush_errors_total")
+                if given_up:
+                    REGISTRY.inc("talentscout_write_failed_rows_total", len(given_up))
+                    log.error("gave up on %d rows for %s after %d attempts: %s",
+                              len(given_up), self.store.location, self.retries, e)
+                else:
+                    log.warning("flush of %d rows to %s failed: %s", len(batch), self.store.location, e)
+                return 0
+            self.last_error = None
+            REGISTRY.observe("talentscout_write_batch_rows", len(batch))
+            for _, fut, _ in batch:
+                fut.set_result(True)
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception as e:
+                log.warning("after-flush listener failed: %s", e)
+        return len(batch)
+
+    def close(self):
+        """Final flush; rows that still cannot be written fail their Futures."""
+        self.flush()
+        with self._lock:
+            lost, self._pending = self._pending, []
+        for _, fut, _ in lost:
+            fut.set_exception(self.last_error or RuntimeError(f"not written to {self.store.location}"))
+        if lost:
+            log.error("%d candidate rows were not written to %s", len(lost), self.store.location)
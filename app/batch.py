@@ -0,0 +1,224 @@
+# app/batch.py
+"""
+Headless batch screening of recorded chat transcripts.
+
+Input is JSON Lines, one transcript per line:
+    {"id": "t-001", "messages": [{"role": "assistant", "content": "..."}, {"role": "user", "content": "..."}, ...]}
+
+Each transcript is replayed through the same extraction path as the app
+(local rules for answers to the standard field questions, one full LLM
+extraction only if fields are still missing), validated via merge_candidate(), optionally given
+tech questions from the question bank, and written to the candidate store in
+bulk. Completed ids go to a checkpoint file after each bulk write, so an
+interrupted run resumes where it stopped.
+
+    python app/batch.py transcripts.jsonl --workers 8 --rate 5 --store sqlite
+"""
+from __future__ import annotations
+import argparse, json, logging, sys, threading, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from prompts import FIELD_QUESTIONS, SYSTEM_PROMPT
+from helpers import (
+    FIELD_NAMES, Candidate, extract_candidate_json, local_extract, merge_candidate, next_missing_field,
+)
+from storage import candidate_row, open_store
+
+log = logging.getLogger("talentscout.batch")
+
+QUESTION_FIELDS = {q: f for f, q in FIELD_QUESTIONS.items()}
+
+# ------------- Rate limiting -------------
+class RateLimiter:
+    """Token bucket shared by all workers: at most `rate` acquisitions per second."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+# ------------- Input / checkpoint -------------
+def read_transcripts(path: Path, done: Set[str]) -> Iterator[Tuple[str, List[Dict]]]:
+    """Stream (id, messages) pairs, skipping checkpointed ids and malformed lines."""
+    with open(path, encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+                tid = str(rec.get("id") or f"line-{lineno}")
+                messages = [m for m in rec["messages"] if isinstance(m, dict) and m.get("content")]
+            except (ValueError, KeyError, TypeError, AttributeError):
+                log.warning("skipping malformed line %d", lineno)
+                continue
+            if tid not in done:
+                yield tid, messages
+
+def load_checkpoint(path: Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    return {l.strip() for l in path.read_text(encoding="utf-8").splitlines() if l.strip()}
+
+# ------------- Per-transcript work -------------
+@dataclass
+class Result:
+    tid: str
+    candidate: Candidate
+    questions: Dict[str, List[str]] = field(default_factory=dict)
+    llm_calls: int = 0
+    merged: int = 0  # rows folded into an existing candidate on save
+
+def screen_transcript(
+    tid: str, messages: List[Dict], limiter: RateLimiter, with_questions: bool = False
+) -> Result:
+    """Replay one transcript through local rules, then a single LLM extraction if needed."""
+    cand = Candidate()
+    asked = None
+    for m in messages:
+        if m.get("role") == "assistant":
+            # Only trust local rules when we know exactly which field was asked.
+            asked = QUESTION_FIELDS.get(m["content"].strip())
+        elif m.get("role") == "user":
+            local = local_extract(asked, m["content"])
+            if local is not None:
+                merge_candidate(cand, local)
+            asked = None
+
+    res = Result(tid, cand)
+    if next_missing_field(cand):
+        limiter.acquire()
+        snapshot = extract_candidate_json([{"role": "system", "content": SYSTEM_PROMPT}] + messages)
+        res.llm_calls += 1
+        # Locally parsed answers win; the LLM only fills what is still missing.
+        merge_candidate(cand, Candidate(**{f: getattr(snapshot, f) for f in FIELD_NAMES if not getattr(cand, f)}))
+
+    if with_questions and cand.tech_stack:
+        from question_bank import questions_for_stack  # only needed with --questions
+        # One token per request actually sent: cached technologies cost nothing.
+        res.questions = questions_for_stack(cand.tech_stack, limiter=limiter)
+    return res
+
+# ------------- Driver -------------
+@dataclass
+class BatchStats:
+    processed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    llm_calls: int = 0
+    merged: int = 0  # rows folded into an existing candidate on save
+
+def run_batch(
+    input_path: Path,
+    store,
+    checkpoint_path: Path,
+    workers: int = 4,
+    rate: float = 5.0,
+    flush_every: int = 200,
+    hashed: bool = True,
+    questions_out: Optional[Path] = None,
+) -> BatchStats:
+    done = load_checkpoint(checkpoint_path)
+    stats = BatchStats()
+    limiter = RateLimiter(rate)
+    pending: List[Result] = []
+    q_fh = open(questions_out, "a", encoding="utf-8") if questions_out else None
+
+    def flush():
+        if not pending:
+            return
+        rows = [candidate_row(r.candidate, hashed) for r in pending if r.candidate.full_name]
+        stats.merged += store.upsert_many(rows)[1]
+        if q_fh:
+            for r in pending:
+                if r.questions:
+                    q_fh.write(json.dumps({"id": r.tid, "questions": r.questions}, ensure_ascii=False) + "\n")
+            q_fh.flush()
+        # Checkpoint only after the rows are durable: a crash re-does at most one batch.
+        with open(checkpoint_path, "a", encoding="utf-8") as ck:
+            ck.write("".join(f"{r.tid}\n" for r in pending))
+        stats.skipped += sum(1 for r in pending if not r.candidate.full_name)
+        pending.clear()
+
+    max_in_flight = max(1, workers) * 4  # keep the input streaming, never the whole file in memory
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as pool:
+            in_flight = set()
+            for tid, messages in read_transcripts(input_path, done):
+                in_flight.add(pool.submit(screen_transcript, tid, messages, limiter, questions_out is not None))
+                if len(in_flight) >= max_in_flight:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    _collect(finished, pending, stats)
+                    if len(pending) >= flush_every:
+                        flush()
+            finished, _ = wait(in_flight)
+            _collect(finished, pending, stats)
+        flush()
+    finally:
+        if q_fh:
+            q_fh.close()
+    return stats
+
+def _collect(futures, pending: List[Result], stats: BatchStats):
+    for fut in futures:
+        try:
+            res = fut.result()
+        except Exception as e:  # left out of the checkpoint, so the next run retries it
+            stats.failed += 1
+            log.warning("transcript failed: %s", e)
+            continue
+        stats.processed += 1
+        stats.llm_calls += res.llm_calls
+        pending.append(res)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen recorded transcripts without the Streamlit UI")
+    parser.add_argument("input", type=Path, help="transcripts in JSON Lines format")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent transcripts (default 4)")
+    parser.add_argument("--rate", type=float, default=5.0, help="max LLM requests per second, 0 = unlimited (default 5)")
+    parser.add_argument("--flush-every", type=int, default=200, help="rows per bulk write (default 200)")
+    parser.add_argument("--checkpoint", type=Path, help="completed-id file (default: <input>.checkpoint)")
+    parser.add_argument("--store", choices=["csv", "sqlite"], help="backend (default: $TALENTSCOUT_STORE or csv)")
+    parser.add_argument("--store-path", type=Path, help="store file (default: data/candidates.csv|.db)")
+    parser.add_argument("--no-hash", action="store_true", help="store raw email/phone instead of hashes")
+    parser.add_argument("--questions", type=Path, help="also generate tech questions and append them to this JSONL file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    checkpoint = args.checkpoint or args.input.with_name(args.input.name + ".checkpoint")
+    store = open_store(args.store, args.store_path)
+    t0 = time.perf_counter()
+    stats = run_batch(
+        args.input, store, checkpoint,
+        workers=args.workers, rate=args.rate, flush_every=args.flush_every,
+        hashed=not args.no_hash, questions_out=args.questions,
+    )
+    dt = time.perf_counter() - t0
+    log.info(
+        "done: %d processed (%d without a name, not stored, %d merged into existing candidates), "
+        "%d failed, %d LLM extractions in %.1fs -> %s",
+        stats.processed, stats.skipped, stats.merged, stats.failed, stats.llm_calls, dt, store.location,
+    )
+    return 1 if stats.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# app/context.py
+"""
+Bounded LLM context for long conversations.
+
+The session keeps the full transcript, but free-chat replies only see:
+
+    system prompt
+    one language directive (the latest; duplicates are dropped)
+    "conversation so far" summary + current Candidate profile (compact JSON)
+    the last KEEP_TURNS user turns verbatim
+
+Older turns are folded into the rolling summary FOLD_EVERY turns at a time
+(one small LLM call, run in the background after a reply), and the assembled
+prompt is trimmed to the model's token budget, so the cost of a message stays
+flat however long the session runs.
+"""
+from __future__ import annotations
+import asyncio, json, logging, os, sys
+from collections.abc import MutableSequence
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from prompts import LANG_NAMES
+from helpers import Candidate, achat_completion
+from routing import route
+
+log = logging.getLogger("talentscout.context")
+
+KEEP_TURNS = int(os.getenv("TALENTSCOUT_CONTEXT_TURNS", "6"))
+FOLD_EVERY = int(os.getenv("TALENTSCOUT_CONTEXT_FOLD_EVERY", str(KEEP_TURNS)))
+SUMMARY_MAX_CHARS = 1200
+
+# Prompt-token budget per model (completion tokens are capped separately by the request).
+MODEL_TOKEN_BUDGETS: Dict[str, int] = {
+    "llama-3.3-70b-versatile": 3000,
+    "llama-3.1-8b-instant": 2000,
+}
+DEFAULT_TOKEN_BUDGET = int(os.getenv("TALENTSCOUT_CONTEXT_TOKENS", "3000"))
+
+LANGUAGE_DIRECTIVE_PREFIX = "From now on, respond in "
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a screening chat between a hiring assistant and a candidate. "
+    "Merge the new turns into the previous summary. Keep facts the candidate stated, questions they asked "
+    "and anything promised to them; drop greetings and filler. At most 120 words, plain text."
+)
+
+def language_directive(code: str) -> Dict:
+    return {
+        "role": "system",
+        "content": f"{LANGUAGE_DIRECTIVE_PREFIX}{LANG_NAMES.get(code, code)}. Keep answers concise and friendly.",
+    }
+
+def is_language_directive(m: Dict) -> bool:
+    return m["role"] == "system" and m["content"].startswith(LANGUAGE_DIRECTIVE_PREFIX)
+
+# ------------- Packed transcript -------------
+ROLES = tuple(sys.intern(r) for r in ("system", "user", "assistant"))
+ROLE_CODES = {r: i for i, r in enumerate(ROLES)}
+
+class Transcript(MutableSequence):
+    """
+    Chat messages packed into two parallel arrays: a one-byte role code and
+    the content string per message (a list of dicts costs ~180 bytes of dict
+    per message on top of the text). Items read back as fresh
+    {"role", "content"} dicts with interned role strings and slices as lists,
+    so code written for a list of message dicts works unchanged; mutate the
+    transcript itself, not the dicts it returns. Keys other than role and
+    content are not kept.
+    """
+
+    __slots__ = ("_roles", "_contents")
+
+    def __init__(self, messages: Iterable[Dict] = ()):
+        self._roles = bytearray()
+        self._contents: List[str] = []
+        for m in messages:
+            self.append(m)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, str]]) -> "Transcript":
+        return cls({"role": r, "content": c} for r, c in records)
+
+    def records(self) -> List[Tuple[str, str]]:
+        return [(ROLES[r], c) for r, c in zip(self._roles, self._contents)]
+
+    @staticmethod
+    def _pack(m: Dict) -> Tuple[int, str]:
+        try:
+            return ROLE_CODES[m["role"]], m["content"]
+        except KeyError:
+            raise ValueError(f"unsupported message role: {m.get('role')!r}") from None
+
+    def __len__(self):
+        return len(self._roles)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [{"role": ROLES[r], "content": c} for r, c in zip(self._roles[i], self._contents[i])]
+        return {"role": ROLES[self._roles[i]], "content": self._contents[i]}
+
+    def __setitem__(self, i, m):
+        if isinstance(i, slice):
+            packed = [self._pack(x) for x in m]
+            self._roles[i] = bytes(r for r, _ in packed)
+            self._contents[i] = [c for _, c in packed]
+        else:
+            self._roles[i], self._contents[i] = self._pack(m)
+
+    def __delitem__(self, i):
+        del self._roles[i]
+        del self._contents[i]
+
+    def insert(self, i: int, m: Dict):
+        r, c = self._pack(m)
+        self._roles.insert(i, r)
+        self._contents.insert(i, c)
+
+    def __add__(self, other) -> List[Dict]:
+        return self[:] + list(other)
+
+    def __eq__(self, other):
+        return list(self) == list(other) if isinstance(other, (list, Transcript)) else NotImplemented
+
+    def __repr__(self):
+        return f"Transcript({self[:]!r})"
+
+    def nbytes(self) -> int:
+        """Approximate memory held (arrays + content strings)."""
+        return (sys.getsizeof(self._roles) + sys.getsizeof(self._contents)
+                + sum(sys.getsizeof(c) for c in self._contents))
+
+def estimate_tokens(messages: List[Dict]) -> int:
+    """Cheap token estimate (~4 chars/token + per-message overhead); no tokenizer dependency."""
+    return sum(len(m["content"]) // 4 + 4 for m in messages)
+
+def token_budget(model: Optional[str] = None) -> int:
+    """Prompt budget for `model` (default: the model free chat is routed to)."""
+    return MODEL_TOKEN_BUDGETS.get(model or route("chat").model, DEFAULT_TOKEN_BUDGET)
+
+def _turn_starts(dialog: List[Dict]) -> List[int]:
+    return [i for i, m in enumerate(dialog) if m["role"] == "user"]
+
+def _local_summary(previous: str, turns: List[Dict]) -> str:
+    """Fallback when the summary call fails: keep the candidate's own words, newest last."""
+    said = " | ".join(m["content"][:160] for m in turns if m["role"] == "user")
+    text = f"{previous} | {said}" if previous else said
+    return text[-SUMMARY_MAX_CHARS:]
+
+class ConversationContext:
+    """Rolling-summary state for one session; build() assembles what the model sees."""
+
+    def __init__(self, keep_turns: int = KEEP_TURNS, fold_every: int = FOLD_EVERY):
+        self.keep_turns = keep_turns
+        self.fold_every = max(1, fold_every)
+        self.summary = ""
+        self.folded = 0  # dialog messages already folded into the summary
+        self._fold: Optional[asyncio.Task] = None
+
+    def reset(self):
+        if self._fold is not None:
+            self._fold.cancel()
+        self.summary, self.folded, self._fold = "", 0, None
+
+    # ------------- Assembly -------------
+    def build(self, messages: List[Dict], candidate: Candidate, model: Optional[str] = None) -> List[Dict]:
+        """System prompt + latest language directive + summary/profile + unfolded turns, within budget."""
+        system = messages[0]
+        directives = [m for m in messages[1:] if is_language_directive(m)]
+        dialog = [m for m in messages if m["role"] != "system"]
+
+        head = [system] + directives[-1:]
+        profile = json.dumps({k: v for k, v in candidate.as_dict().items() if v}, ensure_ascii=False, separators=(",", ":"))
+        memory = f"Candidate profile so far: {profile}"
+        if self.summary:
+            memory = f"Conversation so far (summary): {self.summary}\n{memory}"
+        head.append({"role": "system", "content": memory})
+
+        recent = dialog[self.folded:]
+        budget = token_budget(model) - estimate_tokens(head)
+        # Hard cap: drop the oldest verbatim messages first, but always keep the newest one.
+        while len(recent) > 1 and estimate_tokens(recent) > budget:
+            recent = recent[1:]
+        return head + recent
+
+    # ------------- Folding -------------
+    def fold_due(self, messages: List[Dict]) -> bool:
+        dialog = [m for m in messages if m["role"] != "system"]
+        return len(_turn_starts(dialog[self.folded:])) >= self.keep_turns + self.fold_every
+
+    def schedule_fold(self, messages: List[Dict]):
+        """Fold old turns in the background (call after a reply; build() never waits on it)."""
+        if (self._fold is None or self._fold.done()) and self.fold_due(messages):
+            self._fold = asyncio.get_running_loop().create_task(self.fold(list(messages)))
+
+    async def fold(self, messages: List[Dict]):
+        dialog = [m for m in messages if m["role"] != "system"]
+        starts = _turn_starts(dialog[self.folded:])
+        if len(starts) <= self.keep_turns:
+            return
+        cut = self.folded + starts[-self.keep_turns]
+        turns = dialog[self.folded:cut]
+        self.summary = await summarize(self.summary, turns)
+        self.folded = cut
+
+async def summarize(previous: str, turns: List[Dict]) -> str:
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in turns)
+    try:
+        resp = await achat_completion(
+            "summary",
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": f"Previous summary: {previous or '(none)'}\n\nNew turns:\n{transcript}"},
+            ],
+            temperature=0,
+        )
+        out = (resp.choices[0].message.content or "").strip()
+        if out:
+            return out[:SUMMARY_MAX_CHARS]
+    except Exception as e:
+        log.warning("summary failed, keeping a local digest: %s", e)
+    return _local_summary(previous, turns)
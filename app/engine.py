@@ -0,0 +1,428 @@
+# app/engine.py
+"""
+Framework-independent screening engine.
+
+ScreeningSession holds one candidate's conversation state explicitly
+(messages, candidate, language, tech questions, ended) and runs a turn as an
+async generator of Events, so the same state machine drives the Streamlit UI
+(through iter_turn(), on the client manager's background loop) and the HTTP
+API in server.py, where hundreds of sessions share one event loop instead of
+holding a thread each while they wait on Groq.
+
+Event types:
+    language      data = newly detected language code
+    message       text = complete assistant message (already in history)
+    stream_start  a streamed assistant reply begins
+    token         text = next piece of the streamed reply
+    stream_end    text = full streamed reply (already in history)
+    question      text = one tech question as soon as it is generated, data = its tech
+    questions     data = {tech: [questions]}, all of them, once generation is done
+    ended         the conversation is over
+"""
+from __future__ import annotations
+import asyncio, logging, os, queue, time, uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from prompts import SYSTEM_PROMPT, EXIT_KEYWORDS, FIELD_ORDER, FIELD_QUESTIONS
+from helpers import Candidate, aextract_incremental, allm_chat, next_missing_field
+from context import ConversationContext, Transcript, is_language_directive, language_directive
+from langid import LanguageMemo
+from llm_client import get_manager
+from metrics import stage, turn
+from question_bank import astream_questions_for_stack, display_names
+from translation import atranslate
+
+log = logging.getLogger("talentscout.engine")
+
+GREETING = "Hi! I’m TalentScout. I’ll collect a few details and ask tech questions to begin your screening."
+RESTART_GREETING = "Hi again! Let’s start fresh. I’ll collect your details and then ask a few technical questions."
+FAREWELL = "Thanks! That’s all for now. Our team will review your information and contact you about next steps. 👋"
+ACK_PROMPT = "Great, I’ll generate a few tailored questions on your stack."
+
+# Overlap extraction with the work that follows it (see _pipelined_reply); 0 = strictly serial turns.
+PIPELINED_TURNS = os.getenv("TALENTSCOUT_PIPELINED_TURNS", "1") != "0"
+
+@dataclass
+class Event:
+    type: str
+    text: str = ""
+    data: Any = None
+
+    def as_dict(self) -> Dict:
+        d = {"type": self.type}
+        if self.text:
+            d["text"] = self.text
+        if self.data is not None:
+            d["data"] = self.data
+        return d
+
+class ScreeningSession:
+    """One candidate's screening conversation; drive it with `async for ev in session.handle(text)`."""
+
+    def __init__(self, session_id: Optional[str] = None, lang: str = "en", pipelined: Optional[bool] = None):
+        self.id = session_id or uuid.uuid4().hex
+        self.lang = lang
+        self.pipelined = PIPELINED_TURNS if pipelined is None else pipelined
+        self.messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "assistant", "content": GREETING},
+        ]
+        self.candidate = Candidate()
+        self.tech_questions: Dict[str, List[str]] = {}
+        self.context = ConversationContext()
+        self._langid = LanguageMemo()
+        self.ended = False
+        self.last_trace: List[Dict] = []
+        self.last_active = time.time()
+        # Hold while running a turn (iter_turn, server.py): turns of one session never interleave.
+        self.lock = asyncio.Lock()
+
+    @property
+    def messages(self) -> Transcript:
+        """Full transcript (packed; reads like a list of {"role", "content"} dicts)."""
+        return self._messages
+
+    @messages.setter
+    def messages(self, value):
+        self._messages = value if isinstance(value, Transcript) else Transcript(value)
+
+    # ------------- Spill / rehydrate (session_store.py) -------------
+    def to_state(self) -> Dict:
+        """JSON-ready snapshot of everything needed to resume the conversation."""
+        return {
+            "id": self.id, "lang": self.lang, "pipelined": self.pipelined, "ended": self.ended,
+            "last_active": self.last_active, "messages": self.messages.records(),
+            "candidate": self.candidate.as_dict(), "tech_questions": self.tech_questions,
+            "summary": self.context.summary, "folded": self.context.folded,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "ScreeningSession":
+        s = cls(session_id=state["id"], lang=state["lang"], pipelined=state["pipelined"])
+        s.messages = Transcript.from_records(state["messages"])
+        s.candidate = Candidate(**state["candidate"])
+        s.tech_questions = state["tech_questions"]
+        s.context.summary, s.context.folded = state["summary"], state["folded"]
+        s.ended, s.last_active = state["ended"], state["last_active"]
+        return s
+
+    # ------------- State changes outside a turn -------------
+    def reset(self):
+        """Start over with a new candidate (keeps the language choice, like the UI always has)."""
+        self.messages = self.messages[:1] + [{"role": "assistant", "content": RESTART_GREETING}]
+        self.candidate = Candidate()
+        self.tech_questions = {}
+        self.context.reset()
+        self.ended = False
+
+    def set_language(self, code: str):
+        """Manual override or detection result: pin replies to `code`."""
+        if code == self.lang:
+            return
+        self.lang = code
+        # Replace rather than stack directives: only the latest language applies.
+        self.messages = [m for m in self.messages if not is_language_directive(m)]
+        self.messages.insert(1, language_directive(code))
+
+    def finish(self) -> str:
+        """End the conversation politely; returns the farewell (already in history)."""
+        self.ended = True
+        self.messages.append({"role": "assistant", "content": FAREWELL})
+        return FAREWELL
+
+    # ------------- Turns -------------
+    async def handle(self, user_text: str) -> AsyncIterator[Event]:
+        """Run one user turn, yielding Events as the reply becomes available."""
+        self.last_active = time.time()
+        try:
+            with turn(lang=self.lang) as trace:
+                self.last_trace = trace
+                async for ev in self._turn(user_text):
+                    yield ev
+        finally:
+            self.last_active = time.time()
+
+    async def _turn(self, user_text: str) -> AsyncIterator[Event]:
+        with stage("language_detection"):
+            code = await self._detect_language(user_text)
+        if code:
+            self.set_language(code)
+            yield Event("language", data=code)
+
+        self.messages.append({"role": "user", "content": user_text})
+        if user_text.strip().lower() in EXIT_KEYWORDS:
+            yield Event("message", self.finish())
+            yield Event("ended")
+            return
+
+        if self.pipelined:
+            replies = self._pipelined_reply()
+        else:
+            replies = self._serial_reply()
+        async for ev in replies:
+            yield ev
+
+    async def _serial_reply(self) -> AsyncIterator[Event]:
+        # Incremental extraction: only the newest turn + current state go to the model;
+        # a full re-extraction happens only if the delta contradicts what we have.
+        c = self.candidate
+        with stage("extraction"):
+            await aextract_incremental(self.messages, c, asked_field=next_missing_field(c))
+
+        # Ask for missing fields (localized)
+        missing = next_missing_field(c)
+        if missing:
+            async for ev in self._ask(missing):
+                yield ev
+            return
+
+        # Generate tech questions (printed in current language by LLM)
+        if c.tech_stack and not self.tech_questions:
+            async for ev in self._ack_and_questions(c.tech_stack):
+                yield ev
+            return
+
+        # Otherwise continue conversation
+        async for ev in self._chat():
+            yield ev
+
+    async def _pipelined_reply(self) -> AsyncIterator[Event]:
+        """
+        Same decisions as _serial_reply(), but the work each outcome needs starts
+        while extraction is still in flight:
+
+        - free chat (profile complete, questions shown): the reply streams at once;
+          extraction finishes in the background before the turn ends.
+        - a field was asked: the prompt for the field expected next is translated
+          concurrently (usually a cache hit), so it is ready the moment extraction
+          confirms the answer.
+        - the tech stack was asked: the acknowledgement stream is opened
+          concurrently, and question generation starts as soon as the stack is known.
+
+        Nothing speculative is shown until extraction confirms it; a wrong guess is
+        cancelled and the turn falls back to the serial decision.
+        """
+        c = self.candidate
+        asked = next_missing_field(c)
+        extraction = asyncio.create_task(self._extract(asked))
+        speculative: List[asyncio.Task] = []
+        try:
+            if asked is None and self.tech_questions:
+                async for ev in self._chat():
+                    yield ev
+                await extraction
+                return
+
+            expected = next((f for f in FIELD_ORDER if f != asked and not getattr(c, f)), None)
+            prompt = ack = None
+            if expected:
+                prompt = asyncio.create_task(self._translated_question(expected))
+                speculative.append(prompt)
+            elif asked == "tech_stack":
+                ack = asyncio.create_task(allm_chat(self._ack_messages(), stream=True, kind="acknowledgement"))
+                speculative.append(ack)
+            await extraction
+
+            missing = next_missing_field(c)
+            if missing:
+                if prompt is not None and missing == expected:
+                    q = await prompt
+                    self.messages.append({"role": "assistant", "content": q})
+                    yield Event("message", q)
+                else:
+                    async for ev in self._ask(missing):
+                        yield ev
+                return
+
+            if c.tech_stack and not self.tech_questions:
+                async for ev in self._ack_and_questions(c.tech_stack, opened=ack):
+                    yield ev
+                return
+
+            async for ev in self._chat():
+                yield ev
+        finally:
+            for task in (extraction, *speculative):
+                if not task.done():
+                    task.cancel()
+            for task in (extraction, *speculative):
+                await _discard(task)
+
+    async def _extract(self, asked: Optional[str]):
+        with stage("extraction"):
+            await aextract_incremental(self.messages, self.candidate, asked_field=asked)
+
+    async def _translated_question(self, field_name: str) -> str:
+        with stage("translation"):
+            return await atranslate(FIELD_QUESTIONS[field_name], self.lang)
+
+    async def _ack_and_questions(self, techs: List[str], opened: Optional[asyncio.Task] = None) -> AsyncIterator[Event]:
+        """
+        Acknowledgement stream and question generation run side by side; each
+        question is emitted as soon as it is complete, interleaved with the
+        acknowledgement's tokens (but never before its stream_start, so the UI
+        places the questions below it).
+        """
+        ack = self._stream(self._ack_messages(), kind="acknowledgement", opened=opened)
+        held: List[Event] = []
+        ack_open = False
+        async for ev in _merge(ack, self._question_events(techs)):
+            if not ack_open and ev.type in ("question", "questions"):
+                held.append(ev)
+                continue
+            yield ev
+            if ev.type == "stream_start":
+                ack_open = True
+                for h in held:
+                    yield h
+                held = []
+        for h in held:
+            yield h
+
+    async def _question_events(self, techs: List[str]) -> AsyncIterator[Event]:
+        collected: Dict[str, List[str]] = {}
+        with stage("question_generation"):
+            async for tech, question in astream_questions_for_stack(techs):
+                collected.setdefault(tech, []).append(question)
+                yield Event("question", question, data=tech)
+        self.tech_questions = {t: collected[t] for t in display_names(techs) if t in collected}
+        yield Event("questions", data=self.tech_questions)
+
+    async def _ask(self, field_name: str) -> AsyncIterator[Event]:
+        q = await self._translated_question(field_name)
+        self.messages.append({"role": "assistant", "content": q})
+        yield Event("message", q)
+
+    async def _chat(self) -> AsyncIterator[Event]:
+        """Free-chat reply over the bounded context (summary + profile + recent turns)."""
+        async for ev in self._stream(self.context.build(self.messages, self.candidate)):
+            yield ev
+        self.context.schedule_fold(self.messages)
+
+    def _ack_messages(self) -> List[Dict]:
+        return self.messages[:1] + [{"role": "assistant", "content": ACK_PROMPT}]
+
+    async def _detect_language(self, text: str) -> Optional[str]:
+        """
+        Robust language detection:
+        - Skip very short messages (like 'hi')
+        - Only switch if high-confidence, supported, non-English detection
+        """
+        if self.lang != "en":  # already set or manually overridden
+            return None
+        # Script shortcuts are instant, but the langdetect fallback is CPU-bound: keep it off the loop.
+        return await asyncio.to_thread(self._langid, text)
+
+    async def _stream(self, messages: List[Dict], kind: str = "chat", opened: Optional[asyncio.Task] = None) -> AsyncIterator[Event]:
+        """Stream a reply; `opened` is a request for the same messages already in flight."""
+        with stage("reply_stream"):
+            stream = await (opened if opened is not None else allm_chat(messages, stream=True, kind=kind))
+            yield Event("stream_start")
+            parts: List[str] = []
+            try:
+                async for chunk in stream:
+                    token = chunk.choices[0].delta.content if chunk.choices else None
+                    if token:
+                        parts.append(token)
+                        yield Event("token", token)
+            finally:
+                # Whatever the candidate saw goes into history, so the next turn has it as context.
+                if parts:
+                    self.messages.append({"role": "assistant", "content": "".join(parts)})
+            yield Event("stream_end", self.messages[-1]["content"] if parts else "")
+
+async def _discard(task: asyncio.Task):
+    """Wait out a cancelled speculative task; close a stream it had already opened."""
+    try:
+        result = await task
+    except BaseException:
+        return
+    aclose = getattr(result, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+async def _merge(*sources: AsyncIterator[Event]) -> AsyncIterator[Event]:
+    """Events of several generators in arrival order (each source keeps its own order)."""
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump(source: AsyncIterator[Event]):
+        try:
+            async for ev in source:
+                queue.put_nowait(ev)
+        finally:
+            queue.put_nowait(None)
+
+    tasks = [asyncio.create_task(pump(src)) for src in sources]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            ev = await queue.get()
+            if ev is None:
+                remaining -= 1
+                continue
+            yield ev
+        for task in tasks:
+            await task  # surfaces a source's failure
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        for task in tasks:
+            await _discard(task)
+
+# ------------- Sync bridge -------------
+_DONE = object()
+CANCEL_WAIT = 5.0  # seconds iter_turn's close() waits for an abandoned turn to unwind
+
+def iter_turn(session: ScreeningSession, user_text: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> Iterator[Event]:
+    """
+    Run session.handle() on the shared background loop and yield its Events
+    to synchronous code (the Streamlit script thread) as they arrive.
+
+    Turns of one session run one at a time (session.lock). Closing the
+    generator early (Streamlit interrupting the script for a rerun) cancels
+    the turn and waits for it to unwind, so it cannot keep writing to the
+    session while the next turn runs.
+    """
+    q: "queue.Queue" = queue.Queue()
+    loop = loop or get_manager().loop()
+
+    async def pump():
+        # One task drives the whole generator so its context (turn trace) stays consistent.
+        try:
+            async with session.lock:
+                async for ev in session.handle(user_text):
+                    q.put(ev)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            q.put(e)
+        finally:
+            q.put(_DONE)
+
+    async def start() -> asyncio.Task:
+        return asyncio.ensure_future(pump())
+
+    async def cancel(task: asyncio.Task):
+        task.cancel()
+        await asyncio.wait([task])
+
+    task = asyncio.run_coroutine_threadsafe(start(), loop).result()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        if not task.done():  # GeneratorExit (closed mid-turn) or an error in the consumer
+            try:
+                asyncio.run_coroutine_threadsafe(cancel(task), loop).result(CANCEL_WAIT)
+            except Exception as e:
+                log.warning("abandoned turn of session %s did not stop: %s", session.id, e)
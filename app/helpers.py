@@ -1,20 +1,85 @@
 # app/helpers.py
 from __future__ import annotations
-import json, re, os
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+import asyncio, hashlib, json, re, os, unicodedata, weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, fields
 from dotenv import load_dotenv
-from groq import Groq
+
+if TYPE_CHECKING:  # the SDK itself loads with the first client (llm_client.py)
+    from groq import AsyncGroq, Groq
+
+from jsonstream import JSONPairParser
+from llm_client import get_manager
+from metrics import atimed_completion, cache_event, fallback_event, timed_completion
+from prompts import FIELD_ORDER
+from routing import LARGE_MODEL, route, should_fall_back
 
 load_dotenv()  # Reads .env -> GROQ_API_KEY
 
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = BASE_DIR / "data"
+
 # Recommended production model from Groq supported models page
-MODEL_ID = "llama-3.3-70b-versatile"  # fast & solid default on Groq :contentReference[oaicite:4]{index=4}
+# (the large model; per-task models, fallbacks and caps live in routing.py)
+MODEL_ID = LARGE_MODEL  # fast & solid default on Groq :contentReference[oaicite:4]{index=4}
 
 def get_client() -> Groq:
-    # The Groq client reads GROQ_API_KEY env var by default; also accepts api_key=...
-    # Docs show basic usage via Groq() and chat.completions.create(...). :contentReference[oaicite:5]{index=5}
-    return Groq()
+    # Shared, pooled client (keep-alive + retry/backoff on 429); see llm_client.py.
+    return get_manager().client()
+
+def get_async_client() -> AsyncGroq:
+    # Pooled AsyncGroq for the running event loop.
+    return get_manager().async_client()
+
+_no_retry_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def _primary_client(client, has_fallback: bool):
+    # With a fallback model, a 429 should switch models at once instead of backing off first.
+    if not has_fallback:
+        return client
+    copy = _no_retry_clients.get(client)
+    if copy is None:
+        copy = _no_retry_clients[client] = client.with_options(max_retries=0)
+    return copy
+
+def chat_completion(kind: str, with_model: bool = False, **kwargs):
+    """
+    client.chat.completions.create(**kwargs) routed by `kind` (model, timeout,
+    token cap; see routing.py), timed and token-counted, with one retry on the
+    task's fallback model. With `with_model`, returns (response, model that answered).
+    """
+    client, r = get_client(), route(kind)
+    kwargs, stream = r.apply(kwargs), bool(kwargs.get("stream"))
+    primary = _primary_client(client, bool(r.fallback))
+    try:
+        resp = timed_completion(kind, lambda: primary.chat.completions.create(**kwargs), kwargs["model"], stream)
+        model = kwargs["model"]
+    except Exception as e:
+        if not r.fallback or r.fallback == kwargs["model"] or not should_fall_back(e):
+            raise
+        fallback_event(kind, kwargs["model"], r.fallback, e)
+        retry = dict(kwargs, model=r.fallback)
+        resp = timed_completion(kind, lambda: client.chat.completions.create(**retry), r.fallback, stream)
+        model = r.fallback
+    return (resp, model) if with_model else resp
+
+async def achat_completion(kind: str, client: Optional[AsyncGroq] = None, with_model: bool = False, **kwargs):
+    """Async twin of chat_completion(); streamed calls return an async iterator of chunks."""
+    client, r = client or get_async_client(), route(kind)
+    kwargs, stream = r.apply(kwargs), bool(kwargs.get("stream"))
+    primary = _primary_client(client, bool(r.fallback))
+    try:
+        resp = await atimed_completion(kind, lambda: primary.chat.completions.create(**kwargs), kwargs["model"], stream)
+        model = kwargs["model"]
+    except Exception as e:
+        if not r.fallback or r.fallback == kwargs["model"] or not should_fall_back(e):
+            raise
+        fallback_event(kind, kwargs["model"], r.fallback, e)
+        retry = dict(kwargs, model=r.fallback)
+        resp = await atimed_completion(kind, lambda: client.chat.completions.create(**retry), r.fallback, stream)
+        model = r.fallback
+    return (resp, model) if with_model else resp
 
 # ------------- Validation helpers -------------
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
@@ -31,8 +96,130 @@ def validate_email(s: str) -> bool:
 def validate_phone(s: str) -> bool:
     return bool(PHONE_RE.match(s.strip()))
 
+def hash_pii(value: str) -> str:
+    """Truncated SHA-256 of a normalized email/phone, as stored in candidates.csv."""
+    h = hashlib.sha256(value.strip().lower().encode("utf-8")).hexdigest()
+    return f"hash:{h[:12]}…"
+
+# ------------- Local (rule-based) extraction -------------
+EMAIL_SEARCH_RE = re.compile(r"[^@\s<>(),;:]+@[^@\s<>(),;:]+\.[A-Za-z]{2,}")
+YEARS_RE = re.compile(
+    r"^(?:about|around|approx\.?|~)?\s*(\d{1,2}(?:\.\d+)?)\s*\+?\s*"
+    r"(?:years?|yrs?|y)?(?:\s+of)?(?:\s+(?:professional|work|industry))?(?:\s+experience)?\.?$",
+    re.IGNORECASE,
+)
+NAME_PREFIX_RE = re.compile(r"^(?:my name is|my full name is|i am|i'm|this is|name:)\s+", re.IGNORECASE)
+LOCATION_PREFIX_RE = re.compile(
+    r"^(?:i am|i'm|i live|i come|currently)?\s*(?:located|based|living|staying)?\s*(?:in|at|from)\s+", re.IGNORECASE
+)
+LIST_AND_RE = re.compile(r"\s+(?:and|&)\s+", re.IGNORECASE)
+NOT_AN_ANSWER = {
+    "hi", "hello", "hey", "ok", "okay", "yes", "no", "sure", "why", "what", "skip", "na", "n/a",
+    "none", "nothing", "nil", "nope", "maybe", "later", "pass", "tbd", "idk", "thanks", "thank you",
+}
+# Greetings, filler and uncertainty anywhere in the answer: leave it to the LLM rather than guess.
+NON_ANSWER_RE = re.compile(
+    r"^(?:hi|hello|hey|hiya|namaste|greetings|good\s+(?:morning|afternoon|evening|day)|thanks|thank\s+you)\b"
+    r"|\b(?:not\s+sure|unsure|don'?t\s+know|do\s+not\s+know|no\s+idea|idk|undecided|not\s+decided"
+    r"|prefer\s+not|rather\s+not|not\s+applicable|n/a)\b"
+    r"|^(?:none|nothing|nil|nope|no|na|maybe|later|skip|pass|tbd)\b",
+    re.IGNORECASE,
+)
+# Words that never appear in a name: "I am a developer" is not the name "a developer".
+NOT_NAME_WORDS = {
+    "a", "an", "the", "i", "im", "i'm", "am", "is", "are", "was", "be", "my", "me", "you", "your", "we", "it",
+    "here", "there", "this", "that", "not", "no", "yes", "sure", "know", "dont", "don't", "do", "does",
+    "and", "or", "of", "to", "for", "from", "in", "at", "on", "with", "by", "as", "so", "just", "very",
+    "hello", "hi", "hey", "good", "morning", "afternoon", "evening", "thanks", "thank", "please", "ok", "okay",
+    "developer", "engineer", "student", "fresher", "candidate", "looking", "job", "work", "working", "name",
+}
+# Pronouns, verbs and filler: "I use Python", "mostly python", "any" are sentences, not values.
+NOT_VALUE_WORDS = {
+    "i", "im", "i'm", "me", "my", "mine", "we", "our", "you", "your", "he", "she", "they", "them", "it",
+    "am", "is", "are", "was", "were", "be", "been", "do", "does", "did", "have", "has", "had",
+    "use", "used", "using", "know", "like", "love", "prefer", "want", "work", "worked", "working",
+    "mostly", "mainly", "usually", "primarily", "basically", "currently", "also", "just", "really",
+    "any", "anything", "whatever", "everything", "something", "all", "some", "stuff", "things", "etc",
+}
+DATE_LIKE_RE = re.compile(r"^\d{4}[-/.]\d{1,2}[-/.]\d{1,2}$|^\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}$")
+
+def _is_wordlike(token: str) -> bool:
+    # Letters/marks in any script (Indic vowel signs are category M*), plus name punctuation.
+    return all(unicodedata.category(ch)[0] in "LM" or ch in ".'-" for ch in token)
+
+def _is_non_answer(text: str) -> bool:
+    return text.lower().strip(" .!?") in NOT_AN_ANSWER or bool(NON_ANSWER_RE.search(text))
+
+def _looks_like_phrase(text: str, max_words: int) -> bool:
+    words = text.split()
+    return (
+        0 < len(words) <= max_words
+        and not _is_non_answer(text)
+        and all(_is_wordlike(w) for w in words)
+    )
+
+def _has_filler(text: str) -> bool:
+    # All-caps tokens are acronyms ("IT Support"), not the pronoun.
+    return any(w.lower().strip(".") in NOT_VALUE_WORDS for w in text.split() if not (w.isupper() and len(w) > 1))
+
+def _looks_like_name(text: str) -> bool:
+    words = text.split()
+    return (
+        2 <= len(words) <= 4
+        and _looks_like_phrase(text, 4)
+        and not any(w.lower().strip(".") in NOT_NAME_WORDS for w in words)
+    )
+
+def _looks_like_phone(text: str) -> bool:
+    digits = sum(ch.isdigit() for ch in text)
+    return validate_phone(text) and 7 <= digits <= 15 and not DATE_LIKE_RE.match(text.strip())
+
+def _short_list(text: str, max_words: int = 4) -> List[str]:
+    items = [p.strip() for i in clean_list(text) for p in LIST_AND_RE.split(i) if p.strip()]
+    if not items or any("?" in i or len(i.split()) > max_words for i in items):
+        return []
+    if any(_is_non_answer(i) or _has_filler(i) for i in items):
+        return []
+    return items
+
+def local_extract(field_name: Optional[str], text: str) -> Optional[Candidate]:
+    """
+    Deterministic extraction for the field we just asked for (see FIELD_ORDER).
+    Returns a Candidate holding only that field when the answer is unambiguous,
+    or None so the caller falls back to the LLM.
+    """
+    text = (text or "").strip()
+    if not field_name or not text or len(text) > 200:
+        return None
+    cand = Candidate()
+    if field_name == "email":
+        found = EMAIL_SEARCH_RE.findall(text)
+        if len(found) == 1 and validate_email(found[0]):
+            cand.email = found[0].rstrip(".")
+    elif field_name == "phone":
+        if _looks_like_phone(text):
+            cand.phone = text
+    elif field_name == "years_experience":
+        m = YEARS_RE.match(text)
+        if m:
+            cand.years_experience = float(m.group(1))
+    elif field_name == "full_name":
+        name = NAME_PREFIX_RE.sub("", text).rstrip(".")
+        if _looks_like_name(name):
+            cand.full_name = name
+    elif field_name == "location":
+        loc = LOCATION_PREFIX_RE.sub("", text).rstrip(".")
+        parts = [p.strip() for p in loc.split(",") if p.strip()]
+        if 1 <= len(parts) <= 3 and all(_looks_like_phrase(p, 4) and not _has_filler(p) for p in parts):
+            cand.location = ", ".join(parts)
+    elif field_name == "desired_positions":
+        cand.desired_positions = _short_list(text)
+    elif field_name == "tech_stack":
+        cand.tech_stack = _short_list(text)
+    return cand if getattr(cand, field_name) not in (None, "", []) else None
+
 # ------------- Candidate struct -------------
-@dataclass
+@dataclass(slots=True)  # no per-instance __dict__: one of these lives in every session
 class Candidate:
     full_name: Optional[str] = None
     email: Optional[str] = None
@@ -53,51 +240,48 @@ class Candidate:
             "tech_stack": ", ".join(self.tech_stack),
         }
 
+    def as_dict(self) -> Dict:
+        """Structured (JSON-ready) view, keeping lists as lists."""
+        return {f: getattr(self, f) for f in FIELD_NAMES}
+
+FIELD_NAMES = tuple(f.name for f in fields(Candidate))
+
 # ------------- LLM Calls -------------
-def llm_chat(messages: List[Dict], stream: bool = True):
-    """
-    Generic streaming chat call.
-    """
-    client = get_client()
-    return client.chat.completions.create(
-        model=MODEL_ID,
+def _chat_request(messages: List[Dict], stream: bool) -> Dict:
+    return dict(
         messages=messages,
         stream=stream,  # Streaming supported per docs. :contentReference[oaicite:6]{index=6}
         temperature=0.3,
         max_completion_tokens=800,
     )
 
-def extract_candidate_json(messages: List[Dict]) -> Candidate:
+def llm_chat(messages: List[Dict], stream: bool = True, kind: str = "chat", with_model: bool = False):
     """
-    Ask model to output a strict JSON object containing the candidate fields it has
-    seen so far in the conversation. Use JSON Object Mode so we always parse JSON.
+    Generic streaming chat call.
     """
-    client = get_client()
-    resp = client.chat.completions.create(
-        model=MODEL_ID,
-        messages=messages + [
-            {
-                "role": "system",
-                "content": (
-                    "Extract candidate info seen so far. "
-                    "Return a JSON object with keys: full_name, email, phone, years_experience, "
-                    "desired_positions (array of strings), location, tech_stack (array of strings). "
-                    "If a field is unknown, set it to null or an empty array. Return JSON only."
-                ),
-            }
-        ],
-        # JSON Object Mode: guarantees valid JSON syntax (not full schema). :contentReference[oaicite:7]{index=7}
-        response_format={"type": "json_object"},
-        stream=False,
-        temperature=0,
-        max_completion_tokens=400,
-    )
-    raw = resp.choices[0].message.content or "{}"
-    try:
-        data = json.loads(raw)
-    except Exception:
-        data = {}
+    return chat_completion(kind, with_model=with_model, **_chat_request(messages, stream))
 
+async def allm_chat(messages: List[Dict], stream: bool = True, kind: str = "chat", with_model: bool = False):
+    """Async llm_chat(); with stream=True returns an async iterator of chunks."""
+    return await achat_completion(kind, with_model=with_model, **_chat_request(messages, stream))
+
+EXTRACTION_PROMPT = (
+    "Extract candidate info seen so far. "
+    "Return a JSON object with keys: full_name, email, phone, years_experience, "
+    "desired_positions (array of strings), location, tech_stack (array of strings). "
+    "If a field is unknown, set it to null or an empty array. Return JSON only."
+)
+
+DELTA_EXTRACTION_PROMPT = (
+    "You update a candidate profile from the candidate's newest message. "
+    "You get the current profile as JSON and the message. "
+    "Return a JSON object with ONLY the keys whose values the new message provides or corrects: "
+    "full_name, email, phone, years_experience, desired_positions (array of strings), "
+    "location, tech_stack (array of strings). Return {} if the message adds nothing. Return JSON only."
+)
+
+def candidate_from_json(data: Dict) -> Candidate:
+    """Build a Candidate from a (possibly partial) extraction JSON object."""
     cand = Candidate()
     cand.full_name = (data.get("full_name") or None)
     cand.email = (data.get("email") or None)
@@ -114,21 +298,166 @@ def extract_candidate_json(messages: List[Dict]) -> Candidate:
     cand.tech_stack = [s for s in (data.get("tech_stack") or []) if isinstance(s, str)]
     return cand
 
+def _parse_json_object(raw: Optional[str]) -> Dict:
+    try:
+        data = json.loads(raw or "{}")
+    except Exception:
+        data = {}
+    return data if isinstance(data, dict) else {}
+
+def _extraction_request(messages: List[Dict]) -> Dict:
+    return dict(
+        messages=messages + [{"role": "system", "content": EXTRACTION_PROMPT}],
+        # JSON Object Mode: guarantees valid JSON syntax (not full schema). :contentReference[oaicite:7]{index=7}
+        response_format={"type": "json_object"},
+        stream=False,
+        temperature=0,
+        max_completion_tokens=400,
+    )
+
+def extract_candidate_json(messages: List[Dict]) -> Candidate:
+    """
+    Ask model to output a strict JSON object containing the candidate fields it has
+    seen so far in the conversation. Use JSON Object Mode so we always parse JSON.
+    """
+    resp = chat_completion("extraction", **_extraction_request(messages))
+    return candidate_from_json(_parse_json_object(resp.choices[0].message.content))
+
+async def aextract_candidate_json(messages: List[Dict]) -> Candidate:
+    resp = await achat_completion("extraction", **_extraction_request(messages))
+    return candidate_from_json(_parse_json_object(resp.choices[0].message.content))
+
+def _delta_request(user_text: str, current: Candidate, asked_field: Optional[str]) -> Dict:
+    state = json.dumps(current.as_dict(), ensure_ascii=False, separators=(",", ":"))
+    hint = f"The candidate was just asked for: {asked_field}.\n" if asked_field else ""
+    return dict(
+        messages=[
+            {"role": "system", "content": DELTA_EXTRACTION_PROMPT},
+            {"role": "user", "content": f"Current profile: {state}\n{hint}New message: {user_text}"},
+        ],
+        response_format={"type": "json_object"},
+        stream=False,
+        temperature=0,
+        max_completion_tokens=200,
+    )
+
+def extract_candidate_delta(user_text: str, current: Candidate, asked_field: Optional[str] = None) -> Candidate:
+    """
+    Incremental extraction: send only the newest user turn plus the current
+    Candidate state as compact JSON, so the prompt size stays flat as the
+    conversation grows. Returns a Candidate holding only the fields the
+    message provides (everything else empty).
+    """
+    resp = chat_completion("extraction_delta", **_delta_request(user_text, current, asked_field))
+    return candidate_from_json(_parse_json_object(resp.choices[0].message.content))
+
+async def aextract_candidate_delta(user_text: str, current: Candidate, asked_field: Optional[str] = None) -> Candidate:
+    resp = await achat_completion("extraction_delta", **_delta_request(user_text, current, asked_field))
+    return candidate_from_json(_parse_json_object(resp.choices[0].message.content))
+
+def next_missing_field(c: Candidate) -> Optional[str]:
+    """First field in FIELD_ORDER that is still empty, or None when complete."""
+    for f in FIELD_ORDER:
+        if not getattr(c, f):
+            return f
+    return None
+
+# ------------- Merging extracted state -------------
+LIST_FIELDS = ("desired_positions", "tech_stack")
+
+def _norm_value(val):
+    if isinstance(val, list):
+        return sorted(str(v).strip().lower() for v in val if v)
+    if isinstance(val, str):
+        return val.strip().lower()
+    return val
+
+def candidate_conflicts(current: Candidate, update: Candidate, allowed: Optional[str] = None) -> List[str]:
+    """
+    Fields where `update` carries a value that disagrees with one already set
+    on `current`. The field the candidate was just asked for (`allowed`) is
+    never a conflict: answering it is expected to overwrite.
+    """
+    conflicts = []
+    for f in FIELD_NAMES:
+        new, old = getattr(update, f), getattr(current, f)
+        if f == allowed or new in (None, "", []) or old in (None, "", []):
+            continue
+        if _norm_value(new) != _norm_value(old):
+            conflicts.append(f)
+    return conflicts
+
+def merge_candidate(current: Candidate, update: Candidate) -> None:
+    """Copy every valid, non-empty field from `update` onto `current` in place."""
+    if update.full_name:
+        current.full_name = update.full_name.strip()
+    if update.email and validate_email(update.email):
+        current.email = update.email.strip()
+    if update.phone and validate_phone(update.phone):
+        current.phone = update.phone.strip()
+    if update.years_experience is not None:
+        current.years_experience = update.years_experience
+    if update.desired_positions:
+        current.desired_positions = [p for p in update.desired_positions if p]
+    if update.location:
+        current.location = update.location.strip()
+    if update.tech_stack:
+        current.tech_stack = [t for t in update.tech_stack if t]
+
+def extract_incremental(
+    messages: List[Dict], current: Candidate, asked_field: Optional[str] = None, use_rules: bool = True
+) -> Candidate:
+    """
+    Incremental extraction + merge for the newest user turn (messages[-1]).
+    Tries local_extract() for the asked field first and skips the LLM when it
+    is confident. Otherwise sends a delta request, falling back to a full
+    re-extraction over `messages` only when the delta contradicts state we
+    already hold. Updates `current` in place and returns it.
+    """
+    if _apply_local_rules(messages, current, asked_field, use_rules):
+        return current
+    delta = extract_candidate_delta(messages[-1]["content"], current, asked_field)
+    if candidate_conflicts(current, delta, allowed=asked_field):
+        merge_candidate(current, extract_candidate_json(messages))
+    else:
+        merge_candidate(current, delta)
+    return current
+
+async def aextract_incremental(
+    messages: List[Dict], current: Candidate, asked_field: Optional[str] = None, use_rules: bool = True
+) -> Candidate:
+    """Async extract_incremental()."""
+    if _apply_local_rules(messages, current, asked_field, use_rules):
+        return current
+    delta = await aextract_candidate_delta(messages[-1]["content"], current, asked_field)
+    if candidate_conflicts(current, delta, allowed=asked_field):
+        merge_candidate(current, await aextract_candidate_json(messages))
+    else:
+        merge_candidate(current, delta)
+    return current
+
+def _apply_local_rules(messages: List[Dict], current: Candidate, asked_field: Optional[str], use_rules: bool) -> bool:
+    local = local_extract(asked_field, messages[-1]["content"]) if use_rules else None
+    if use_rules and asked_field:
+        cache_event("local_rules", hit=local is not None)
+    if local is not None:
+        merge_candidate(current, local)
+    return local is not None
+
 def generate_tech_questions(techs: List[str]) -> Dict[str, List[str]]:
     """
     Ask model to write 3–5 targeted questions per technology.
     Return a dict {tech: [q1, q2, ...]}.
     """
     if not techs: return {}
-    client = get_client()
     prompt = (
         "Based on the candidate's declared tech stack, generate 3-5 interview questions per item. "
         "Questions should be practical and progressively challenging. "
         "Return strict JSON: { 'TECH': ['Q1','Q2',...] } with every tech provided."
     )
     # Non-streaming + JSON Object mode to parse easily.
-    resp = client.chat.completions.create(
-        model=MODEL_ID,
+    resp = chat_completion(
+        "questions",
         messages=[
             {"role": "system", "content": "You are a senior technical interviewer."},
             {"role": "user", "content": f"Tech stack: {', '.join(techs)}\n{prompt}"},
@@ -146,6 +475,177 @@ def generate_tech_questions(techs: List[str]) -> Dict[str, List[str]]:
         return fixed
     except Exception:
         # Fallback shape
-        return {t: [f"Describe a project where you used {t}.",
-                    f"What are common pitfalls when working with {t}?",
-                    f"How would you debug a production issue related to {t}?"] for t in techs}
+        return {t: fallback_questions(t) for t in techs}
+
+def fallback_questions(tech: str) -> List[str]:
+    """Canned questions used when the model fails or skips a technology."""
+    return [f"Describe a project where you used {tech}.",
+            f"What are common pitfalls when working with {tech}?",
+            f"How would you debug a production issue related to {tech}?"]
+
+# ------------- Concurrent question generation -------------
+QGEN_CONCURRENCY = int(os.getenv("TALENTSCOUT_QGEN_CONCURRENCY", 4))
+QGEN_TIMEOUT = float(os.getenv("TALENTSCOUT_QGEN_TIMEOUT", 20))
+QGEN_GROUP_SIZE = int(os.getenv("TALENTSCOUT_QGEN_GROUP_SIZE", 1))
+QGEN_TOKENS_PER_TECH = 250
+
+async def _agenerate_group(client: AsyncGroq, techs: List[str], sem: asyncio.Semaphore, timeout: float,
+                           limiter=None) -> Dict[str, List[str]]:
+    """One small JSON-mode request for a few technologies; canned questions on timeout/error."""
+    async with sem:
+        if limiter is not None:
+            await asyncio.to_thread(limiter.acquire)  # blocking token bucket: keep it off the loop
+        try:
+            resp = await asyncio.wait_for(
+                achat_completion(
+                    "questions",
+                    client,
+                    messages=[
+                        {"role": "system", "content": "You are a senior technical interviewer."},
+                        {"role": "user", "content": (
+                            f"Tech stack: {', '.join(techs)}\n"
+                            "Generate 3-5 practical, progressively challenging interview questions per item. "
+                            "Return strict JSON: { 'TECH': ['Q1','Q2',...] } with every tech provided."
+                        )},
+                    ],
+                    response_format={"type": "json_object"},
+                    stream=False,
+                    temperature=0.2,
+                    max_completion_tokens=QGEN_TOKENS_PER_TECH * len(techs),
+                ),
+                timeout,
+            )
+            data = _parse_json_object(resp.choices[0].message.content)
+        except Exception:
+            data = {}
+    by_name = {str(k).strip().lower(): v for k, v in data.items() if isinstance(v, list) and v}
+    if len(techs) == 1 and len(by_name) == 1 and techs[0].lower() not in by_name:
+        # Single-tech request: accept whatever key the model chose.
+        by_name = {techs[0].lower(): next(iter(by_name.values()))}
+    return {
+        t: [str(q) for q in by_name[t.lower()]][:5] if t.lower() in by_name else fallback_questions(t)
+        for t in techs
+    }
+
+async def agenerate_tech_questions(
+    techs: List[str],
+    concurrency: int = QGEN_CONCURRENCY,
+    timeout: float = QGEN_TIMEOUT,
+    group_size: int = QGEN_GROUP_SIZE,
+    on_result=None,
+    limiter=None,
+) -> Dict[str, List[str]]:
+    """
+    Fan out one small request per technology (or per `group_size` group) with
+    at most `concurrency` in flight, so latency tracks the slowest single tech
+    rather than the total output length. `on_result(tech, questions)` is
+    called as each group lands; `limiter.acquire()`, if given, runs before
+    each request is sent. Returns {tech: [q1, ...]} in stack order.
+    """
+    if not techs: return {}
+    client = get_async_client()
+    sem = asyncio.Semaphore(max(1, concurrency))
+    step = max(1, group_size)
+    groups = [techs[i:i + step] for i in range(0, len(techs), step)]
+    merged: Dict[str, List[str]] = {}
+    for fut in asyncio.as_completed([_agenerate_group(client, g, sem, timeout, limiter) for g in groups]):
+        part = await fut
+        merged.update(part)
+        if on_result:
+            for tech, qs in part.items():
+                on_result(tech, qs)
+    return {t: merged[t] for t in techs if t in merged}
+
+# ------------- Streamed question generation -------------
+QGEN_STREAM_PROMPT = (
+    "Generate 3-5 practical, progressively challenging interview questions per item. "
+    'Reply with only a JSON object like {"TECH": ["Q1", "Q2", ...]} covering every tech provided, '
+    "using the tech names exactly as given. No prose, no code fences."
+)
+QGEN_MAX_PER_TECH = 5
+
+async def _astream_group(client: AsyncGroq, techs: List[str], sem: asyncio.Semaphore, timeout: float,
+                         out: asyncio.Queue):
+    """One streamed request for a few technologies; puts (tech, question) as each one closes, then None."""
+    by_name = {t.lower(): t for t in techs}
+    counts: Dict[str, int] = {}
+
+    async def run():
+        # JSON mode can't be combined with streaming, so the prompt asks for JSON and the parser is lenient.
+        stream = await achat_completion(
+            "questions",
+            client,
+            messages=[
+                {"role": "system", "content": "You are a senior technical interviewer."},
+                {"role": "user", "content": f"Tech stack: {', '.join(techs)}\n{QGEN_STREAM_PROMPT}"},
+            ],
+            stream=True,
+            temperature=0.2,
+            max_completion_tokens=QGEN_TOKENS_PER_TECH * len(techs),
+        )
+        parser = JSONPairParser()
+        try:
+            async for chunk in stream:
+                token = chunk.choices[0].delta.content if chunk.choices else None
+                for key, question in parser.feed(token or ""):
+                    # Single-tech request: accept whatever key the model chose.
+                    tech = techs[0] if len(techs) == 1 else by_name.get(key.strip().lower())
+                    if tech and question.strip() and counts.get(tech, 0) < QGEN_MAX_PER_TECH:
+                        counts[tech] = counts.get(tech, 0) + 1
+                        out.put_nowait((tech, question.strip()))
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async with sem:
+        try:
+            await asyncio.wait_for(run(), timeout)
+        except Exception:
+            pass  # questions already streamed stay; techs without any get the canned ones
+        finally:
+            out.put_nowait(None)
+
+async def astream_tech_questions(
+    techs: List[str],
+    concurrency: int = QGEN_CONCURRENCY,
+    timeout: float = QGEN_TIMEOUT,
+    group_size: int = QGEN_GROUP_SIZE,
+) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Streaming agenerate_tech_questions(): the same per-technology fan-out, but
+    every request streams and each (tech, question) pair is yielded as soon as
+    its JSON string is complete, in arrival order across technologies. A tech
+    that has no question when the streams end gets fallback_questions().
+    """
+    if not techs:
+        return
+    client = get_async_client()
+    sem = asyncio.Semaphore(max(1, concurrency))
+    step = max(1, group_size)
+    queue: asyncio.Queue = asyncio.Queue()
+    tasks = [asyncio.ensure_future(_astream_group(client, techs[i:i + step], sem, timeout, queue))
+             for i in range(0, len(techs), step)]
+    answered = set()
+    try:
+        pending = len(tasks)
+        while pending:
+            item = await queue.get()
+            if item is None:
+                pending -= 1
+                continue
+            answered.add(item[0])
+            yield item
+        for tech in techs:
+            if tech not in answered:
+                for question in fallback_questions(tech):
+                    yield tech, question
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def generate_tech_questions_concurrent(techs: List[str], **kwargs) -> Dict[str, List[str]]:
+    """Blocking wrapper around agenerate_tech_questions() for sync callers."""
+    # Runs on the client manager's long-lived loop so pooled connections are reused.
+    return get_manager().run(agenerate_tech_questions(techs, **kwargs))
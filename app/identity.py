@@ -0,0 +1,270 @@
+# app/identity.py
+"""
+Candidate identity: who is the same person across saves.
+
+Every stored row yields up to three identity keys:
+
+    e:<hash of the normalized email>
+    p:<hash of the phone>
+    f:<fingerprint of the normalized full name + location>
+
+Rows saved with hashed PII carry those hashes already; raw values are hashed
+the same way, so a hashed and an unhashed save of one candidate still match.
+Hashed phones are stored as entered (what hash_if_needed always wrote), so a
+raw phone gets two p: keys: the hash of its normalized form (digits, leading
++), which matches other raw saves however they were formatted, and the hash
+as entered, which matches hashed saves typed the same way.
+A fingerprint match only counts when email and phone don't contradict it
+(two "Rahul Sharma, Delhi" rows with different emails are different people).
+
+IdentityIndex keeps key -> row reference in memory for one store: loaded
+once, updated as rows are written, and reloaded only if another process
+changed the store, so the duplicate check on save is a few dict lookups.
+For CSV, where a merge appends the merged row, loading replays the file in
+order and a row matching an earlier one supersedes it.
+Files written before merges existed hold plain duplicates, which replay
+treats the same way (the older copy is hidden, not merged): run `dedup`
+once on such a file before the app opens it.
+
+Collapse duplicates already in a store (for CSV this also drops superseded rows):
+    python app/identity.py dedup                      # data/candidates.csv, in place
+    python app/identity.py dedup --path old.csv --out clean.csv
+    python app/identity.py dedup --store sqlite       # merge + soft-delete
+"""
+from __future__ import annotations
+import argparse, csv, hashlib, re, unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from helpers import LIST_FIELDS, hash_pii
+
+PHONE_STRIP_RE = re.compile(r"[^\d+]")
+
+def email_key(email: str) -> str:
+    """Index key for an email: its PII hash (already-hashed values pass through)."""
+    if not email:
+        return ""
+    return email if email.startswith("hash:") else hash_pii(email)
+
+def normalize_phone(phone: str) -> str:
+    """'+91 98765-43210' -> '+919876543210' (a '+' is kept only in front)."""
+    raw = PHONE_STRIP_RE.sub("", phone or "")
+    return ("+" if raw.startswith("+") else "") + raw.replace("+", "")
+
+def phone_key(phone: str) -> str:
+    """Stored form of a phone: its PII hash as entered (already-hashed values pass through)."""
+    if not phone:
+        return ""
+    return phone if phone.startswith("hash:") else hash_pii(phone)
+
+def phone_keys(phone: str) -> List[str]:
+    """Index keys for a phone: the normalized hash first, then the stored form if it differs."""
+    if not phone:
+        return []
+    if phone.startswith("hash:"):
+        return [phone]
+    keys = [hash_pii(normalize_phone(phone))]
+    if phone_key(phone) != keys[0]:
+        keys.append(phone_key(phone))
+    return keys
+
+def _same_phone(a: Tuple[str, ...], b: Tuple[str, ...]) -> bool:
+    return not a or not b or not set(a).isdisjoint(b)
+
+def normalize_text(value: str) -> str:
+    """Accent-, case- and punctuation-insensitive form: 'São Paulo, BR' -> 'sao paulo br'."""
+    text = unicodedata.normalize("NFKD", value or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+def fingerprint(name: str, location: str) -> str:
+    """Name + location fingerprint; empty unless both are present."""
+    n, loc = normalize_text(name), normalize_text(location)
+    if not n or not loc:
+        return ""
+    return hashlib.sha256(f"{n}|{loc}".encode("utf-8")).hexdigest()[:16]
+
+def identity_keys(row: Dict) -> List[str]:
+    """Identity keys of a stored row, strongest first."""
+    keys = []
+    e, p = email_key(row.get("email") or ""), phone_keys(row.get("phone") or "")
+    f = fingerprint(row.get("full_name") or "", row.get("location") or "")
+    if e:
+        keys.append("e:" + e)
+    keys += ["p:" + k for k in p]
+    if f:
+        keys.append("f:" + f)
+    return keys
+
+def _contradicts(a: Dict, b: Dict) -> bool:
+    ea, eb = email_key(a.get("email") or ""), email_key(b.get("email") or "")
+    pa, pb = phone_keys(a.get("phone") or ""), phone_keys(b.get("phone") or "")
+    return bool((ea and eb and ea != eb) or not _same_phone(tuple(pa), tuple(pb)))
+
+def _split(value) -> List[str]:
+    return [v.strip() for v in str(value or "").split(",") if v.strip()]
+
+def merge_rows(old: Dict, new: Dict) -> Dict:
+    """Newer non-empty values win; list columns (positions, tech stack) are unioned."""
+    merged = dict(old)
+    for col, value in new.items():
+        if col in LIST_FIELDS:
+            seen, out = set(), []
+            for item in _split(old.get(col)) + _split(value):
+                if item.lower() not in seen:
+                    seen.add(item.lower())
+                    out.append(item)
+            merged[col] = ", ".join(out)
+        elif value not in (None, ""):
+            merged[col] = value
+    return merged
+
+class IdentityIndex:
+    """key -> store row reference (CSV: data row number, SQLite: row id) for one store."""
+
+    def __init__(self, store):
+        self.store = store
+        self._refs: Dict[str, object] = {}
+        # Fingerprint matches are checked against the email/phone keys of the row they point to.
+        self._contacts: Dict[object, Tuple[str, Tuple[str, ...]]] = {}
+        self._forward: Dict[object, object] = {}  # superseded ref -> the ref that replaced it
+        self.next_ref = 0  # CSV: row number the next appended row gets
+        self._version = None  # store.version() the index reflects; None = not loaded
+
+    def __len__(self):
+        return len(self._refs)
+
+    def ensure_loaded(self):
+        """(Re)load when first used or when the store was changed behind our back."""
+        version = self.store.version()
+        if self._version is None or version != self._version:
+            self._refs, self._contacts, self._forward, self.next_ref = {}, {}, {}, 0
+            replay = self.store.merge_appends
+            for ref, row in self.store.iter_all_refs():
+                old = self.match(row) if replay else None
+                if old is None:
+                    self.add(ref, row)
+                else:
+                    self.supersede(old, ref, row)
+            self._version = version
+
+    def add(self, ref, row: Dict):
+        for key in identity_keys(row):
+            self._refs.setdefault(key, ref)
+        e, p = email_key(row.get("email") or ""), tuple(phone_keys(row.get("phone") or ""))
+        old_e, old_p = self._contacts.get(ref, ("", ()))
+        self._contacts[ref] = (e or old_e, p or old_p)
+        if isinstance(ref, int) and ref >= self.next_ref:
+            self.next_ref = ref + 1
+
+    def supersede(self, old, ref, row: Dict):
+        """`row`, stored at `ref`, is the merged version of the row at `old` (CSV merges append)."""
+        self._forward[old] = ref
+        old_e, old_p = self._contacts.pop(old, ("", ()))
+        for key in identity_keys(row):
+            self._refs[key] = ref
+        e, p = email_key(row.get("email") or ""), tuple(phone_keys(row.get("phone") or ""))
+        self._contacts[ref] = (e or old_e, p or old_p)
+        if isinstance(ref, int) and ref >= self.next_ref:
+            self.next_ref = ref + 1
+
+    @property
+    def superseded(self) -> Set[object]:
+        """References of rows a later row replaced."""
+        return set(self._forward)
+
+    def match(self, row: Dict) -> Optional[object]:
+        """Reference of the stored row that `row` duplicates, or None (a few dict lookups)."""
+        e, p = email_key(row.get("email") or ""), tuple(phone_keys(row.get("phone") or ""))
+        for key in identity_keys(row):
+            ref = self._refs.get(key)
+            if ref is None:
+                continue
+            while ref in self._forward:
+                ref = self._forward[ref]
+            if key.startswith("f:"):
+                known_e, known_p = self._contacts.get(ref, ("", ()))
+                if (e and known_e and e != known_e) or not _same_phone(p, known_p):
+                    continue
+            return ref
+        return None
+
+    def synced(self):
+        """Call after our own write: the index already reflects it."""
+        self._version = self.store.version()
+
+    def invalidate(self):
+        self._version = None
+
+# ------------- Bulk dedup -------------
+def dedup_rows(rows: Iterable[Dict]) -> Tuple[List[Dict], List[List[int]]]:
+    """
+    Collapse duplicate rows (first occurrence keeps its position, later ones are
+    merged into it). Returns (unique rows, source row numbers per unique row).
+    """
+    out: List[Dict] = []
+    sources: List[List[int]] = []
+    refs: Dict[str, int] = {}
+    for i, row in enumerate(rows):
+        target = None
+        for key in identity_keys(row):
+            j = refs.get(key)
+            if j is not None and not (key.startswith("f:") and _contradicts(out[j], row)):
+                target = j
+                break
+        if target is None:
+            target = len(out)
+            out.append(dict(row))
+            sources.append([i])
+        else:
+            out[target] = merge_rows(out[target], row)
+            sources[target].append(i)
+        for key in identity_keys(out[target]):
+            refs.setdefault(key, target)
+    return out, sources
+
+def dedup_csv(src: Path, dest: Optional[Path] = None) -> Tuple[int, int]:
+    """Deduplicate a candidates CSV into `dest` (default: rewrite `src` atomically). Returns (rows in, rows out)."""
+    from storage import ROW_COLUMNS, file_lock, replace_file
+
+    def write(path: Path, rows: List[Dict], columns: List[str]):
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            w = csv.DictWriter(fh, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+            w.writeheader()
+            w.writerows(rows)
+
+    with file_lock(src):
+        with open(src, newline="", encoding="utf-8") as fh:
+            reader = csv.DictReader(fh)
+            columns = reader.fieldnames or ROW_COLUMNS
+            unique, sources = dedup_rows(reader)
+        total = sum(len(s) for s in sources)
+        if dest is None:
+            replace_file(src, lambda tmp: write(tmp, unique, columns))
+        else:
+            write(dest, unique, columns)
+    return total, len(unique)
+
+def main(argv=None):
+    from storage import open_store
+
+    parser = argparse.ArgumentParser(description="Candidate duplicate detection")
+    parser.add_argument("--store", choices=["csv", "sqlite"], help="backend (default: $TALENTSCOUT_STORE or csv)")
+    parser.add_argument("--path", type=Path, help="store file (default: data/candidates.csv|.db)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    dd = sub.add_parser("dedup", help="merge duplicate candidates")
+    dd.add_argument("--out", type=Path, help="CSV only: write here instead of rewriting the store")
+    args = parser.parse_args(argv)
+
+    store = open_store(args.store, args.path)
+    if args.cmd == "dedup":
+        if store.kind == "csv":
+            if not store.path.exists():
+                parser.error(f"{store.path} does not exist")
+            before, after = dedup_csv(store.path, args.out)
+        else:
+            before, after = store.dedup()
+        print(f"{before} rows -> {after} candidates ({before - after} duplicates merged) in {args.out or store.location}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# app/jsonstream.py
+"""
+Incremental parser for streamed JSON objects of string lists.
+
+The question generator answers with {"TECH": ["Q1", "Q2", ...], ...}. Fed the
+completion chunk by chunk, JSONPairParser returns each (key, item) pair as
+soon as the item's closing quote arrives, so a question can be shown while the
+rest of the object is still being generated.
+
+It is deliberately lenient: text before the first "{" (a ```json fence, a
+preamble) is skipped, a bare string value counts as a one-item list, and
+numbers, nested objects and lists inside values are skipped. Only strings are
+decoded (by json.loads, escapes and all); nothing is validated beyond that.
+"""
+from __future__ import annotations
+import json
+from typing import List, Optional, Tuple
+
+WHITESPACE = " \t\r\n"
+
+class JSONPairParser:
+    """feed(chunk) -> [(key, item), ...] completed by that chunk."""
+
+    def __init__(self):
+        self.state = "start"   # start | key | colon | value | array | skip | done
+        self.key: Optional[str] = None
+        self._buf: List[str] = []      # raw characters of the string being read
+        self._in_string = False
+        self._escaped = False
+        self._string_role = ""         # what the current string is: key | value | item
+        self._depth = 0                # nesting depth while skipping a value
+        self._skip_return = ""         # state to resume after the skipped value
+
+    @property
+    def done(self) -> bool:
+        return self.state == "done"
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        out: List[Tuple[str, str]] = []
+        for ch in chunk:
+            if self._in_string:
+                self._string_char(ch, out)
+            elif self.state != "done":
+                self._char(ch)
+        return out
+
+    def _string_char(self, ch: str, out: List[Tuple[str, str]]):
+        if self._escaped:
+            self._escaped = False
+        elif ch == "\\":
+            self._escaped = True
+        elif ch == '"':
+            self._in_string = False
+            if self._string_role == "skip":
+                return
+            text = json.loads('"' + "".join(self._buf) + '"', strict=False)
+            if self._string_role == "key":
+                self.key, self.state = text, "colon"
+            else:
+                out.append((self.key or "", text))
+                self.state = "array" if self._string_role == "item" else "key"
+            return
+        if self._string_role != "skip":
+            self._buf.append(ch)
+
+    def _open_string(self, role: str):
+        self._in_string, self._escaped, self._string_role, self._buf = True, False, role, []
+
+    def _skip(self, ch: str, resume: str):
+        """Start skipping a non-string value beginning with `ch`."""
+        self._skip_return = resume
+        self._depth = 1 if ch in "[{" else 0
+        self.state = "skip"
+
+    def _char(self, ch: str):
+        state = self.state
+        if state == "start":
+            if ch == "{":
+                self.state = "key"
+        elif state == "key":
+            if ch == '"':
+                self._open_string("key")
+            elif ch == "}":
+                self.state = "done"
+        elif state == "colon":
+            if ch == ":":
+                self.state = "value"
+        elif state == "value":
+            if ch == "[":
+                self.state = "array"
+            elif ch == '"':
+                self._open_string("value")
+            elif ch not in WHITESPACE:
+                self._skip(ch, "key")
+        elif state == "array":
+            if ch == '"':
+                self._open_string("item")
+            elif ch == "]":
+                self.state = "key"
+            elif ch not in WHITESPACE and ch != ",":
+                self._skip(ch, "array")
+        elif state == "skip":
+            if ch == '"':
+                self._open_string("skip")
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                if self._depth == 0:
+                    # A scalar ended by its container closing.
+                    self.state = self._skip_return
+                    self._char(ch)
+                    return
+                self._depth -= 1
+                if self._depth == 0:
+                    self.state = self._skip_return
+            elif ch == "," and self._depth == 0:
+                self.state = self._skip_return
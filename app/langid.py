@@ -0,0 +1,169 @@
+# app/langid.py
+"""
+Language identification for user turns.
+
+Most non-English input in this app is in a script that identifies the
+language by itself (Tamil, Telugu, Gujarati, ...), so a Unicode-script
+histogram answers without any statistics. langdetect is only consulted for
+Latin-script text and for scripts shared by several languages (Devanagari:
+Hindi/Marathi, Bengali: Bengali/Assamese, Arabic: Arabic/Urdu/Persian, ...),
+where its answer is restricted to that script's languages.
+
+    python bench/bench_langid.py   # accuracy/latency vs. the langdetect-only detector
+"""
+from __future__ import annotations
+import bisect, threading, unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# ---------- Unicode scripts ----------
+# (first code point, last code point, script); letters outside these ranges count as "Other".
+SCRIPT_RANGES: List[Tuple[int, int, str]] = sorted([
+    (0x0041, 0x024F, "Latin"), (0x1E00, 0x1EFF, "Latin"),
+    (0x0370, 0x03FF, "Greek"),
+    (0x0400, 0x04FF, "Cyrillic"),
+    (0x0590, 0x05FF, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"), (0x0750, 0x077F, "Arabic"), (0xFB50, 0xFDFF, "Arabic"), (0xFE70, 0xFEFF, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B00, 0x0B7F, "Oriya"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+    (0x0E00, 0x0E7F, "Thai"),
+    (0x3040, 0x309F, "Hiragana"), (0x30A0, 0x30FF, "Katakana"),
+    (0x4E00, 0x9FFF, "Han"), (0x3400, 0x4DBF, "Han"),
+    (0xAC00, 0xD7AF, "Hangul"), (0x1100, 0x11FF, "Hangul"),
+])
+_RANGE_STARTS = [r[0] for r in SCRIPT_RANGES]
+
+# Script -> languages written in it (first = default when langdetect can't decide).
+SCRIPT_LANGS: Dict[str, Tuple[str, ...]] = {
+    "Devanagari": ("hi", "mr", "ne"),
+    "Bengali": ("bn", "as"),
+    "Gurmukhi": ("pa",),
+    "Gujarati": ("gu",),
+    "Oriya": ("or",),
+    "Tamil": ("ta",),
+    "Telugu": ("te",),
+    "Kannada": ("kn",),
+    "Malayalam": ("ml",),
+    "Arabic": ("ar", "ur", "fa"),
+    "Cyrillic": ("ru", "uk", "bg", "mk"),
+    "Greek": ("el",),
+    "Hebrew": ("he",),
+    "Thai": ("th",),
+    "Hangul": ("ko",),
+    "Han": ("zh-cn", "zh-tw"),
+}
+
+def _is_letter(ch: str) -> bool:
+    # Letters and marks: Indic vowel signs are category M*, not isalpha().
+    return unicodedata.category(ch)[0] in "LM"
+
+def script_of(ch: str) -> str:
+    cp = ord(ch)
+    i = bisect.bisect_right(_RANGE_STARTS, cp) - 1
+    if i >= 0 and cp <= SCRIPT_RANGES[i][1]:
+        return SCRIPT_RANGES[i][2]
+    return "Other"
+
+def script_histogram(text: str) -> Counter:
+    """Letter count per script (combining vowel signs count toward their script)."""
+    return Counter(script_of(ch) for ch in text if _is_letter(ch))
+
+# ---------- langdetect (lazy profiles) ----------
+_profiles_lock = threading.Lock()
+_profiles_loaded = False
+
+def preload():
+    """Load langdetect's language profiles now (they otherwise load on the first Latin-script turn)."""
+    global _profiles_loaded
+    with _profiles_lock:
+        if not _profiles_loaded:
+            from langdetect import DetectorFactory
+            from langdetect.detector_factory import init_factory
+            DetectorFactory.seed = 0  # Make langdetect deterministic
+            init_factory()
+            _profiles_loaded = True
+
+def _detect(text: str):
+    preload()
+    from langdetect import detect_langs, LangDetectException
+    try:
+        return detect_langs(text)  # e.g., [hi:0.92, en:0.06]
+    except LangDetectException:
+        return []
+
+# ---------- Robust language detection (ignore short/low-confidence text) ----------
+def _clean_alpha_spaces(text: str) -> str:
+    return "".join(ch for ch in text if _is_letter(ch) or ch.isspace())
+
+def guess_language_code(text: str) -> str | None:
+    """
+    Robust, language-agnostic detector.
+
+    Returns the ISO-639-1 code (e.g., 'hi', 'ta', 'ar', 'zh-cn') iff:
+      - The text has enough signal:
+          • >= 10 alphabetic chars for Latin-script text, OR
+          • >= 3 letters if mostly non-Latin (e.g., देवनागरी, العربية); the script decides
+            the language, with langdetect only choosing within a shared script
+      - For Latin text, langdetect's top language has probability >= 0.80
+      - The language is not English ('en')
+    Otherwise returns None (keep English).
+    """
+    hist = script_histogram(text)
+    if not hist:
+        return None
+    letters = sum(hist.values())
+    non_latin = {s: n for s, n in hist.items() if s not in ("Latin", "Other")}
+
+    if sum(non_latin.values()) >= hist.get("Latin", 0):
+        if letters < 3:
+            return None
+        if hist.get("Hiragana") or hist.get("Katakana"):
+            return "ja"  # kana only appear in Japanese (mixed with Han)
+        script = max(non_latin, key=non_latin.get)
+        langs = SCRIPT_LANGS.get(script)
+        if langs:
+            if len(langs) == 1:
+                return langs[0]
+            # Shared script: let langdetect choose, but only among this script's languages.
+            for cand in sorted(_detect(_clean_alpha_spaces(text)), key=lambda lp: -lp.prob):
+                if cand.lang in langs:
+                    return cand.lang
+            return langs[0]
+
+    # Latin (or unmapped) script: statistical detection, as before.
+    sanitized = _clean_alpha_spaces(text)
+    if sum(1 for ch in sanitized if not ch.isspace()) < (3 if non_latin else 10):
+        return None
+    candidates = _detect(sanitized)
+    if not candidates:
+        return None
+    top = max(candidates, key=lambda lp: lp.prob)
+    # Accept ANY supported language code from langdetect (not just those in LANG_NAMES)
+    if top.lang != "en" and top.prob >= 0.80:
+        return top.lang
+    return None
+
+class LanguageMemo:
+    """Per-session memo of guess_language_code() (candidates repeat short answers)."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._seen: "OrderedDict[str, Optional[str]]" = OrderedDict()
+
+    def __call__(self, text: str) -> Optional[str]:
+        key = " ".join(text.split()).lower()
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            return self._seen[key]
+        code = guess_language_code(text)
+        self._seen[key] = code
+        if len(self._seen) > self.maxsize:
+            self._seen.popitem(last=False)
+        return code
@@ -0,0 +1,155 @@
+# app/llm_client.py
+"""
+Process-wide Groq clients with connection pooling.
+
+Every helper used to build a fresh Groq() per call, paying TCP + TLS setup
+several times per user turn. ClientManager owns one pooled, keep-alive
+httpx connection pool for the sync client, plus one AsyncGroq per event loop
+(normally the manager's own background loop, see run()).
+
+429s and transient errors (408/409/5xx, connection resets) are retried by the
+Groq SDK with exponential backoff that honours Retry-After; the number of
+attempts is configured here.
+
+Tunables (env):
+    GROQ_MAX_CONNECTIONS      total pooled connections      (default 20)
+    GROQ_MAX_KEEPALIVE        idle keep-alive connections   (default 10)
+    GROQ_KEEPALIVE_EXPIRY     idle connection lifetime, s   (default 30)
+    GROQ_TIMEOUT              read/write timeout, s         (default 30)
+    GROQ_CONNECT_TIMEOUT      connect timeout, s            (default 5)
+    GROQ_MAX_RETRIES          retries on 429/5xx            (default 3)
+"""
+from __future__ import annotations
+import asyncio, os, threading, weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx
+    from groq import AsyncGroq, Groq
+
+@dataclass(frozen=True)
+class PoolConfig:
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    timeout: float = 30.0
+    connect_timeout: float = 5.0
+    max_retries: int = 3
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        return cls(
+            max_connections=int(os.getenv("GROQ_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive=int(os.getenv("GROQ_MAX_KEEPALIVE", cls.max_keepalive)),
+            keepalive_expiry=float(os.getenv("GROQ_KEEPALIVE_EXPIRY", cls.keepalive_expiry)),
+            timeout=float(os.getenv("GROQ_TIMEOUT", cls.timeout)),
+            connect_timeout=float(os.getenv("GROQ_CONNECT_TIMEOUT", cls.connect_timeout)),
+            max_retries=int(os.getenv("GROQ_MAX_RETRIES", cls.max_retries)),
+        )
+
+    def limits(self) -> httpx.Limits:
+        import httpx
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> httpx.Timeout:
+        import httpx
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+class ClientManager:
+    """Lazily builds and shares the pooled sync/async Groq clients."""
+
+    def __init__(self, config: Optional[PoolConfig] = None):
+        self.config = config or PoolConfig.from_env()
+        self._lock = threading.Lock()
+        self._client: Optional[Groq] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGroq]" = weakref.WeakKeyDictionary()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> "ClientManager":
+        return cls(PoolConfig.from_env())
+
+    def client(self) -> Groq:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import httpx
+                    from groq import Groq  # ~150 ms import: paid on first use, not at app import
+                    cfg = self.config
+                    self._client = Groq(
+                        http_client=httpx.Client(limits=cfg.limits(), timeout=cfg.timeouts()),
+                        max_retries=cfg.max_retries,
+                        timeout=cfg.timeouts(),
+                    )
+        return self._client
+
+    def async_client(self) -> AsyncGroq:
+        """AsyncGroq bound to the running event loop (httpx async pools are per-loop)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                import httpx
+                from groq import AsyncGroq
+                cfg = self.config
+                client = AsyncGroq(
+                    http_client=httpx.AsyncClient(limits=cfg.limits(), timeout=cfg.timeouts()),
+                    max_retries=cfg.max_retries,
+                    timeout=cfg.timeouts(),
+                )
+                self._async_clients[loop] = client
+        return client
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Long-lived background event loop, so async connections survive between calls."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    t = threading.Thread(target=loop.run_forever, name="groq-async-loop", daemon=True)
+                    t.start()
+                    self._loop, self._loop_thread = loop, t
+        return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run `coro` on the background loop from synchronous code and return its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop()).result(timeout)
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            loop = self._loop
+            if loop is not None:
+                clients = [c for l, c in self._async_clients.items() if l is loop]
+                for c in clients:
+                    asyncio.run_coroutine_threadsafe(c.close(), loop).result(5)
+                loop.call_soon_threadsafe(loop.stop)
+                self._loop = self._loop_thread = None
+            self._async_clients = weakref.WeakKeyDictionary()
+
+_manager: Optional[ClientManager] = None
+_manager_lock = threading.Lock()
+
+def get_manager() -> ClientManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ClientManager.from_env()
+    return _manager
+
+def set_manager(manager: ClientManager):
+    """Install a manager built elsewhere (e.g. by st.cache_resource in app.py)."""
+    global _manager
+    with _manager_lock:
+        if _manager is not None and _manager is not manager:
+            _manager.close()
+        _manager = manager
@@ -0,0 +1,304 @@
+# app/metrics.py
+"""
+Per-stage latency, token and cache instrumentation.
+
+- stage("extraction") times a block and attaches it to the current turn.
+- turn() collects every stage/LLM call of one user turn into a trace that the
+  sidebar debug panel can show.
+- timed_completion()/atimed_completion() wrap client.chat.completions.create:
+  wall time, time-to-first-token for streams, prompt/completion tokens.
+- cache_event("translation", hit=True) counts cache hits and misses.
+
+Every event is logged as one JSON object on the "talentscout.metrics" logger.
+Aggregates are exported in Prometheus text format by prometheus_text(), and
+start_metrics_server() serves them on /metrics when TALENTSCOUT_METRICS_PORT
+is set, next to /ready once the app installs a readiness probe.
+"""
+from __future__ import annotations
+import contextvars, json, logging, os, threading, time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+log = logging.getLogger("talentscout.metrics")
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# ------------- Registry -------------
+class Registry:
+    """Thread-safe counters and summaries (count/sum/max) with labels."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[LabelKey, float] = defaultdict(float)
+        self.summaries: Dict[LabelKey, List[float]] = {}  # [count, sum, max]
+
+    @staticmethod
+    def _key(name: str, labels: Dict) -> LabelKey:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        with self._lock:
+            self.counters[self._key(name, labels)] += value
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            s = self.summaries.setdefault(key, [0, 0.0, 0.0])
+            s[0] += 1
+            s[1] += value
+            s[2] = max(s[2], value)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.summaries.clear()
+
+REGISTRY = Registry()
+
+def _fmt_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels] + ([extra] if extra else [])
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def prometheus_text(registry: Registry = REGISTRY) -> str:
+    """Prometheus exposition-format dump of all counters and summaries."""
+    lines: List[str] = []
+    with registry._lock:
+        counters = sorted(registry.counters.items())
+        summaries = sorted(registry.summaries.items())
+    seen = set()
+    for (name, labels), value in counters:
+        if name not in seen:
+            lines.append(f"# TYPE {name} counter")
+            seen.add(name)
+        lines.append(f"{name}{_fmt_labels(labels)} {value:g}")
+    peaks: List[str] = []
+    for (name, labels), (count, total, peak) in summaries:
+        if name not in seen:
+            lines.append(f"# TYPE {name} summary")
+            peaks.append(f"# TYPE {name}_max gauge")
+            seen.add(name)
+        lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {total:.6f}")
+        peaks.append(f"{name}_max{_fmt_labels(labels)} {peak:.6f}")
+    return "\n".join(lines + peaks) + "\n"
+
+# ------------- Turn traces -------------
+_current_turn: contextvars.ContextVar[Optional[List[Dict]]] = contextvars.ContextVar("talentscout_turn", default=None)
+
+def emit(event: Dict, trace: Optional[List[Dict]] = None):
+    """Attach an event to the current (or given) turn and log it as JSON."""
+    trace = trace if trace is not None else _current_turn.get()
+    if trace is not None:
+        trace.append(event)
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps(event, ensure_ascii=False, default=str))
+
+@contextmanager
+def turn(**labels) -> Iterator[List[Dict]]:
+    """Collect all events of one user turn; yields the (growing) trace list."""
+    trace: List[Dict] = []
+    token = _current_turn.set(trace)
+    t0 = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        total = time.perf_counter() - t0
+        try:
+            _current_turn.reset(token)
+        except ValueError:
+            pass  # closed from another context (e.g. an abandoned async generator)
+        REGISTRY.observe("talentscout_turn_seconds", total)
+        llm = [e for e in trace if e["event"] == "llm_call"]
+        emit({
+            "event": "turn", "seconds": round(total, 4), "llm_calls": len(llm),
+            "prompt_tokens": sum(e.get("prompt_tokens") or 0 for e in llm),
+            "completion_tokens": sum(e.get("completion_tokens") or 0 for e in llm),
+            **labels,
+        })
+        trace.append({"event": "turn_total", "seconds": round(total, 4)})
+
+@contextmanager
+def stage(name: str, **labels):
+    """Time a block of turn work (language detection, extraction, ...)."""
+    t0 = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException as e:
+        # st.stop()/st.rerun() raise control-flow exceptions; only count real errors.
+        status = "stopped" if type(e).__name__ in ("StopException", "RerunException") else "error"
+        raise
+    finally:
+        dt = time.perf_counter() - t0
+        REGISTRY.observe("talentscout_stage_seconds", dt, stage=name)
+        emit({"event": "stage", "stage": name, "seconds": round(dt, 4), "status": status, **labels})
+
+def cache_event(cache: str, hit: bool):
+    REGISTRY.inc("talentscout_cache_events_total", cache=cache, result="hit" if hit else "miss")
+    emit({"event": "cache", "cache": cache, "hit": hit})
+
+def fallback_event(kind: str, primary: str, fallback: str, error: BaseException):
+    """A call was retried on its fallback model (see routing.py)."""
+    REGISTRY.inc("talentscout_llm_fallbacks_total", kind=kind, model=primary, fallback=fallback)
+    emit({"event": "fallback", "kind": kind, "model": primary, "fallback": fallback, "error": type(error).__name__})
+
+# ------------- LLM calls -------------
+def _usage_of(obj) -> Tuple[Optional[int], Optional[int]]:
+    # Non-streamed responses carry .usage; Groq streams put it on the last chunk's x_groq.usage.
+    usage = getattr(obj, "usage", None)
+    if usage is None:
+        usage = getattr(getattr(obj, "x_groq", None), "usage", None)
+    if usage is None:
+        return None, None
+    return getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+
+def _record_llm(kind: str, model: str, seconds: float, status: str, prompt_tokens=None,
+                completion_tokens=None, ttft: Optional[float] = None, stream: bool = False, trace=None):
+    REGISTRY.inc("talentscout_llm_requests_total", kind=kind, model=model, status=status)
+    REGISTRY.observe("talentscout_llm_seconds", seconds, kind=kind, model=model)
+    if ttft is not None:
+        REGISTRY.observe("talentscout_llm_ttft_seconds", ttft, kind=kind, model=model)
+    if prompt_tokens:
+        REGISTRY.inc("talentscout_llm_tokens_total", prompt_tokens, kind=kind, model=model, type="prompt")
+    if completion_tokens:
+        REGISTRY.inc("talentscout_llm_tokens_total", completion_tokens, kind=kind, model=model, type="completion")
+    event = {
+        "event": "llm_call", "kind": kind, "model": model, "stream": stream, "status": status,
+        "seconds": round(seconds, 4), "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+    }
+    if ttft is not None:
+        event["ttft"] = round(ttft, 4)
+    emit(event, trace)
+
+def _instrument_stream(stream, kind: str, model: str, t0: float, trace) -> Iterator:
+    # `trace` is captured at call time: the generator may be drained from another context.
+    ttft, usage, status = None, (None, None), "ok"
+    try:
+        for chunk in stream:
+            if ttft is None:
+                ttft = time.perf_counter() - t0
+            u = _usage_of(chunk)
+            if u != (None, None):
+                usage = u
+            yield chunk
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        _record_llm(kind, model, time.perf_counter() - t0, status, *usage, ttft=ttft, stream=True, trace=trace)
+
+def timed_completion(kind: str, create: Callable, model: str, stream: bool = False):
+    """Call `create()` (a chat.completions.create thunk) and record timing/tokens."""
+    t0 = time.perf_counter()
+    try:
+        resp = create()
+    except Exception:
+        _record_llm(kind, model, time.perf_counter() - t0, "error", stream=stream)
+        raise
+    if stream:
+        return _instrument_stream(resp, kind, model, t0, _current_turn.get())
+    _record_llm(kind, model, time.perf_counter() - t0, "ok", *_usage_of(resp))
+    return resp
+
+async def _ainstrument_stream(stream, kind: str, model: str, t0: float, trace) -> AsyncIterator:
+    ttft, usage, status = None, (None, None), "ok"
+    try:
+        async for chunk in stream:
+            if ttft is None:
+                ttft = time.perf_counter() - t0
+            u = _usage_of(chunk)
+            if u != (None, None):
+                usage = u
+            yield chunk
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        _record_llm(kind, model, time.perf_counter() - t0, status, *usage, ttft=ttft, stream=True, trace=trace)
+
+class TimedAsyncStream:
+    """Async chunk iterator returned by atimed_completion(stream=True); aclose() releases the connection."""
+
+    def __init__(self, stream, kind: str, model: str, t0: float, trace):
+        self._stream, self._kind, self._model, self._t0, self._trace = stream, kind, model, t0, trace
+        self._chunks: Optional[AsyncIterator] = None
+
+    def __aiter__(self) -> AsyncIterator:
+        if self._chunks is None:
+            self._chunks = _ainstrument_stream(self._stream, self._kind, self._model, self._t0, self._trace)
+        return self._chunks
+
+    async def aclose(self):
+        if self._chunks is None:  # opened but never read, e.g. a discarded speculative reply
+            _record_llm(self._kind, self._model, time.perf_counter() - self._t0, "cancelled", stream=True, trace=self._trace)
+        else:
+            await self._chunks.aclose()
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            await close()
+
+async def atimed_completion(kind: str, create: Callable, model: str, stream: bool = False):
+    """Async twin of timed_completion()."""
+    t0 = time.perf_counter()
+    try:
+        resp = await create()
+    except Exception:
+        _record_llm(kind, model, time.perf_counter() - t0, "error", stream=stream)
+        raise
+    if stream:
+        return TimedAsyncStream(resp, kind, model, t0, _current_turn.get())
+    _record_llm(kind, model, time.perf_counter() - t0, "ok", *_usage_of(resp))
+    return resp
+
+# ------------- Export -------------
+def configure_logging(level: int = logging.INFO):
+    """Plain JSON-per-line output for the metrics logger (skipped if already configured)."""
+    if not log.handlers:
+        h = logging.StreamHandler()
+        h.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(h)
+        log.propagate = False
+    log.setLevel(level)
+
+# Readiness hook for GET /ready: returns (ready, details); installed by the app (resources.warm_up).
+_readiness: Optional[Callable[[], Tuple[bool, Dict]]] = None
+
+def set_readiness_probe(probe: Callable[[], Tuple[bool, Dict]]):
+    global _readiness
+    _readiness = probe
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/ready" and _readiness is not None:
+            ready, details = _readiness()
+            return self._send(200 if ready else 503, "application/json",
+                              json.dumps({"ready": ready, "resources": details}).encode("utf-8"))
+        if path != "/metrics":
+            self.send_error(404)
+            return
+        self._send(200, "text/plain; version=0.0.4; charset=utf-8", prometheus_text().encode("utf-8"))
+
+    def _send(self, status: int, ctype: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+_server: Optional[ThreadingHTTPServer] = None
+
+def start_metrics_server(port: Optional[int] = None, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics in a daemon thread (port from TALENTSCOUT_METRICS_PORT); idempotent."""
+    global _server
+    port = port or int(os.getenv("TALENTSCOUT_METRICS_PORT", 0))
+    if not port or _server is not None:
+        return _server
+    _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server
@@ -0,0 +1,188 @@
+# app/preview.py
+"""
+Sidebar preview of saved candidates without re-parsing the whole file.
+
+CsvPreview keeps a byte-offset index of the rows in candidates.csv, keyed on
+the file's (mtime, size). Appends are indexed by reading only the new bytes,
+"delete last row" truncations just drop offsets, and a page is served by
+seeking straight to its first row, so rendering cost depends on the page size
+rather than on the file size.
+
+Before trusting the old offsets the index re-reads the bytes of the last
+record it indexed (or the header): a delete-last followed by an append keeps
+the inode and can leave the file at least as long as before, so size alone
+cannot tell it from a pure append. Any change that is neither a pure append
+nor a cut at a row boundary resets the index and bumps `resets`, which
+callers holding row numbers (search.SkillIndex) check.
+"""
+from __future__ import annotations
+import csv, io, os, threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from storage import ROW_COLUMNS, CandidateStore
+
+PAGE_SIZE = 50
+
+def _frame(records: List, columns, start: int) -> pd.DataFrame:
+    import pandas as pd  # deferred: only the sidebar preview needs it
+    return pd.DataFrame(records, columns=columns, index=range(start, start + len(records)))
+
+class CsvPreview:
+    """Incrementally maintained row index over an append-mostly CSV file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.resets = 0  # times indexed rows were invalidated (row numbers may have changed)
+        self._reset()
+
+    def _reset(self):
+        self.columns: List[str] = list(ROW_COLUMNS)
+        self._offsets: List[int] = []     # byte offset where each data row starts
+        self._indexed = 0                 # bytes consumed (always at a record boundary)
+        self._last = b""                  # bytes of the last indexed record (or header) ending at _indexed
+        self._sig: Optional[Tuple[float, int, int]] = None  # (mtime, size, inode)
+
+    def _invalidate(self):
+        if self._indexed:
+            self.resets += 1
+        self._reset()
+
+    def refresh(self):
+        """Bring the index up to date with the file; cheap when nothing changed."""
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset()
+                return
+            sig = (st.st_mtime, st.st_size, st.st_ino)
+            if sig == self._sig:
+                return
+            if self._sig is not None and (st.st_ino != self._sig[2] or st.st_size < self._header_end()):
+                self._invalidate()  # file replaced or truncated into the header
+            elif st.st_size < self._indexed:
+                # Truncated (delete last row): the cut must fall exactly where a row started.
+                while self._offsets and self._offsets[-1] > st.st_size:
+                    self._offsets.pop()
+                if self._offsets and self._offsets[-1] == st.st_size:
+                    self._offsets.pop()
+                    self._indexed = st.st_size
+                    self._last = self._read_last()
+                else:
+                    self._invalidate()
+            elif self._indexed and (st.st_size == self._indexed or self._read_last() != self._last):
+                # Same length but modified, or the last indexed record changed (truncate + append).
+                self._invalidate()
+            if st.st_size > self._indexed:
+                self._index_from(self._indexed, st.st_size)
+            self._sig = sig
+
+    def _read_last(self) -> bytes:
+        """Bytes of the last indexed record (the header when there are no rows), as on disk now."""
+        start = self._offsets[-1] if self._offsets else 0
+        with open(self.path, "rb") as fh:
+            fh.seek(start)
+            return fh.read(self._indexed - start)
+
+    def _header_end(self) -> int:
+        return self._offsets[0] if self._offsets else self._indexed
+
+    def _index_from(self, start: int, end: int):
+        with open(self.path, "rb") as fh:
+            fh.seek(start)
+            data = fh.read(end - start)
+        pos, in_quotes, record_start = start, False, start
+        last = start
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # partial write in progress; pick it up next refresh
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes  # quoted field spans lines
+            pos += len(line)
+            if in_quotes:
+                continue
+            if record_start == 0:
+                header = next(csv.reader([line.decode("utf-8-sig")]), None)
+                if header:
+                    self.columns = header
+            else:
+                self._offsets.append(record_start)
+            last, record_start = record_start, pos
+        if record_start > start:
+            self._last = data[last - start:record_start - start]
+        self._indexed = record_start
+
+    def __len__(self):
+        self.refresh()
+        return len(self._offsets)
+
+    def records(self, numbers: Iterable[int]) -> Dict[int, Dict]:
+        """Rows by data-row number as dicts, one seek each (numbers past the end are skipped)."""
+        self.refresh()
+        out: Dict[int, Dict] = {}
+        with self._lock:
+            total = len(self._offsets)
+            wanted = [n for n in sorted(set(numbers)) if 0 <= n < total]
+            if not wanted:
+                return out
+            with open(self.path, "rb") as fh:
+                for n in wanted:
+                    first = self._offsets[n]
+                    last = self._offsets[n + 1] if n + 1 < total else self._indexed
+                    fh.seek(first)
+                    values = next(csv.reader(io.StringIO(fh.read(last - first).decode("utf-8"))), [])
+                    out[n] = dict(zip(self.columns, values))
+        return out
+
+    def rows(self, start: int, stop: int) -> pd.DataFrame:
+        """DataFrame of data rows [start, stop), read by seeking to the first one."""
+        self.refresh()
+        with self._lock:
+            start, stop = max(0, start), min(stop, len(self._offsets))
+            if start >= stop:
+                return _frame([], self.columns, start)
+            first = self._offsets[start]
+            last = self._offsets[stop] if stop < len(self._offsets) else self._indexed
+            with open(self.path, "rb") as fh:
+                fh.seek(first)
+                chunk = fh.read(last - first).decode("utf-8")
+            columns = self.columns
+        records = list(csv.reader(io.StringIO(chunk)))
+        return _frame(records, columns, start)
+
+class StorePreview:
+    """Preview over any CandidateStore exposing count()/slice() (e.g. SQLite)."""
+
+    def __init__(self, store: CandidateStore):
+        self.store = store
+
+    def refresh(self):
+        pass
+
+    def __len__(self):
+        return self.store.count()
+
+    def rows(self, start: int, stop: int) -> pd.DataFrame:
+        start = max(0, start)
+        records = self.store.slice(start, stop)
+        return _frame(records, ROW_COLUMNS, start)
+
+def make_preview(store: CandidateStore):
+    return CsvPreview(store.path) if store.kind == "csv" else StorePreview(store)
+
+def page_count(preview, page_size: int = PAGE_SIZE) -> int:
+    return max(1, -(-len(preview) // page_size))
+
+def page(preview, number: int, page_size: int = PAGE_SIZE) -> pd.DataFrame:
+    """1-based page of rows."""
+    start = (max(1, number) - 1) * page_size
+    return preview.rows(start, start + page_size)
+
+def tail(preview, n: int = PAGE_SIZE) -> pd.DataFrame:
+    total = len(preview)
+    return preview.rows(max(0, total - n), total)
@@ -21,6 +21,18 @@ Behavior & Safety:
 - If the user uses a conversation-ending keyword (any supported language), wrap up politely with thanks and next steps.
 """
 
+# ---------------------------- Languages ----------------------------
+# Language code → nice name (ISO 639-1 for langdetect)
+LANG_NAMES = {
+    # English + major Indian languages
+    "en": "English", "hi": "Hindi", "bn": "Bengali", "ta": "Tamil", "te": "Telugu",
+    "ml": "Malayalam", "kn": "Kannada", "mr": "Marathi", "pa": "Punjabi",
+    "gu": "Gujarati", "or": "Odia", "as": "Assamese", "ur": "Urdu",
+    # A few common world languages
+    "es": "Spanish", "fr": "French", "de": "German", "pt": "Portuguese",
+    "it": "Italian", "ru": "Russian", "ja": "Japanese", "zh-cn": "Chinese (Simplified)"
+}
+
 # ---------------------------- Exit Keywords ----------------------------
 # Matched against user_input.strip().lower()
 # Includes English and several Indian language equivalents (short, exact tokens).
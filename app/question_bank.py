@@ -0,0 +1,225 @@
+# app/question_bank.py
+"""
+Per-technology question bank.
+
+Tech names are normalized (case, aliases such as "k8s" -> Kubernetes, trailing
+versions such as "Python 3.11") and questions are cached per technology with a
+TTL and LRU eviction, so the LLM is only asked about technologies the bank has
+not seen. The bank is process-wide and persisted under data/.
+"""
+from __future__ import annotations
+import asyncio, json, os, re, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from helpers import (
+    DATA_DIR, agenerate_tech_questions, astream_tech_questions, fallback_questions, generate_tech_questions_concurrent,
+)
+from metrics import cache_event
+
+BANK_PATH = Path(os.getenv("TALENTSCOUT_QUESTION_BANK", DATA_DIR / "question_bank.json"))
+BANK_TTL_SECONDS = float(os.getenv("TALENTSCOUT_QUESTION_TTL", 7 * 24 * 3600))
+BANK_MAX_ENTRIES = int(os.getenv("TALENTSCOUT_QUESTION_BANK_SIZE", 2000))
+
+# ------------- Normalization -------------
+# alias (lowercase) -> canonical key
+TECH_ALIASES = {
+    "k8s": "kubernetes", "kube": "kubernetes",
+    "js": "javascript", "ecmascript": "javascript", "es6": "javascript",
+    "ts": "typescript",
+    "py": "python", "python3": "python", "python2": "python",
+    "golang": "go",
+    "postgres": "postgresql", "psql": "postgresql", "pg": "postgresql",
+    "mongo": "mongodb",
+    "node": "node.js", "nodejs": "node.js", "node js": "node.js",
+    "reactjs": "react", "react.js": "react", "react js": "react",
+    "vuejs": "vue", "vue.js": "vue",
+    "angularjs": "angular",
+    "nextjs": "next.js", "next js": "next.js",
+    "c sharp": "c#", "csharp": "c#",
+    "cpp": "c++", "cplusplus": "c++",
+    "amazon web services": "aws",
+    "google cloud": "gcp", "google cloud platform": "gcp",
+    "ms sql": "sql server", "mssql": "sql server",
+    "tf": "terraform",
+    "sklearn": "scikit-learn", "scikit learn": "scikit-learn",
+    "dotnet": ".net", "asp.net core": "asp.net",
+}
+
+# canonical key -> display name (anything not listed keeps the user's spelling)
+TECH_DISPLAY = {
+    "kubernetes": "Kubernetes", "javascript": "JavaScript", "typescript": "TypeScript",
+    "python": "Python", "go": "Go", "postgresql": "PostgreSQL", "mongodb": "MongoDB",
+    "node.js": "Node.js", "react": "React", "vue": "Vue", "angular": "Angular",
+    "next.js": "Next.js", "c#": "C#", "c++": "C++", "aws": "AWS", "gcp": "GCP",
+    "sql server": "SQL Server", "terraform": "Terraform", "scikit-learn": "scikit-learn",
+    ".net": ".NET", "asp.net": "ASP.NET", "docker": "Docker", "django": "Django",
+    "java": "Java", "mysql": "MySQL", "redis": "Redis", "kafka": "Kafka",
+}
+
+VERSION_SUFFIX_RE = re.compile(r"(?:\s+|(?<=[a-z])[-@])v?\d+(?:\.\d+|\.x)*\+?$", re.IGNORECASE)
+
+def normalize_tech(name: str) -> Tuple[str, str]:
+    """Return (canonical key, display name) for a user-entered technology."""
+    raw = " ".join((name or "").split())
+    base = VERSION_SUFFIX_RE.sub("", raw) or raw
+    key = base.lower()
+    key = TECH_ALIASES.get(key, key)
+    return key, TECH_DISPLAY.get(key, base)
+
+# ------------- Bank -------------
+class QuestionBank:
+    """LRU + TTL map of canonical tech key -> questions, persisted as JSON."""
+
+    def __init__(self, path: Optional[Path] = None, ttl: float = BANK_TTL_SECONDS, max_entries: int = BANK_MAX_ENTRIES):
+        self.path = Path(path or BANK_PATH)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (questions, stored_at); ordered oldest-used first
+        self._data: "OrderedDict[str, Tuple[List[str], float]]" = OrderedDict()
+        self._load()
+
+    def _load(self):
+        try:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, item in (entries.items() if isinstance(entries, dict) else []):
+            try:
+                qs, ts = [str(q) for q in item["questions"]], float(item["stored_at"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if now - ts < self.ttl:
+                self._data[key] = (qs, ts)
+        self._evict_locked()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if time.time() - item[1] >= self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return list(item[0])
+
+    def put_many(self, items: Dict[str, List[str]], persist: bool = True):
+        now = time.time()
+        with self._lock:
+            for key, qs in items.items():
+                self._data[key] = (list(qs), now)
+                self._data.move_to_end(key)
+            self._evict_locked()
+            if persist:
+                self._save_locked()
+
+    def _evict_locked(self):
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def _save_locked(self):
+        payload = {k: {"questions": qs, "stored_at": ts} for k, (qs, ts) in self._data.items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self._data)
+
+_bank: Optional[QuestionBank] = None
+_bank_lock = threading.Lock()
+
+def get_bank() -> QuestionBank:
+    """Process-wide bank (shared by every Streamlit session)."""
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank()
+    return _bank
+
+def _wanted(techs: List[str]) -> "OrderedDict[str, str]":
+    """Canonical key -> display name, deduplicated, in stack order."""
+    wanted: "OrderedDict[str, str]" = OrderedDict()
+    for t in techs:
+        key, display = normalize_tech(t)
+        if key and key not in wanted:
+            wanted[key] = display
+    return wanted
+
+def display_names(techs: List[str]) -> List[str]:
+    """The technology names questions are keyed by, in stack order."""
+    return list(_wanted(techs).values())
+
+def _plan(techs: List[str], bank: QuestionBank) -> Tuple["OrderedDict[str, str]", Dict[str, List[str]]]:
+    """(canonical key -> display name in stack order, cached questions by key)."""
+    wanted = _wanted(techs)
+    found: Dict[str, List[str]] = {}
+    for key in wanted:
+        qs = bank.get(key)
+        cache_event("question_bank", hit=qs is not None)
+        if qs is not None:
+            found[key] = qs
+    return wanted, found
+
+def _absorb(wanted, found, generated: Dict[str, List[str]], bank: QuestionBank) -> Dict[str, List[str]]:
+    fresh = {}
+    for name, qs in generated.items():
+        key = normalize_tech(name)[0]
+        # Skip the canned questions used for failed/timed-out technologies.
+        if key in wanted and key not in found and qs and qs != fallback_questions(name):
+            fresh[key] = qs
+    if fresh:
+        bank.put_many(fresh)
+        found.update(fresh)
+    return {wanted[k]: found.get(k) or fallback_questions(wanted[k]) for k in wanted}
+
+def questions_for_stack(techs: List[str], bank: Optional[QuestionBank] = None, limiter=None) -> Dict[str, List[str]]:
+    """
+    Assemble {display name: questions} for a tech stack from the bank, asking
+    the LLM only for technologies that are not cached (one concurrent request
+    per technology, see agenerate_tech_questions; `limiter.acquire()` runs
+    before each). Technologies the model skips get the canned fallback
+    questions (which are not cached).
+    """
+    bank = bank if bank is not None else get_bank()
+    wanted, found = _plan(techs, bank)
+    misses = [wanted[k] for k in wanted if k not in found]
+    generated = generate_tech_questions_concurrent(misses, limiter=limiter) if misses else {}
+    return _absorb(wanted, found, generated, bank)
+
+async def aquestions_for_stack(techs: List[str], bank: Optional[QuestionBank] = None) -> Dict[str, List[str]]:
+    """Async questions_for_stack()."""
+    bank = bank if bank is not None else get_bank()
+    wanted, found = _plan(techs, bank)
+    misses = [wanted[k] for k in wanted if k not in found]
+    generated = await agenerate_tech_questions(misses) if misses else {}
+    return await asyncio.to_thread(_absorb, wanted, found, generated, bank)  # put_many writes the JSON file
+
+async def astream_questions_for_stack(techs: List[str], bank: Optional[QuestionBank] = None) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Streaming aquestions_for_stack(): yields (display name, question) pairs,
+    cached technologies first (all at once), then generated ones as each
+    question completes in the model's stream. Complete generated sets (3+
+    questions) are added to the bank once the streams end; technologies the
+    model skipped get the canned fallback questions.
+    """
+    bank = bank if bank is not None else get_bank()
+    wanted, found = _plan(techs, bank)
+    for key, qs in found.items():
+        for q in qs:
+            yield wanted[key], q
+    misses = [wanted[k] for k in wanted if k not in found]
+    if not misses:
+        return
+    generated: Dict[str, List[str]] = {}
+    async for tech, q in astream_tech_questions(misses):
+        generated.setdefault(tech, []).append(q)
+        yield tech, q
+    complete = {t: qs for t, qs in generated.items() if len(qs) >= 3}
+    await asyncio.to_thread(_absorb, wanted, found, complete, bank)
@@ -0,0 +1,122 @@
+# app/resources.py
+"""
+Process-wide registry of the heavy components (created once, on first use).
+
+Streamlit re-executes app.py on every interaction, so anything built at the
+top of the script (a SentimentIntensityAnalyzer reading its lexicon, ...) is
+rebuilt on every rerun, and module-level imports of pandas / the Groq SDK /
+langdetect profiles all land on the first page load. Each resource here is
+imported and built lazily by its factory exactly once per process; warm_up()
+builds them all ahead of traffic and is what the readiness probe calls:
+
+    GET /ready   (metrics port, TALENTSCOUT_METRICS_PORT; or server.py's port)
+    -> 200 {"ready": true, "resources": {"sentiment": {"seconds": 0.012}, ...}}
+    -> 503 while warming up or if a resource failed to load
+
+    python bench/bench_startup.py   # cold start + per-rerun cost
+"""
+from __future__ import annotations
+import logging, os, threading, time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+log = logging.getLogger("talentscout.resources")
+
+class ResourceRegistry:
+    """Named lazy singletons; get() builds on first use, warm_up() builds everything."""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._values: Dict[str, Any] = {}
+        self._seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        with self._locks[name]:
+            if name not in self._values:
+                t0 = time.perf_counter()
+                try:
+                    self._values[name] = self._factories[name]()
+                except Exception as e:
+                    self._errors[name] = f"{type(e).__name__}: {e}"
+                    raise
+                self._errors.pop(name, None)
+                self._seconds[name] = time.perf_counter() - t0
+        return self._values[name]
+
+    def loaded(self, name: str) -> bool:
+        return name in self._values
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Tuple[bool, Dict[str, Dict]]:
+        """Build every (or the named) resource; returns (ready, status) and never raises."""
+        for name in names or list(self._factories):
+            try:
+                self.get(name)
+            except Exception as e:
+                log.warning("resource %s failed to load: %s", name, e)
+        return self.ready(), self.status()
+
+    def ready(self) -> bool:
+        return all(name in self._values for name in self._factories)
+
+    def status(self) -> Dict[str, Dict]:
+        out = {}
+        for name in self._factories:
+            if name in self._values:
+                out[name] = {"seconds": round(self._seconds[name], 4)}
+            elif name in self._errors:
+                out[name] = {"error": self._errors[name]}
+            else:
+                out[name] = {"loaded": False}
+        return out
+
+# ------------- Factories (imports stay inside: nothing heavy loads at import time) -------------
+def _sentiment():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+def _language_profiles():
+    from langid import preload
+    preload()
+    return True
+
+def _llm_clients():
+    from llm_client import get_manager
+    manager = get_manager()
+    manager.client()
+
+    async def build_async_client():
+        manager.async_client()
+
+    manager.run(build_async_client(), timeout=30)
+    return manager
+
+def _dataframes():
+    import pandas
+    return pandas
+
+RESOURCES = ResourceRegistry()
+RESOURCES.register("llm_clients", _llm_clients)
+RESOURCES.register("language_profiles", _language_profiles)
+RESOURCES.register("sentiment", _sentiment)
+RESOURCES.register("dataframes", _dataframes)
+
+def sentiment_analyzer():
+    return RESOURCES.get("sentiment")
+
+def warm_up() -> Tuple[bool, Dict[str, Dict]]:
+    return RESOURCES.warm_up()
+
+def warm_up_in_background() -> Optional[threading.Thread]:
+    """Start warm_up() in a daemon thread unless TALENTSCOUT_WARM_ON_START=0."""
+    if os.getenv("TALENTSCOUT_WARM_ON_START", "1") == "0":
+        return None
+    t = threading.Thread(target=warm_up, name="resource-warm-up", daemon=True)
+    t.start()
+    return t
@@ -0,0 +1,79 @@
+# app/routing.py
+"""
+Per-task model routing.
+
+Each kind of LLM call (the `kind` label helpers.chat_completion() already
+records) gets its own model, fallback model, request timeout and completion
+token cap. One-line translations, JSON field extraction, the canned
+acknowledgement and summaries go to the small, fast model; interview
+questions and free chat stay on the large one. If the primary model is rate
+limited (429), overloaded (5xx), unreachable or unknown (404), the call is
+retried once on the fallback model immediately, without the SDK's backoff.
+
+Tunables (env), per task (EXTRACTION, EXTRACTION_DELTA, TRANSLATION,
+ACKNOWLEDGEMENT, QUESTIONS, CHAT, SUMMARY):
+    TALENTSCOUT_MODEL_<TASK>        primary model
+    TALENTSCOUT_FALLBACK_<TASK>     fallback model ("" = no fallback)
+    TALENTSCOUT_TIMEOUT_<TASK>      request timeout, s
+    TALENTSCOUT_MAX_TOKENS_<TASK>   completion token cap
+and globally TALENTSCOUT_SMALL_MODEL / TALENTSCOUT_LARGE_MODEL.
+"""
+from __future__ import annotations
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+LARGE_MODEL = os.getenv("TALENTSCOUT_LARGE_MODEL", "llama-3.3-70b-versatile")
+SMALL_MODEL = os.getenv("TALENTSCOUT_SMALL_MODEL", "llama-3.1-8b-instant")
+
+@dataclass(frozen=True)
+class Route:
+    model: str
+    fallback: Optional[str]
+    timeout: float
+    max_tokens: int
+
+    def apply(self, kwargs: Dict) -> Dict:
+        """Request kwargs with this route's model, timeout and token cap filled in."""
+        out = dict(kwargs)
+        out.setdefault("model", self.model)
+        out.setdefault("timeout", self.timeout)
+        asked = out.get("max_completion_tokens")
+        out["max_completion_tokens"] = min(asked, self.max_tokens) if asked else self.max_tokens
+        return out
+
+    @classmethod
+    def from_env(cls, task: str, default: "Route") -> "Route":
+        key = task.upper()
+        fallback = os.getenv(f"TALENTSCOUT_FALLBACK_{key}", default.fallback or "")
+        return cls(
+            model=os.getenv(f"TALENTSCOUT_MODEL_{key}", default.model),
+            fallback=fallback or None,
+            timeout=float(os.getenv(f"TALENTSCOUT_TIMEOUT_{key}", default.timeout)),
+            max_tokens=int(os.getenv(f"TALENTSCOUT_MAX_TOKENS_{key}", default.max_tokens)),
+        )
+
+DEFAULT_ROUTES: Dict[str, Route] = {
+    "extraction": Route(SMALL_MODEL, LARGE_MODEL, timeout=15, max_tokens=400),
+    "extraction_delta": Route(SMALL_MODEL, LARGE_MODEL, timeout=10, max_tokens=200),
+    "translation": Route(SMALL_MODEL, LARGE_MODEL, timeout=10, max_tokens=200),
+    "acknowledgement": Route(SMALL_MODEL, LARGE_MODEL, timeout=15, max_tokens=150),
+    "summary": Route(SMALL_MODEL, LARGE_MODEL, timeout=15, max_tokens=200),
+    "questions": Route(LARGE_MODEL, SMALL_MODEL, timeout=30, max_tokens=2000),
+    "chat": Route(LARGE_MODEL, SMALL_MODEL, timeout=30, max_tokens=800),
+}
+
+ROUTES: Dict[str, Route] = {task: Route.from_env(task, r) for task, r in DEFAULT_ROUTES.items()}
+
+def route(kind: str) -> Route:
+    """Route for a call kind; unknown kinds are treated like free chat."""
+    return ROUTES.get(kind) or ROUTES["chat"]
+
+def should_fall_back(error: BaseException) -> bool:
+    """Rate limits, server errors, timeouts/connection failures and unknown models."""
+    import groq  # already loaded: this only runs after a Groq call failed
+    if isinstance(error, groq.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code in (404, 408, 409, 429, 498, 503) or error.status_code >= 500
+    return False
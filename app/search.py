@@ -0,0 +1,387 @@
+# app/search.py
+"""
+Candidate search over the saved store.
+
+SkillIndex is an in-memory inverted index from normalized terms to candidate
+documents:
+
+    s:<tech>     technologies, normalized like the question bank ("k8s" -> kubernetes)
+    p:<word>     words of the desired positions ("Backend Developer" -> backend, developer)
+    l:<word>     words of the location
+
+Postings are sorted arrays of 4-byte document numbers and years of
+experience sit in a parallel float array, so 500k candidates take a few tens
+of MB and a query touches only the postings of its own terms. The index is
+built from the store on first use, then kept current incrementally: rows
+written through upsert() arrive via store.subscribe(), rows appended to the
+CSV by other processes are read from the tail (rows their merges superseded
+are dropped), and anything else (another process rewrote or deleted rows)
+triggers a rebuild. A merged (updated) candidate gets a fresh document and
+the old one is tombstoned; tombstones are compacted away when they pile up.
+
+Ranking: each requested skill adds its weight when the candidate has it,
+"+skill" makes it mandatory, positions add up to POSITION_WEIGHT by word
+overlap, and location and years-of-experience range are filters. Only the
+top `limit` hits are read back from the store (seek per row for CSV, one
+IN query for SQLite).
+
+    python app/search.py query "python:3, +django, k8s" --position backend --min-years 3
+    python app/search.py query "react, typescript" --location pune --limit 10 --json
+    python app/search.py stats
+"""
+from __future__ import annotations
+import argparse, heapq, json, logging, math, os, threading, time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from identity import normalize_text
+from question_bank import normalize_tech
+from storage import CandidateStore, open_store
+
+log = logging.getLogger("talentscout.search")
+
+POSITION_WEIGHT = float(os.getenv("TALENTSCOUT_SEARCH_POSITION_WEIGHT", "1.0"))
+COMPACT_RATIO = 0.25  # rebuild once this share of documents is tombstoned
+
+def _split(value) -> List[str]:
+    return [v.strip() for v in str(value or "").split(",") if v.strip()]
+
+def _years(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def skill_key(name: str) -> str:
+    return normalize_tech(name)[0]
+
+def word_terms(prefix: str, text: str) -> List[str]:
+    return [prefix + w for w in normalize_text(text).split()]
+
+# ------------- Query -------------
+@dataclass
+class JobQuery:
+    """What a role needs: weighted skills (some mandatory), positions, locations, years range."""
+    skills: Dict[str, float] = field(default_factory=dict)  # skill key -> weight
+    required: Set[str] = field(default_factory=set)
+    positions: List[str] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+    min_years: Optional[float] = None
+    max_years: Optional[float] = None
+    limit: int = 20
+
+    @classmethod
+    def parse(cls, skills: str = "", positions: str = "", locations: str = "",
+              min_years: Optional[float] = None, max_years: Optional[float] = None, limit: int = 20) -> "JobQuery":
+        """Skills as "python:3, +django, k8s": ':w' sets the weight (default 1), '+' makes it mandatory."""
+        q = cls(positions=_split(positions), locations=_split(locations),
+                min_years=min_years, max_years=max_years, limit=limit)
+        for item in _split(skills):
+            must = item.startswith("+")
+            name, _, weight = item.lstrip("+").partition(":")
+            key = skill_key(name)
+            if not key:
+                continue
+            try:
+                q.skills[key] = float(weight) if weight else 1.0
+            except ValueError:
+                q.skills[key] = 1.0
+            if must:
+                q.required.add(key)
+        return q
+
+    @property
+    def max_score(self) -> float:
+        return sum(self.skills.values()) + (POSITION_WEIGHT if self.positions else 0.0)
+
+@dataclass
+class Match:
+    ref: object
+    score: float
+    matched: List[str]
+    row: Dict
+
+# ------------- Index -------------
+class SkillIndex:
+    """Inverted index over one store; search() is safe to call from any thread."""
+
+    def __init__(self, store: CandidateStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self._clear()
+        self._version = None  # store version the index reflects; None = not built
+        self._rows = None     # CSV: row-offset index used to read hits and appended rows
+        if store.kind == "csv":
+            from preview import CsvPreview
+            self._rows = CsvPreview(store.path)
+        store.subscribe(self._on_write)
+
+    def _clear(self):
+        self._postings: Dict[str, array] = {}
+        self._refs = array("q")      # doc -> store ref
+        self._years = array("f")     # doc -> years of experience (NaN = unknown)
+        self._alive = bytearray()    # doc -> 1 while it is the current version of its row
+        self._doc_of: Dict[object, int] = {}  # store ref -> current doc
+        self._next_ref = 0  # CSV: first data row not indexed yet
+        self._dead = 0
+        self._inode = None
+        self._resets = None  # CSV: preview resets already accounted for
+        # Raw spelling -> normalized terms; values repeat across candidates and normalizing is the slow part.
+        self._skill_keys: Dict[str, str] = {}
+        self._word_terms: Dict[str, List[str]] = {}
+
+    def __len__(self):
+        return len(self._doc_of)
+
+    # ------------- Building / updates -------------
+    def _terms(self, row: Dict) -> Set[str]:
+        terms = set()
+        for raw in _split(row.get("tech_stack")):
+            key = self._skill_keys.get(raw)
+            if key is None:
+                key = self._skill_keys[raw] = skill_key(raw)
+            if key:
+                terms.add("s:" + key)
+        for pos in _split(row.get("desired_positions")):
+            terms.update(self._words("p:", pos))
+        terms.update(self._words("l:", row.get("location") or ""))
+        return terms
+
+    def _words(self, prefix: str, text: str) -> List[str]:
+        key = prefix + text
+        words = self._word_terms.get(key)
+        if words is None:
+            words = self._word_terms[key] = word_terms(prefix, text)
+        return words
+
+    def _add(self, ref, row: Dict):
+        old = self._doc_of.get(ref)
+        if old is not None:
+            self._alive[old] = 0
+            self._dead += 1
+        doc = len(self._refs)
+        self._refs.append(ref)
+        self._years.append(_years(row.get("years_experience")))
+        self._alive.append(1)
+        self._doc_of[ref] = doc
+        self._next_ref = max(self._next_ref, ref + 1)
+        for term in self._terms(row):
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = array("I")
+            posting.append(doc)  # docs only grow, so postings stay sorted
+
+    def _remove(self, ref):
+        doc = self._doc_of.pop(ref, None)
+        if doc is not None:
+            self._alive[doc] = 0
+            self._dead += 1
+
+    def _rebuild(self):
+        t0 = time.perf_counter()
+        self._clear()
+        for ref, row in self.store.iter_refs():
+            self._add(ref, row)
+        self._inode = self._stat_inode()
+        if self._rows is not None:
+            self._rows.refresh()
+            self._resets = self._rows.resets
+        log.info("skill index built: %d candidates, %d terms in %.2fs",
+                 len(self._doc_of), len(self._postings), time.perf_counter() - t0)
+
+    def _stat_inode(self):
+        try:
+            return os.stat(self.store.path).st_ino if self._rows is not None else None
+        except FileNotFoundError:
+            return None
+
+    def _catch_up_csv(self) -> bool:
+        """Index rows appended (or drop rows truncated) by other writers; False if a rebuild is needed."""
+        if self._rows is None or self._inode is None or self._stat_inode() != self._inode:
+            return False
+        total, known = len(self._rows), self._next_ref
+        if self._rows.resets != self._resets:
+            return False  # rows were rewritten in place: indexed row numbers may point elsewhere now
+        dead = self.store.superseded()
+        if total < known and dead:
+            return False  # a deleted merge brings back the row it superseded
+        for ref in range(total, known):  # "delete last row" truncations
+            self._remove(ref)
+        self._next_ref = min(known, total)
+        for ref, row in sorted(self._rows.records(range(known, total)).items()):
+            if ref not in dead:
+                self._add(ref, row)
+        for ref in dead:  # rows other writers' merges replaced
+            if ref in self._doc_of:
+                self._remove(ref)
+        return True
+
+    def _sync(self):
+        version = self.store.version()
+        if version != self._version:
+            if self._version is None or not self._catch_up_csv():
+                self._rebuild()
+        elif self._dead > COMPACT_RATIO * len(self._refs):
+            self._rebuild()  # compact tombstones left by merges
+        self._version = version
+
+    def refresh(self):
+        """Build or catch up now (e.g. at startup) instead of on the first search."""
+        with self._lock:
+            self._sync()
+
+    def _on_write(self, written: List[Tuple[object, Optional[Dict]]], before, after):
+        with self._lock:
+            if self._version is None:
+                return  # not built yet; the first search reads the store
+            for ref, row in written:
+                if row is None:
+                    self._remove(ref)
+                else:
+                    self._add(ref, row)
+            if self._version == before:
+                self._version = after
+                if self._rows is not None:
+                    # Our own write: whatever the row index makes of it (a merge replaces the file) is accounted for.
+                    self._inode = self._stat_inode()
+                    self._rows.refresh()
+                    self._resets = self._rows.resets
+            # else: someone else wrote in between; the next search syncs from the store.
+
+    # ------------- Queries -------------
+    def _docs(self, term: str) -> array:
+        return self._postings.get(term) or array("I")
+
+    def _has(self, np, term: str):
+        """Boolean mask over documents: which ones contain `term`."""
+        mask = np.zeros(len(self._refs), dtype=bool)
+        posting = self._docs(term)
+        if len(posting):
+            mask[np.frombuffer(posting, dtype=np.uint32)] = True
+        return mask
+
+    def search(self, q: JobQuery) -> List[Match]:
+        with self._lock:
+            self._sync()
+            hits = self._rank(q)
+            refs = [self._refs[doc] for doc, _ in hits]
+            matched = [[k for k in q.skills if _contains(self._docs("s:" + k), doc)] for doc, _ in hits]
+        rows = self._rows.records(refs) if self._rows is not None else self.store.fetch(refs)
+        return [Match(ref, score, m, rows[ref]) for ref, (doc, score), m in zip(refs, hits, matched) if ref in rows]
+
+    def _rank(self, q: JobQuery) -> List[Tuple[int, float]]:
+        """(doc, score) of the best `q.limit` live documents, ties going to the newest."""
+        n = len(self._refs)
+        if not n or q.limit <= 0:
+            return []
+        # Filters and scores are whole-index vectors; each term costs one pass over its posting.
+        keep = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        for key in q.required:
+            keep &= self._has(np, "s:" + key)
+        if q.locations:
+            near = np.zeros(n, dtype=bool)
+            for phrase in q.locations:
+                words = word_terms("l:", phrase)
+                if words:
+                    near |= np.logical_and.reduce([self._has(np, w) for w in words])
+            keep &= near
+        if q.min_years is not None or q.max_years is not None:
+            years = np.frombuffer(self._years, dtype=np.float32)
+            with np.errstate(invalid="ignore"):  # NaN = unknown experience: fails any range
+                if q.min_years is not None:
+                    keep &= years >= q.min_years
+                if q.max_years is not None:
+                    keep &= years <= q.max_years
+
+        scores = np.zeros(n, dtype=np.float64)
+        weighted = [("s:" + key, w) for key, w in q.skills.items()]
+        words = {t for phrase in q.positions for t in word_terms("p:", phrase)}
+        weighted += [(t, POSITION_WEIGHT / len(words)) for t in words]
+        for term, weight in weighted:
+            posting = self._docs(term)
+            if len(posting):
+                scores[np.frombuffer(posting, dtype=np.uint32)] += weight
+        if weighted:
+            keep &= scores > 0
+        # With no skills/positions asked, this ranks the filtered candidates newest first.
+
+        docs = np.flatnonzero(keep)
+        if len(docs) > q.limit:
+            # Cut to the top `limit` scores, keeping everything tied with the last one.
+            cutoff = np.partition(scores[docs], len(docs) - q.limit)[len(docs) - q.limit]
+            docs = docs[scores[docs] >= cutoff]
+        order = np.lexsort((-docs, -scores[docs]))[:q.limit]
+        return [(int(d), float(scores[d])) for d in docs[order]]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._sync()
+            counts: Dict[str, int] = {}
+            for term in self._postings:
+                counts[term[0]] = counts.get(term[0], 0) + 1
+            top = heapq.nlargest(10, ((len(p), t[2:]) for t, p in self._postings.items() if t.startswith("s:")))
+            return {
+                "candidates": len(self._doc_of), "documents": len(self._refs), "tombstoned": self._dead,
+                "skills": counts.get("s", 0), "position_words": counts.get("p", 0), "location_words": counts.get("l", 0),
+                "top_skills": [{"skill": k, "candidates": n} for n, k in top],
+            }
+
+def _contains(posting: array, doc: int) -> bool:
+    i = bisect_left(posting, doc)
+    return i < len(posting) and posting[i] == doc
+
+def result_rows(matches: Iterable[Match], q: JobQuery) -> List[Dict]:
+    """Flat rows for tables / JSON output."""
+    top = q.max_score or 1.0
+    return [
+        {
+            "match_%": round(100 * m.score / top), "matched": ", ".join(m.matched),
+            "full_name": m.row.get("full_name", ""), "years_experience": m.row.get("years_experience", ""),
+            "desired_positions": m.row.get("desired_positions", ""), "location": m.row.get("location", ""),
+            "tech_stack": m.row.get("tech_stack", ""), "ref": m.ref,
+        }
+        for m in matches
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search saved candidates by skills, position, location and experience")
+    parser.add_argument("--store", choices=["csv", "sqlite"], help="backend (default: $TALENTSCOUT_STORE or csv)")
+    parser.add_argument("--path", type=Path, help="store file (default: data/candidates.csv|.db)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    qp = sub.add_parser("query", help="rank candidates against a job requirement")
+    qp.add_argument("skills", nargs="?", default="", help='e.g. "python:3, +django, k8s" (+ = mandatory, :w = weight)')
+    qp.add_argument("--position", default="", help="comma-separated desired positions")
+    qp.add_argument("--location", default="", help="comma-separated locations (any of them)")
+    qp.add_argument("--min-years", type=float)
+    qp.add_argument("--max-years", type=float)
+    qp.add_argument("--limit", type=int, default=20)
+    qp.add_argument("--json", action="store_true", help="print JSON lines instead of a table")
+    sub.add_parser("stats", help="index size and most common skills")
+    args = parser.parse_args(argv)
+
+    index = SkillIndex(open_store(args.store, args.path))
+    if args.cmd == "stats":
+        print(json.dumps(index.stats(), indent=2, ensure_ascii=False))
+        return
+    q = JobQuery.parse(args.skills, args.position, args.location, args.min_years, args.max_years, args.limit)
+    t0 = time.perf_counter()
+    index.refresh()  # build outside the timed query
+    t1 = time.perf_counter()
+    rows = result_rows(index.search(q), q)
+    t2 = time.perf_counter()
+    if args.json:
+        for r in rows:
+            print(json.dumps(r, ensure_ascii=False))
+        return
+    for r in rows:
+        print(f"{r['match_%']:>3}%  {r['full_name'][:28]:<28} {str(r['years_experience'])[:5]:>5}y  "
+              f"{r['location'][:20]:<20} {r['tech_stack'][:60]}")
+    print(f"{len(rows)} of {len(index)} candidates (index {t1 - t0:.2f}s, query {1000 * (t2 - t1):.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# app/server.py
+"""
+Lightweight HTTP API over the screening engine (no Streamlit).
+
+All sessions share one asyncio event loop: a turn waiting on Groq holds no
+thread, so a single process serves hundreds of concurrent candidates.
+
+    POST   /sessions                    -> {"id": ..., "messages": [...]}   body: {"lang": "hi", "save": true}
+    GET    /sessions                    -> resident/spilled counts, memory per resident session
+    GET    /sessions/{id}               -> current state
+    POST   /sessions/{id}/messages      -> NDJSON stream of engine events   body: {"text": "..."}
+    POST   /sessions/{id}/finish        -> farewell (+ save if enabled; written within TALENTSCOUT_FLUSH_INTERVAL)
+    DELETE /sessions/{id}
+    GET    /ready                       -> 200 once warm-up is done (readiness probe)
+
+    python app/server.py --port 8600
+"""
+from __future__ import annotations
+import argparse, asyncio, json, logging
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from background import WriteBehind
+from engine import ScreeningSession
+from archive import ARCHIVE_ENABLED, archive_writes
+from resources import warm_up
+from session_store import SessionStore
+from storage import candidate_row, open_store
+
+log = logging.getLogger("talentscout.server")
+
+MAX_BODY = 64 * 1024
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+class SessionRegistry:
+    """Sessions (idle ones spilled to disk by the SessionStore); turns hold ScreeningSession.lock so they never interleave."""
+
+    def __init__(self, store=None, idle_ttl: float = 3600.0, sessions: Optional[SessionStore] = None):
+        self.sessions = sessions if sessions is not None else SessionStore()
+        self.save_on_end: Dict[str, bool] = {}
+        self.store = store
+        # Saves from all sessions are batched into periodic upserts off the event loop.
+        self.writer = WriteBehind(store) if store is not None else None
+        self.idle_ttl = idle_ttl
+
+    def create(self, lang: str = "en", save: bool = False) -> ScreeningSession:
+        s = self.sessions.create()
+        if lang != "en":
+            s.set_language(lang)
+        self.save_on_end[s.id] = save
+        return s
+
+    def get(self, sid: str) -> Optional[ScreeningSession]:
+        return self.sessions.get(sid)  # rehydrated from disk if it had been spilled
+
+    def drop(self, sid: str) -> bool:
+        self.save_on_end.pop(sid, None)
+        return self.sessions.drop(sid)
+
+    def expire_idle(self):
+        for sid in self.sessions.expire(self.idle_ttl):
+            self.save_on_end.pop(sid, None)
+
+    def save(self, s: ScreeningSession):
+        """Queue the candidate for the next batched write (never blocks the loop)."""
+        if not (self.writer is not None and self.save_on_end.get(s.id) and s.candidate.full_name):
+            return
+        self.writer.add(candidate_row(s.candidate, hashed=True))
+
+def session_state(s: ScreeningSession) -> Dict:
+    return {
+        "id": s.id, "lang": s.lang, "ended": s.ended,
+        "candidate": s.candidate.as_dict(), "tech_questions": s.tech_questions,
+        "messages": [m for m in s.messages if m["role"] != "system"],
+    }
+
+# ------------- HTTP plumbing -------------
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise ValueError("malformed request line")
+    headers: Dict[str, str] = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY:
+        raise OverflowError
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), urlsplit(target).path, headers, body
+
+def _head(status: int, ctype: str, extra: str = "") -> bytes:
+    return (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: {ctype}\r\n"
+            f"Connection: close\r\n{extra}\r\n").encode("latin-1")
+
+async def send_json(writer: asyncio.StreamWriter, status: int, payload) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    writer.write(_head(status, "application/json; charset=utf-8", f"Content-Length: {len(body)}\r\n") + body)
+    await writer.drain()
+
+async def stream_events(writer: asyncio.StreamWriter, events) -> None:
+    """Chunked NDJSON: one engine Event per line, flushed as soon as it exists."""
+    writer.write(_head(200, "application/x-ndjson; charset=utf-8", "Transfer-Encoding: chunked\r\n"))
+    async for ev in events:
+        line = (json.dumps(ev.as_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+        writer.write(f"{len(line):x}\r\n".encode("latin-1") + line + b"\r\n")
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+# ------------- Routes -------------
+class App:
+    def __init__(self, registry: SessionRegistry):
+        self.registry = registry
+
+    async def __call__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                req = await read_request(reader)
+            except OverflowError:
+                return await send_json(writer, 413, {"error": "body too large"})
+            except (ValueError, asyncio.IncompleteReadError):
+                return await send_json(writer, 400, {"error": "malformed request"})
+            if req is None:
+                return
+            await self.route(writer, *req)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception:
+            log.exception("request failed")
+            try:
+                await send_json(writer, 500, {"error": "internal error"})
+            except Exception:
+                pass
+        finally:
+            writer.close()
+
+    async def route(self, writer, method: str, path: str, headers: Dict[str, str], body: bytes):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            return await send_json(writer, 400, {"error": "body must be JSON"})
+        parts = [p for p in path.split("/") if p]
+        reg = self.registry
+
+        if parts == ["ready"] and method == "GET":
+            ready, status = await asyncio.to_thread(warm_up)
+            return await send_json(writer, 200 if ready else 503, {"ready": ready, "resources": status})
+
+        if parts == ["sessions"] and method == "GET":
+            return await send_json(writer, 200, reg.sessions.report())
+        if parts == ["sessions"] and method == "POST":
+            reg.expire_idle()
+            s = reg.create(lang=str(data.get("lang") or "en"), save=bool(data.get("save")))
+            return await send_json(writer, 201, session_state(s))
+        if not parts or parts[0] != "sessions" or len(parts) < 2:
+            return await send_json(writer, 404, {"error": "not found"})
+
+        s = reg.get(parts[1])
+        if s is None:
+            return await send_json(writer, 404, {"error": "unknown session"})
+        action = parts[2] if len(parts) > 2 else None
+
+        if action is None and method == "GET":
+            return await send_json(writer, 200, session_state(s))
+        if action is None and method == "DELETE":
+            reg.drop(s.id)
+            return await send_json(writer, 200, {"deleted": s.id})
+        if action == "messages" and method == "POST":
+            text = str(data.get("text") or "").strip()
+            if not text:
+                return await send_json(writer, 400, {"error": "text is required"})
+            if s.ended:
+                return await send_json(writer, 409, {"error": "conversation has ended"})
+            async with s.lock:
+                return await stream_events(writer, self._turn(s, text))
+        if action == "finish" and method == "POST":
+            async with s.lock:
+                farewell = s.finish()
+                reg.save(s)
+            return await send_json(writer, 200, {"message": farewell, "ended": True})
+        return await send_json(writer, 405, {"error": "method not allowed"})
+
+    async def _turn(self, s: ScreeningSession, text: str):
+        async for ev in s.handle(text):
+            yield ev
+            if ev.type == "ended":
+                self.registry.save(s)
+
+async def serve(host: str, port: int, registry: Optional[SessionRegistry] = None):
+    if registry is None:
+        store = open_store()
+        if ARCHIVE_ENABLED:
+            archive_writes(store)
+        registry = SessionRegistry(store=store)
+    app = App(registry)
+    server = await asyncio.start_server(app, host, port, limit=MAX_BODY)
+    log.info("TalentScout API listening on http://%s:%d", host, port)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TalentScout screening API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    ready, status = warm_up()  # pooled clients, language profiles, ... before the first request
+    log.info("warm-up %s: %s", "done" if ready else "incomplete", status)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# app/session_store.py
+"""
+Session store: active screening sessions in memory, idle ones on disk.
+
+A ScreeningSession used to live in memory for as long as its browser tab (or
+API client) did, so memory grew with every candidate ever seen. SessionStore
+keeps only sessions used in the last SESSION_IDLE seconds in memory; a
+maintenance tick on the background executor spills older ones, as compressed
+JSON (ScreeningSession.to_state()), to a SQLite file, and get() rehydrates a
+spilled session transparently on its next interaction. Spilled sessions
+unused for SESSION_TTL seconds are deleted.
+
+Sessions themselves are compact: the transcript is a packed Transcript
+(context.py) rather than a list of dicts, and Candidate is slotted.
+report() gives the approximate memory held per resident session (also
+exported as talentscout_session_bytes), and the debug panel shows it.
+
+Tunables (env):
+    TALENTSCOUT_SESSION_DB            spill file (default data/sessions.db)
+    TALENTSCOUT_SESSION_IDLE          seconds unused before a session is spilled (default 900)
+    TALENTSCOUT_SESSION_TTL           seconds before a spilled session is deleted (default 604800, 7 days)
+    TALENTSCOUT_SESSION_SPILL_EVERY   seconds between maintenance ticks (default 60)
+
+    python app/session_store.py stats    # spilled sessions on disk
+"""
+from __future__ import annotations
+import argparse, json, logging, os, sqlite3, sys, threading, time, zlib
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from helpers import DATA_DIR
+from engine import ScreeningSession
+from metrics import REGISTRY
+from background import BackgroundExecutor, get_executor
+
+log = logging.getLogger("talentscout.sessions")
+
+SESSION_DB = Path(os.getenv("TALENTSCOUT_SESSION_DB", str(DATA_DIR / "sessions.db")))
+SESSION_IDLE = float(os.getenv("TALENTSCOUT_SESSION_IDLE", "900"))
+SESSION_TTL = float(os.getenv("TALENTSCOUT_SESSION_TTL", str(7 * 24 * 3600)))
+SPILL_EVERY = float(os.getenv("TALENTSCOUT_SESSION_SPILL_EVERY", "60"))
+
+# ------------- Memory accounting -------------
+def _deep_size(obj, seen: set) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__") and not isinstance(obj, (str, bytes, bytearray)):
+        size += sum(_deep_size(getattr(obj, a), seen) for a in obj.__slots__ if hasattr(obj, a))
+    return size
+
+def session_bytes(s: ScreeningSession) -> int:
+    """Approximate bytes held by one session (transcript, candidate, questions, summary, memo, trace)."""
+    seen: set = set()
+    return (sys.getsizeof(s) + sys.getsizeof(s.__dict__) + s.messages.nbytes()
+            + _deep_size(s.candidate, seen) + _deep_size(s.tech_questions, seen)
+            + _deep_size(s.context.summary, seen) + _deep_size(s._langid._seen, seen)
+            + _deep_size(s.last_trace, seen))
+
+# ------------- Store -------------
+class SessionStore:
+    """id -> ScreeningSession; idle sessions spill to SQLite and come back on get()."""
+
+    def __init__(self, path: Path = SESSION_DB, idle: float = SESSION_IDLE, ttl: float = SESSION_TTL,
+                 executor: Optional[BackgroundExecutor] = None, spill_every: float = SPILL_EVERY):
+        self.path = Path(path)
+        self.idle = idle
+        self.ttl = ttl
+        self._active: Dict[str, ScreeningSession] = {}
+        self._lock = threading.RLock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, last_active REAL NOT NULL, state BLOB NOT NULL)"
+            )
+        executor = executor or get_executor()
+        executor.every("sessions", spill_every, self.maintain)
+        executor.on_shutdown(self.close)
+
+    def __len__(self):
+        return len(self._active)
+
+    def create(self, session_id: Optional[str] = None, **kwargs) -> ScreeningSession:
+        s = ScreeningSession(session_id=session_id, **kwargs)
+        with self._lock:
+            self._active[s.id] = s
+        return s
+
+    def get(self, sid: str) -> Optional[ScreeningSession]:
+        """The session (rehydrated if it was spilled), marked as used; None if unknown or expired."""
+        with self._lock:
+            s = self._active.get(sid)
+            if s is None:
+                s = self._load(sid)
+                if s is None:
+                    return None
+                self._active[sid] = s
+            s.last_active = time.time()
+            return s
+
+    def get_or_create(self, sid: str, **kwargs) -> ScreeningSession:
+        return self.get(sid) or self.create(sid, **kwargs)
+
+    def drop(self, sid: str) -> bool:
+        with self._lock:
+            found = self._active.pop(sid, None) is not None
+            with self._conn:
+                found = self._conn.execute("DELETE FROM sessions WHERE id = ?", (sid,)).rowcount > 0 or found
+        return found
+
+    def _load(self, sid: str) -> Optional[ScreeningSession]:
+        t0 = time.perf_counter()
+        row = self._conn.execute("SELECT state FROM sessions WHERE id = ?", (sid,)).fetchone()
+        if row is None:
+            return None
+        with self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (sid,))
+        s = ScreeningSession.from_state(json.loads(zlib.decompress(row[0])))
+        REGISTRY.inc("talentscout_sessions_rehydrated_total")
+        REGISTRY.observe("talentscout_session_rehydrate_seconds", time.perf_counter() - t0)
+        return s
+
+    # ------------- Maintenance (background ticks) -------------
+    def spill_idle(self, idle: Optional[float] = None) -> int:
+        """Move sessions unused for `idle` seconds (default self.idle) to disk; returns how many."""
+        cutoff = time.time() - (self.idle if idle is None else idle)
+        with self._lock:
+            # A session in the middle of a turn stays put whatever its timestamp says.
+            idle_ids = [sid for sid, s in self._active.items() if s.last_active <= cutoff and not s.lock.locked()]
+            rows = []
+            for sid in idle_ids:
+                s = self._active.pop(sid)
+                state = json.dumps(s.to_state(), ensure_ascii=False, separators=(",", ":"))
+                rows.append((sid, s.last_active, zlib.compress(state.encode("utf-8"))))
+            if rows:
+                with self._conn:
+                    self._conn.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)", rows)
+        if rows:
+            REGISTRY.inc("talentscout_sessions_spilled_total", len(rows))
+            log.info("spilled %d idle sessions to %s", len(rows), self.path)
+        return len(rows)
+
+    def expire(self, ttl: Optional[float] = None) -> List[str]:
+        """Delete sessions (in memory or on disk) unused for `ttl` seconds; returns their ids."""
+        cutoff = time.time() - (self.ttl if ttl is None else ttl)
+        with self._lock:
+            gone = [sid for sid, s in self._active.items() if s.last_active <= cutoff]
+            for sid in gone:
+                del self._active[sid]
+            gone += [r[0] for r in self._conn.execute("SELECT id FROM sessions WHERE last_active <= ?", (cutoff,))]
+            with self._conn:
+                self._conn.execute("DELETE FROM sessions WHERE last_active <= ?", (cutoff,))
+        if gone:
+            REGISTRY.inc("talentscout_sessions_expired_total", len(gone))
+        return gone
+
+    def maintain(self):
+        self.spill_idle()
+        self.expire()
+        REGISTRY.observe("talentscout_sessions_resident", len(self._active))
+
+    def spilled(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def report(self) -> Dict:
+        """Resident/spilled counts and approximate memory per resident session."""
+        now = time.time()
+        with self._lock:
+            active = list(self._active.values())
+        sessions = []
+        for s in active:
+            size = session_bytes(s)
+            REGISTRY.observe("talentscout_session_bytes", size)
+            sessions.append({"id": s.id, "bytes": size, "messages": len(s.messages),
+                             "idle_s": round(now - s.last_active, 1)})
+        return {"resident": len(sessions), "spilled": self.spilled(),
+                "resident_bytes": sum(x["bytes"] for x in sessions), "sessions": sessions}
+
+    def close(self):
+        """Spill everything still in memory (a restarted server can resume its sessions)."""
+        self.spill_idle(idle=0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TalentScout session store")
+    parser.add_argument("--path", type=Path, default=SESSION_DB, help="spill file (default: data/sessions.db)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="spilled sessions and their size on disk")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "stats":
+        if not args.path.exists():
+            parser.error(f"{args.path} does not exist")
+        conn = sqlite3.connect(args.path)
+        n, stored, oldest = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(state)), 0), MIN(last_active) FROM sessions"
+        ).fetchone()
+        age = f", oldest unused for {(time.time() - oldest) / 3600:.1f} h" if oldest else ""
+        print(f"{n} spilled sessions, {stored / 1024:.1f} KiB compressed in {args.path}{age}")
+
+if __name__ == "__main__":
+    main()
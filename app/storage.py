@@ -0,0 +1,557 @@
+# app/storage.py
+"""
+Candidate storage backends behind save_candidate_row().
+
+- CsvCandidateStore: the original data/candidates.csv format, now with an
+  inter-process file lock around every write and an in-place truncate for
+  "delete last row" (no full read/rewrite).
+- SqliteCandidateStore: data/candidates.db in WAL mode with an index on the
+  hashed email and soft deletes.
+
+upsert()/upsert_many() check each row against the store's identity index
+(identity.py: email, phone and name+location keys) and merge a returning
+candidate into their existing row instead of appending a duplicate. SQLite
+updates the row in place. A CSV merge appends the merged row and the old row
+becomes superseded: reads skip it, and the file is rewritten without
+superseded rows only once they make up COMPACT_RATIO of it (and at least
+COMPACT_MIN rows), or by `python app/identity.py dedup`. The sidebar preview
+reads the file as is, so it shows superseded versions until then.
+
+Tunables (env, CSV):
+    TALENTSCOUT_CSV_COMPACT_RATIO   superseded share of rows that triggers a rewrite (default 0.5)
+    TALENTSCOUT_CSV_COMPACT_MIN     ... once at least this many rows are superseded (default 1000)
+
+Pick the backend with TALENTSCOUT_STORE=csv|sqlite (default csv).
+
+Export any store to CSV:
+    python app/storage.py export out.csv [--store sqlite]
+"""
+from __future__ import annotations
+import argparse, csv, io, os, sqlite3, threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from helpers import DATA_DIR, Candidate, hash_pii
+from identity import IdentityIndex, dedup_rows, email_key, merge_rows, phone_key
+
+ROW_COLUMNS = list(Candidate().as_row().keys())
+CSV_PATH = DATA_DIR / "candidates.csv"
+SQLITE_PATH = DATA_DIR / "candidates.db"
+COMPACT_RATIO = float(os.getenv("TALENTSCOUT_CSV_COMPACT_RATIO", "0.5"))
+COMPACT_MIN = int(os.getenv("TALENTSCOUT_CSV_COMPACT_MIN", "1000"))
+
+def candidate_row(candidate: Candidate, hashed: bool = True) -> Dict:
+    """Flat row for a candidate, with email/phone replaced by their PII hashes if `hashed`."""
+    row = candidate.as_row()
+    if hashed:
+        row["email"] = hash_pii(row["email"]) if row["email"] else ""
+        row["phone"] = phone_key(row["phone"])  # as entered, like hash_if_needed always stored it
+    return row
+
+def _clean_cell(value) -> str:
+    # Keep every record on a single physical line so tail operations stay O(1).
+    if value is None:
+        return ""
+    return str(value).replace("\r", " ").replace("\n", " ")
+
+# ------------- File locking -------------
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive advisory lock on `<path>.lock` (fcntl on POSIX, msvcrt on Windows)."""
+    lock_path = Path(str(path) + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as fh:
+        if os.name == "nt":
+            import msvcrt
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+def replace_file(path: Path, write) -> None:
+    """Atomically replace `path` with what `write(tmp_path)` produces (caller holds file_lock)."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+# ------------- Backends -------------
+class CandidateStore:
+    """Interface shared by the storage backends."""
+    kind = "base"
+    merge_appends = False  # True: a merge appends the merged row and supersedes the old one
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.identity = IdentityIndex(self)
+        self._listeners: List[Callable] = []
+
+    @property
+    def location(self) -> str:
+        return str(self.path)
+
+    def upsert(self, row: Dict) -> bool:
+        """Save one candidate; True if it merged into an existing row instead of appending."""
+        return self.upsert_many([row])[1] > 0
+
+    def upsert_many(self, rows: List[Dict]) -> Tuple[int, int]:
+        """Save candidates, merging duplicates (also within `rows`); returns (appended, merged)."""
+        raise NotImplementedError
+
+    def subscribe(self, listener: Callable):
+        """Call `listener(written, before, after)` after each upsert, still under the write lock.
+
+        `written` is [(ref, full row as stored, or None if the row was removed)],
+        `before`/`after` the store version around the write; a listener that last
+        saw `before` is current after applying it. Backends may leave some removals
+        (CSV "delete last row") to be noticed through version().
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, written: List[Tuple[object, Optional[Dict]]], before):
+        if self._listeners and written:
+            after = self.version()
+            for listener in self._listeners:
+                listener(written, before, after)
+
+    def version(self):
+        """Cheap token that changes when another writer modifies the store."""
+        raise NotImplementedError
+
+    def iter_refs(self) -> Iterator[Tuple[object, Dict]]:
+        """(row reference, row) for every live row; references are what upserts address."""
+        raise NotImplementedError
+
+    def iter_all_refs(self) -> Iterator[Tuple[object, Dict]]:
+        """Like iter_refs(), including superseded rows, in write order (what the identity index replays)."""
+        return self.iter_refs()
+
+    def superseded(self) -> Set[object]:
+        """References of rows a later merge replaced (still on disk, skipped by reads)."""
+        return set()
+
+    def append(self, row: Dict, email_hash: str = "") -> None:
+        self.append_many([row], [email_hash])
+
+    def append_many(self, rows: List[Dict], email_hashes: Optional[List[str]] = None) -> int:
+        raise NotImplementedError
+
+    def delete_last(self) -> bool:
+        """Remove (or soft-delete) the most recent row; False if there is none."""
+        raise NotImplementedError
+
+    def iter_rows(self) -> Iterator[Dict]:
+        raise NotImplementedError
+
+    def fetch(self, refs: Iterable) -> Dict:
+        """Live rows by reference (full scan here; backends with direct lookups override it)."""
+        wanted = set(refs)
+        return {ref: row for ref, row in self.iter_refs() if ref in wanted}
+
+    def find_by_email_hash(self, key: str) -> List[Dict]:
+        return [r for r in self.iter_rows() if email_key(r.get("email", "")) == key]
+
+    def is_empty(self) -> bool:
+        return next(iter(self.iter_rows()), None) is None
+
+    def count(self) -> int:
+        return sum(1 for _ in self.iter_rows())
+
+    def slice(self, start: int, stop: int) -> List[Dict]:
+        return list(islice(self.iter_rows(), start, stop))
+
+    def export_csv(self, dest: Path) -> int:
+        n = 0
+        with open(dest, "w", newline="", encoding="utf-8") as fh:
+            w = csv.DictWriter(fh, fieldnames=ROW_COLUMNS, extrasaction="ignore")
+            w.writeheader()
+            for row in self.iter_rows():
+                w.writerow(row)
+                n += 1
+        return n
+
+class CsvCandidateStore(CandidateStore):
+    kind = "csv"
+    merge_appends = True
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        # Guards the identity index; never held while listeners run, so readers may take it under their own locks.
+        self._index_lock = threading.Lock()
+        self._offsets = None  # preview.CsvPreview: row-offset index for reading the rows merges supersede
+
+    def append_many(self, rows: List[Dict], email_hashes: Optional[List[str]] = None) -> int:
+        if not rows:
+            return 0
+        with file_lock(self.path):
+            self._append_locked(rows)
+        return len(rows)
+
+    def _append_locked(self, rows: List[Dict]):
+        buf = io.StringIO()
+        w = csv.writer(buf, lineterminator="\n")
+        for row in rows:
+            w.writerow([_clean_cell(row.get(c)) for c in ROW_COLUMNS])
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        with open(self.path, "a", newline="", encoding="utf-8") as fh:
+            if new_file:
+                csv.writer(fh, lineterminator="\n").writerow(ROW_COLUMNS)
+            fh.write(buf.getvalue())
+
+    def _stored(self, refs: Iterable[int]) -> Dict[int, Dict]:
+        if self._offsets is None:
+            from preview import CsvPreview  # deferred: preview imports this module
+            self._offsets = CsvPreview(self.path)
+        return self._offsets.records(refs)
+
+    def upsert_many(self, rows: List[Dict]) -> Tuple[int, int]:
+        if not rows:
+            return 0, 0
+        idx = self.identity
+        with file_lock(self.path):
+            before = self.version()
+            with self._index_lock:
+                idx.ensure_loaded()
+                first_new = idx.next_ref
+                fresh: List[Dict] = []
+                updates: Dict[int, Dict] = {}  # existing row number -> merged-in values
+                for row in rows:
+                    ref = idx.match(row)
+                    if ref is None:
+                        ref = first_new + len(fresh)
+                        fresh.append(dict(row))
+                    elif ref >= first_new:
+                        fresh[ref - first_new] = merge_rows(fresh[ref - first_new], row)
+                    else:
+                        updates[ref] = merge_rows(updates.get(ref, {}), row)
+                    idx.add(ref, row)
+                # Merged rows are appended after the new ones; the rows they replace stay put, superseded.
+                stored = self._stored(updates)
+                written: List[Tuple[int, Optional[Dict]]] = [(first_new + i, row) for i, row in enumerate(fresh)]
+                merged: List[Dict] = []
+                for old, values in updates.items():
+                    row = merge_rows(stored.get(old, {}), values)
+                    ref = first_new + len(fresh) + len(merged)
+                    idx.supersede(old, ref, row)
+                    merged.append(row)
+                    written += [(old, None), (ref, row)]
+                self._append_locked(fresh + merged)
+                idx.synced()
+                dead, live = len(idx.superseded), idx.next_ref - len(idx.superseded)
+            self._notify(written, before)
+            if merged and dead >= COMPACT_MIN and dead >= COMPACT_RATIO * live:
+                self._compact_locked()
+        return len(fresh), len(rows) - len(fresh)
+
+    def superseded(self) -> Set[int]:
+        with self._index_lock:
+            self.identity.ensure_loaded()
+            return self.identity.superseded
+
+    def compact(self) -> int:
+        """Rewrite the file without superseded rows; returns how many were dropped."""
+        if not self.path.exists():
+            return 0
+        with file_lock(self.path):
+            return self._compact_locked()
+
+    def _compact_locked(self) -> int:
+        dead = self.superseded()
+        if not dead:
+            return 0
+
+        def write(tmp: Path):
+            with open(tmp, "w", newline="", encoding="utf-8") as out:
+                w = csv.writer(out, lineterminator="\n")
+                w.writerow(ROW_COLUMNS)
+                for ref, row in self.iter_all_refs():
+                    if ref not in dead:
+                        w.writerow([_clean_cell(row.get(c)) for c in ROW_COLUMNS])
+        replace_file(self.path, write)
+        self.identity.invalidate()  # row numbers changed; indexes notice the new file through version()
+        return len(dead)
+
+    def version(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return "missing"
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def iter_refs(self) -> Iterator[Tuple[int, Dict]]:
+        dead = self.superseded()
+        return ((ref, row) for ref, row in self.iter_all_refs() if ref not in dead)
+
+    def iter_all_refs(self) -> Iterator[Tuple[int, Dict]]:
+        if not self.path.exists():
+            return iter(())
+        return enumerate(self._read_rows())
+
+    def delete_last(self) -> bool:
+        """Truncate the file at the start of its last record (reads only the tail)."""
+        if not self.path.exists():
+            return False
+        with file_lock(self.path), open(self.path, "r+b") as fh:
+            end = fh.seek(0, os.SEEK_END)
+            if end == 0:
+                return False
+            fh.seek(end - 1)
+            if fh.read(1) == b"\n":
+                end -= 1  # ignore the trailing newline
+            # Scan backwards in small blocks for the newline that ends the previous record.
+            start, pos = None, end
+            while pos > 0 and start is None:
+                step = min(4096, pos)
+                pos -= step
+                fh.seek(pos)
+                nl = fh.read(step).rfind(b"\n")
+                if nl != -1:
+                    start = pos + nl + 1
+            if not start:
+                return False  # only the header line is left
+            fh.truncate(start)
+        self.identity.invalidate()
+        return True
+
+    def iter_rows(self) -> Iterator[Dict]:
+        return (row for _, row in self.iter_refs())
+
+    def _read_rows(self) -> Iterator[Dict]:
+        with open(self.path, newline="", encoding="utf-8") as fh:
+            yield from csv.DictReader(fh)
+
+class SqliteCandidateStore(CandidateStore):
+    kind = "sqlite"
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            cols = ", ".join(
+                f"{c} REAL" if c == "years_experience" else f"{c} TEXT NOT NULL DEFAULT ''" for c in ROW_COLUMNS
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TEXT NOT NULL, "
+                f"deleted INTEGER NOT NULL DEFAULT 0, email_hash TEXT NOT NULL DEFAULT '', {cols})"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_candidates_email_hash ON candidates(email_hash)")
+
+    def append_many(self, rows: List[Dict], email_hashes: Optional[List[str]] = None) -> int:
+        if not rows:
+            return 0
+        hashes = list(email_hashes or [])
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        params = []
+        for i, row in enumerate(rows):
+            key = (hashes[i] if i < len(hashes) else "") or email_key(row.get("email", ""))
+            params.append([now, key] + self._values(row))
+        placeholders = ", ".join("?" for _ in range(len(ROW_COLUMNS) + 2))
+        with self._lock:
+            before = self.version()
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO candidates (created_at, email_hash, {', '.join(ROW_COLUMNS)}) VALUES ({placeholders})",
+                    params,
+                )
+                last = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            # Our own commits don't change data_version, so tell the indexes directly.
+            self.identity.invalidate()
+            self._notify([(last - len(rows) + 1 + i, row) for i, row in enumerate(rows)], before)
+        return len(rows)
+
+    def upsert_many(self, rows: List[Dict]) -> Tuple[int, int]:
+        if not rows:
+            return 0, 0
+        idx = self.identity
+        appended = 0
+        cols = ", ".join(ROW_COLUMNS)
+        written: List[Tuple[int, Dict]] = []
+        with self._lock:
+            before = self.version()
+            with self._conn:
+                idx.ensure_loaded()
+                now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                for row in rows:
+                    ref = idx.match(row)
+                    if ref is None:
+                        cur = self._conn.execute(
+                            f"INSERT INTO candidates (created_at, email_hash, {cols}) "
+                            f"VALUES (?, ?, {', '.join('?' for _ in ROW_COLUMNS)})",
+                            [now, email_key(row.get("email", ""))] + self._values(row),
+                        )
+                        ref, merged, appended = cur.lastrowid, row, appended + 1
+                    else:
+                        old = self._conn.execute(f"SELECT {cols} FROM candidates WHERE id = ?", (ref,)).fetchone()
+                        merged = merge_rows(self._as_row(old), row)
+                        self._conn.execute(
+                            f"UPDATE candidates SET email_hash = ?, {', '.join(c + ' = ?' for c in ROW_COLUMNS)} WHERE id = ?",
+                            [email_key(merged.get("email", ""))] + self._values(merged) + [ref],
+                        )
+                    idx.add(ref, row)
+                    written.append((ref, merged))
+            idx.synced()
+            self._notify(written, before)
+        return appended, len(rows) - appended
+
+    @staticmethod
+    def _values(row: Dict) -> List:
+        ye = row.get("years_experience")
+        return [None if (c == "years_experience" and ye in (None, "")) else row.get(c) or "" for c in ROW_COLUMNS]
+
+    def version(self):
+        # Changes when another connection commits; our own writes keep the index current.
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def iter_refs(self) -> Iterator[Tuple[int, Dict]]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            cur = conn.execute(f"SELECT id, {', '.join(ROW_COLUMNS)} FROM candidates WHERE deleted = 0 ORDER BY id")
+            for r in cur:
+                yield r["id"], self._as_row(r)
+        finally:
+            conn.close()
+
+    def dedup(self) -> Tuple[int, int]:
+        """Merge duplicate live rows into the oldest one and soft-delete the rest."""
+        written: List[Tuple[int, Optional[Dict]]] = []
+        with self._lock:
+            before = self.version()
+            with self._conn:
+                refs = list(self.iter_refs())
+                unique, sources = dedup_rows(row for _, row in refs)
+                for merged, group in zip(unique, sources):
+                    if len(group) < 2:
+                        continue
+                    keep = refs[group[0]][0]
+                    self._conn.execute(
+                        f"UPDATE candidates SET email_hash = ?, {', '.join(c + ' = ?' for c in ROW_COLUMNS)} WHERE id = ?",
+                        [email_key(merged.get("email", ""))] + self._values(merged) + [keep],
+                    )
+                    dropped = [refs[i][0] for i in group[1:]]
+                    self._conn.executemany("UPDATE candidates SET deleted = 1 WHERE id = ?", [(i,) for i in dropped])
+                    written += [(keep, merged)] + [(i, None) for i in dropped]
+            self.identity.invalidate()
+            self._notify(written, before)
+        return len(refs), len(unique)
+
+    def delete_last(self) -> bool:
+        with self._lock:
+            before = self.version()
+            with self._conn:
+                last = self._conn.execute(
+                    "SELECT id FROM candidates WHERE deleted = 0 ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+                if last is None:
+                    return False
+                self._conn.execute("UPDATE candidates SET deleted = 1 WHERE id = ?", (last[0],))
+            self.identity.invalidate()
+            self._notify([(last[0], None)], before)
+            return True
+
+    @staticmethod
+    def _as_row(r: sqlite3.Row) -> Dict:
+        return {c: ("" if r[c] is None else r[c]) for c in ROW_COLUMNS}
+
+    def iter_rows(self) -> Iterator[Dict]:
+        # Separate read connection: WAL lets it stream while writers keep appending.
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            cur = conn.execute(f"SELECT {', '.join(ROW_COLUMNS)} FROM candidates WHERE deleted = 0 ORDER BY id")
+            for r in cur:
+                yield self._as_row(r)
+        finally:
+            conn.close()
+
+    def fetch(self, refs: Iterable[int]) -> Dict[int, Dict]:
+        """Live rows by id (ids that are gone are skipped)."""
+        ids = list(refs)
+        out: Dict[int, Dict] = {}
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                for r in self._conn.execute(
+                    f"SELECT id, {', '.join(ROW_COLUMNS)} FROM candidates "
+                    f"WHERE deleted = 0 AND id IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                ):
+                    out[r["id"]] = self._as_row(r)
+        return out
+
+    def find_by_email_hash(self, key: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(ROW_COLUMNS)} FROM candidates WHERE deleted = 0 AND email_hash = ? ORDER BY id",
+                (key,),
+            ).fetchall()
+        return [self._as_row(r) for r in rows]
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM candidates WHERE deleted = 0 LIMIT 1").fetchone() is None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM candidates WHERE deleted = 0").fetchone()[0]
+
+    def slice(self, start: int, stop: int) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(ROW_COLUMNS)} FROM candidates WHERE deleted = 0 ORDER BY id LIMIT ? OFFSET ?",
+                (max(0, stop - start), start),
+            ).fetchall()
+        return [self._as_row(r) for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def open_store(kind: Optional[str] = None, path: Optional[Path] = None) -> CandidateStore:
+    """Open the configured backend (TALENTSCOUT_STORE, default csv)."""
+    kind = (kind or os.getenv("TALENTSCOUT_STORE", "csv")).lower()
+    if kind == "sqlite":
+        return SqliteCandidateStore(path or SQLITE_PATH)
+    if kind == "csv":
+        return CsvCandidateStore(path or CSV_PATH)
+    raise ValueError(f"Unknown candidate store: {kind!r} (expected 'csv' or 'sqlite')")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TalentScout candidate store")
+    parser.add_argument("--store", choices=["csv", "sqlite"], help="backend (default: $TALENTSCOUT_STORE or csv)")
+    parser.add_argument("--path", type=Path, help="store file (default: data/candidates.csv|.db)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    ex = sub.add_parser("export", help="write all live rows to a CSV file")
+    ex.add_argument("dest", type=Path)
+    args = parser.parse_args(argv)
+
+    store = open_store(args.store, args.path)
+    if args.cmd == "export":
+        n = store.export_csv(args.dest)
+        print(f"Exported {n} rows from {store.location} -> {args.dest}")
+
+if __name__ == "__main__":
+    main()
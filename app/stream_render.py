@@ -0,0 +1,90 @@
+# app/stream_render.py
+"""
+Coalesced rendering of a streamed reply.
+
+Repainting a Streamlit placeholder on every token resends the whole growing
+reply each time (O(n²) bytes to the browser for an n-byte answer).
+StreamRenderer buffers tokens and repaints one placeholder only when
+RENDER_INTERVAL seconds have passed since the last paint or RENDER_CHARS new
+characters are waiting, plus once at the end, so the number of paints follows
+the reply's duration rather than its token count.
+
+Per reply it records the time to first painted token (from when the user sent
+the message) and the streaming rate, both in the metrics registry and in the
+turn trace shown by the debug panel.
+
+Tunables (env):
+    TALENTSCOUT_RENDER_INTERVAL   min seconds between repaints (default 0.08)
+    TALENTSCOUT_RENDER_CHARS      repaint early once this many chars are buffered (default 400)
+"""
+from __future__ import annotations
+import os, time
+from typing import Dict, List, Optional
+
+from metrics import REGISTRY, emit
+
+RENDER_INTERVAL = float(os.getenv("TALENTSCOUT_RENDER_INTERVAL", "0.08"))
+RENDER_CHARS = int(os.getenv("TALENTSCOUT_RENDER_CHARS", "400"))
+
+class StreamRenderer:
+    """Feed tokens with add(); call close() when the stream ends (also on errors)."""
+
+    def __init__(self, placeholder, t0: Optional[float] = None,
+                 interval: float = RENDER_INTERVAL, max_chars: int = RENDER_CHARS):
+        self.placeholder = placeholder
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.interval = interval
+        self.max_chars = max_chars
+        self._parts: List[str] = []
+        self._pending = 0       # chars received since the last paint
+        self._last_paint = 0.0
+        self.tokens = 0
+        self.updates = 0
+        self.first_token: Optional[float] = None  # perf_counter() of the first paint
+        self.closed = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def add(self, token: str):
+        if not token:
+            return
+        self._parts.append(token)
+        self.tokens += 1
+        self._pending += len(token)
+        now = time.perf_counter()
+        # The first token is shown at once; after that, repaint by time or size window.
+        if self.first_token is None or now - self._last_paint >= self.interval or self._pending >= self.max_chars:
+            self._paint(now)
+
+    def _paint(self, now: float):
+        if self.first_token is None:
+            self.first_token = now
+        self.placeholder.write(self.text)
+        self._last_paint = now
+        self._pending = 0
+        self.updates += 1
+
+    def close(self, trace: Optional[List[Dict]] = None) -> Dict:
+        """Final repaint (if anything is buffered) and stats; returns the trace event."""
+        if self.closed:
+            return {}
+        self.closed = True
+        end = time.perf_counter()
+        if self._pending:
+            self._paint(end)
+        event: Dict = {"event": "render", "seconds": round(end - self.t0, 4),
+                       "tokens": self.tokens, "updates": self.updates}
+        if self.first_token is not None:
+            ttft = self.first_token - self.t0
+            streamed = end - self.first_token
+            event["ttft"] = round(ttft, 4)
+            REGISTRY.observe("talentscout_render_ttft_seconds", ttft)
+            if self.tokens > 1 and streamed > 0:
+                event["tokens_per_sec"] = round((self.tokens - 1) / streamed, 1)
+                REGISTRY.observe("talentscout_render_tokens_per_second", event["tokens_per_sec"])
+        REGISTRY.inc("talentscout_render_updates_total", self.updates)
+        REGISTRY.inc("talentscout_render_tokens_total", self.tokens)
+        emit(event, trace)
+        return event
@@ -0,0 +1,203 @@
+# app/translation.py
+"""
+Translation cache for the static field prompts.
+
+Translations are keyed by (language code, prompt text, model id) and kept in
+memory plus a small JSON file under data/, so a prompt is translated once per
+language for the lifetime of the deployment instead of once per candidate.
+The model id is the one that answered: a translation made by the fallback
+model is stored under the fallback, and lookups try the route's primary model
+first. New entries are written to disk in batches (SAVE_BATCH entries or
+SAVE_INTERVAL seconds, whichever comes first) and at interpreter exit.
+
+Tunables (env):
+    TALENTSCOUT_TRANSLATION_CACHE          cache file (default data/translations.json)
+    TALENTSCOUT_TRANSLATION_SAVE_BATCH     unsaved entries that trigger a write (default 20)
+    TALENTSCOUT_TRANSLATION_SAVE_INTERVAL  seconds an entry may stay unsaved (default 30)
+
+Pre-warm every language in LANG_NAMES:
+    python app/translation.py warm
+"""
+from __future__ import annotations
+import argparse, asyncio, atexit, json, os, threading, time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from prompts import FIELD_QUESTIONS, LANG_NAMES
+from helpers import DATA_DIR, allm_chat, llm_chat
+from metrics import cache_event
+from routing import route
+
+CACHE_PATH = Path(os.getenv("TALENTSCOUT_TRANSLATION_CACHE", DATA_DIR / "translations.json"))
+SAVE_BATCH = int(os.getenv("TALENTSCOUT_TRANSLATION_SAVE_BATCH", "20"))
+SAVE_INTERVAL = float(os.getenv("TALENTSCOUT_TRANSLATION_SAVE_INTERVAL", "30"))
+
+Key = Tuple[str, str, str]
+
+class TranslationCache:
+    """Thread-safe (lang, text, model) -> translation map persisted as JSON."""
+
+    def __init__(self, path: Optional[Path] = None, save_batch: int = SAVE_BATCH, save_interval: float = SAVE_INTERVAL):
+        self.path = Path(path or CACHE_PATH)
+        self.save_batch = save_batch
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._data: Dict[Key, str] = {}
+        self._unsaved = 0
+        self._unsaved_since = 0.0  # time.monotonic() of the oldest unsaved entry
+        self._load()
+
+    def _load(self):
+        try:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        for e in entries if isinstance(entries, list) else []:
+            try:
+                self._data[(e["lang"], e["text"], e["model"])] = e["translation"]
+            except (KeyError, TypeError):
+                continue
+
+    def get(self, lang: str, text: str, model: Optional[str] = None) -> Optional[str]:
+        """Translation by `model`, or by the translation route's primary then fallback model."""
+        if model:
+            return self._data.get((lang, text, model))
+        r = route("translation")
+        hit = self._data.get((lang, text, r.model))
+        if hit is None and r.fallback:
+            hit = self._data.get((lang, text, r.fallback))
+        return hit
+
+    def put(self, lang: str, text: str, translation: str, model: str, persist: bool = True):
+        """Store what `model` answered; with `persist`, write the file once a batch is due."""
+        with self._lock:
+            self._data[(lang, text, model)] = translation
+            if not self._unsaved:
+                self._unsaved_since = time.monotonic()
+            self._unsaved += 1
+            if persist and (self._unsaved >= self.save_batch
+                            or time.monotonic() - self._unsaved_since >= self.save_interval):
+                self._save_locked()
+
+    def save(self):
+        with self._lock:
+            self._save_locked()
+
+    def flush(self):
+        """Write entries not saved yet (no-op when there are none)."""
+        with self._lock:
+            if self._unsaved:
+                self._save_locked()
+
+    def _save_locked(self):
+        entries = [
+            {"lang": l, "text": t, "model": m, "translation": tr}
+            for (l, t, m), tr in sorted(self._data.items())
+        ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(entries, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)  # atomic: readers never see a half-written file
+        self._unsaved = 0
+
+    def __len__(self):
+        return len(self._data)
+
+_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> TranslationCache:
+    """Process-wide cache (shared by every Streamlit session); unsaved entries are written at exit."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranslationCache()
+                atexit.register(_cache.flush)
+    return _cache
+
+def _translation_messages(text: str, lang_name: str) -> list:
+    return [
+        {"role": "system", "content": f"Translate the following short prompt into {lang_name}. Output only the translation."},
+        {"role": "user", "content": text},
+    ]
+
+def _first_content(resp) -> Optional[str]:
+    out = resp.choices[0].message.content if resp and resp.choices else None
+    return out.strip() if out else None
+
+def _translate_remote(text: str, lang_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """(translation, model that answered); (None, None) on failure."""
+    try:
+        resp, model = llm_chat(_translation_messages(text, lang_name), stream=False, kind="translation", with_model=True)
+    except Exception:
+        return None, None
+    return _first_content(resp), model
+
+def _lookup(text: str, lang: str) -> Optional[str]:
+    """Cached translation, `text` itself when no translation is needed, else None."""
+    if not lang or lang == "en" or lang not in LANG_NAMES:
+        return text
+    hit = get_cache().get(lang, text)
+    cache_event("translation", hit=hit is not None)
+    return hit
+
+def translate(text: str, lang: str, persist: bool = True) -> str:
+    """
+    Translate `text` into language `lang` (a LANG_NAMES code), serving repeats
+    from the cache. English, unknown codes and failed calls return `text`
+    unchanged; failures are not cached so the next call retries.
+    """
+    hit = _lookup(text, lang)
+    if hit is not None:
+        return hit
+    out, model = _translate_remote(text, LANG_NAMES[lang])
+    if out is None:
+        return text
+    get_cache().put(lang, text, out, model, persist=persist)
+    return out
+
+async def atranslate(text: str, lang: str) -> str:
+    """Async translate()."""
+    hit = _lookup(text, lang)
+    if hit is not None:
+        return hit
+    try:
+        resp, model = await allm_chat(_translation_messages(text, LANG_NAMES[lang]), stream=False,
+                                      kind="translation", with_model=True)
+        out = _first_content(resp)
+    except Exception:
+        out = None
+    if out is None:
+        return text
+    # A put may write the batch to disk: small but blocking, so keep it off the event loop.
+    await asyncio.to_thread(get_cache().put, lang, text, out, model)
+    return out
+
+def warm(langs: Optional[Iterable[str]] = None, texts: Optional[Iterable[str]] = None) -> int:
+    """Fill the cache for every (language, prompt) pair; returns the number of new entries."""
+    cache = get_cache()
+    before = len(cache)
+    texts = list(texts or FIELD_QUESTIONS.values())  # reused for every language: a generator would run dry
+    for lang in langs or LANG_NAMES:
+        for text in texts:
+            translate(text, lang, persist=False)
+    cache.save()
+    return len(cache) - before
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TalentScout translation cache")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    w = sub.add_parser("warm", help="pre-translate FIELD_QUESTIONS for every language")
+    w.add_argument("--lang", action="append", help="language code (repeatable); default: all of LANG_NAMES")
+    sub.add_parser("stats", help="show cache size and location")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "warm":
+        added = warm(args.lang)
+        print(f"Added {added} translations ({len(get_cache())} cached) -> {CACHE_PATH}")
+    else:
+        print(f"{len(get_cache())} translations cached in {CACHE_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# bench/bench_langid.py
+"""
+Language-ID benchmark: app/langid.py (script histogram + restricted langdetect)
+against the previous langdetect-only detector, on a small labelled set of
+typical candidate messages (field answers, chit-chat, mixed script).
+
+Reports accuracy, mean/p95 per-call latency with profiles loaded, and the
+cold first-call cost (fresh interpreter, import + first detection).
+
+    python bench/bench_langid.py
+    python bench/bench_langid.py --repeat 50 --json langid.json
+"""
+from __future__ import annotations
+import argparse, json, statistics, subprocess, sys, time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+from run_bench import percentile
+
+# (text, expected code; None = stay in English)
+SAMPLES: List[Tuple[str, Optional[str]]] = [
+    ("Priya Sharma", None),
+    ("priya.sharma@example.com", None),
+    ("+91 98765 43210", None),
+    ("5 years", None),
+    ("Backend Developer, SRE", None),
+    ("Bangalore, India", None),
+    ("Python, Django, PostgreSQL, Docker", None),
+    ("What does the next round look like?", None),
+    ("I have been working as a data engineer for about four years", None),
+    ("मेरा नाम प्रिया शर्मा है", "hi"),
+    ("मैं पाँच साल से बैकएंड डेवलपर के रूप में काम कर रही हूँ", "hi"),
+    ("मी पुण्यात राहते आणि मला पायथन आवडते", "mr"),
+    ("আমার নাম প্রিয়া, আমি কলকাতায় থাকি", "bn"),
+    ("என் பெயர் பிரியா, நான் சென்னையில் வசிக்கிறேன்", "ta"),
+    ("నా పేరు ప్రియ, నేను హైదరాబాద్‌లో ఉంటాను", "te"),
+    ("എന്റെ പേര് പ്രിയ, ഞാൻ കൊച്ചിയിലാണ് താമസിക്കുന്നത്", "ml"),
+    ("ನನ್ನ ಹೆಸರು ಪ್ರಿಯಾ, ನಾನು ಬೆಂಗಳೂರಿನಲ್ಲಿ ವಾಸಿಸುತ್ತೇನೆ", "kn"),
+    ("ਮੇਰਾ ਨਾਮ ਪ੍ਰਿਆ ਹੈ, ਮੈਂ ਅੰਮ੍ਰਿਤਸਰ ਵਿੱਚ ਰਹਿੰਦੀ ਹਾਂ", "pa"),
+    ("મારું નામ પ્રિયા છે, હું અમદાવાદમાં રહું છું", "gu"),
+    ("ମୋ ନାମ ପ୍ରିୟା, ମୁଁ ଭୁବନେଶ୍ୱରରେ ରହେ", "or"),
+    ("میرا نام پریا ہے اور میں لاہور میں رہتی ہوں", "ur"),
+    ("Hola, me llamo Priya y vivo en Madrid", "es"),
+    ("Bonjour, je m'appelle Priya et j'habite à Paris", "fr"),
+    ("Hallo, ich heiße Priya und wohne in Berlin", "de"),
+    ("Olá, meu nome é Priya e moro em Lisboa", "pt"),
+    ("Ciao, mi chiamo Priya e vivo a Milano", "it"),
+    ("Привет, меня зовут Прия, я живу в Москве", "ru"),
+    ("こんにちは、私の名前はプリヤです", "ja"),
+    ("你好，我叫普丽雅，我住在上海", "zh-cn"),
+    ("नमस्ते", "hi"),
+    ("வணக்கம்", "ta"),
+]
+
+def legacy_guess(text: str) -> Optional[str]:
+    """The langdetect-only detector this benchmark compares against (verbatim logic)."""
+    from langdetect import detect_langs, LangDetectException, DetectorFactory
+    DetectorFactory.seed = 0
+    sanitized = "".join(ch for ch in text if ch.isalpha() or ch.isspace())
+    if not sanitized:
+        return None
+    has_non_latin = any(ord(ch) > 127 and ch.isalpha() for ch in sanitized)
+    alpha_count = sum(1 for ch in sanitized if ch.isalpha())
+    if alpha_count < (3 if has_non_latin else 10):
+        return None
+    try:
+        candidates = detect_langs(sanitized)
+        if not candidates:
+            return None
+        top = max(candidates, key=lambda lp: lp.prob)
+        if top.lang != "en" and top.prob >= 0.80:
+            return top.lang
+    except LangDetectException:
+        pass
+    return None
+
+COLD_SNIPPETS = {
+    "legacy": "import sys; sys.path[:0] = [{bench!r}]; from bench_langid import legacy_guess as g",
+    "langid": "import sys; sys.path[:0] = [{app!r}]; from langid import guess_language_code as g",
+}
+
+def cold_ms(name: str, text: str) -> float:
+    """Import + first call in a fresh interpreter (what the first user turn pays)."""
+    code = (
+        "import time; t0 = time.perf_counter(); "
+        + COLD_SNIPPETS[name].format(bench=str(BENCH_DIR), app=str(APP_DIR))
+        + f"; g({text!r}); print((time.perf_counter() - t0) * 1000)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def measure(name: str, fn: Callable[[str], Optional[str]], repeat: int) -> Dict:
+    fn(SAMPLES[0][0])  # load profiles before timing
+    correct, misses, times, native_times = 0, [], [], []
+    for text, expected in SAMPLES:
+        got = fn(text)
+        if got == expected:
+            correct += 1
+        else:
+            misses.append(f"{text[:24]!r}: {got} != {expected}")
+        native = any(ord(ch) > 0x024F and ch.isalpha() for ch in text)
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(text)
+            dt = time.perf_counter() - t0
+            times.append(dt)
+            if native:
+                native_times.append(dt)
+    latin, native = SAMPLES[0][0], SAMPLES[13][0]
+    return {
+        "detector": name,
+        "accuracy": round(correct / len(SAMPLES), 3),
+        "mean_us": round(statistics.fmean(times) * 1e6, 1),
+        "p95_us": round(percentile(times, 95) * 1e6, 1),
+        "native_script_mean_us": round(statistics.fmean(native_times) * 1e6, 1),
+        "cold_latin_ms": round(cold_ms(name, latin), 1),
+        "cold_native_script_ms": round(cold_ms(name, native), 1),
+        "misses": misses,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Language-ID accuracy/latency benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per sample")
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    from langid import guess_language_code
+    reports = [measure("legacy", legacy_guess, args.repeat), measure("langid", guess_language_code, args.repeat)]
+    cols = [c for c in reports[0] if c != "misses"]
+    print(" | ".join(cols))
+    for r in reports:
+        print(" | ".join(str(r[c]) for c in cols))
+    for r in reports:
+        for m in r["misses"]:
+            print(f"  {r['detector']} miss: {m}")
+    if args.json:
+        args.json.write_text(json.dumps(reports, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# bench/bench_search.py
+"""
+Candidate search benchmark: app/search.py's SkillIndex against grepping the
+CSV with pandas (what recruiters did before), on a synthetic store.
+
+- build_s        first index build (one pass over the store)
+- index_mb       memory held by the index (tracemalloc, separate untimed build)
+- query_p50/p95  per-query latency, rows for the top hits included
+- pandas_ms      read_csv + filter of the same queries (--pandas)
+
+    python bench/bench_search.py --rows 500000
+    python bench/bench_search.py --rows 100000 --store sqlite --pandas --json search.json
+"""
+from __future__ import annotations
+import argparse, csv, json, random, sys, tempfile, time, tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+from run_bench import percentile
+
+TECHS = ["Python", "Django", "Flask", "FastAPI", "Java", "Spring", "Go", "Rust", "JavaScript", "TypeScript",
+         "React", "Vue", "Angular", "Node.js", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kafka", "Docker",
+         "k8s", "AWS", "GCP", "Azure", "Terraform", "C++", "C#", ".NET", "Scala", "Spark", "Airflow", "PyTorch"]
+POSITIONS = ["Backend Developer", "Frontend Developer", "Full Stack Engineer", "Data Engineer", "SRE",
+             "DevOps Engineer", "ML Engineer", "Mobile Developer", "QA Engineer", "Platform Engineer"]
+CITIES = ["Pune, India", "Bangalore, India", "Hyderabad, India", "Chennai, India", "Delhi, India",
+          "Mumbai, India", "Berlin, Germany", "London, UK", "Austin, USA", "Toronto, Canada"]
+
+QUERIES = [
+    ("python:3, +django, k8s", "backend", "", 2, 8),
+    ("react, typescript", "", "pune", None, None),
+    ("+go, kafka:2, postgres", "platform engineer", "", 5, None),
+    ("java, spring, aws", "", "bangalore, hyderabad", 3, 10),
+    ("pytorch:3, python, spark", "ml engineer", "", None, None),
+]
+
+def make_rows(n: int, seed: int = 0) -> List[Dict]:
+    rnd = random.Random(seed)
+    return [
+        {
+            "full_name": f"Candidate {i}", "email": f"hash:{i:012x}…", "phone": "",
+            "years_experience": rnd.choice(["", str(rnd.randint(0, 25))]),
+            "desired_positions": ", ".join(rnd.sample(POSITIONS, rnd.randint(1, 2))),
+            "location": rnd.choice(CITIES), "tech_stack": ", ".join(rnd.sample(TECHS, rnd.randint(2, 7))),
+        }
+        for i in range(n)
+    ]
+
+def write_store(kind: str, path: Path, rows: List[Dict]):
+    from storage import ROW_COLUMNS, open_store
+    if kind == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            w = csv.DictWriter(fh, fieldnames=ROW_COLUMNS, lineterminator="\n")
+            w.writeheader()
+            w.writerows(rows)
+        return open_store("csv", path)
+    store = open_store("sqlite", path)
+    for i in range(0, len(rows), 10000):
+        store.append_many(rows[i:i + 10000])
+    return store
+
+def pandas_query(path: Path, skills: str, position: str, location: str, lo, hi) -> int:
+    import pandas as pd
+    df = pd.read_csv(path, dtype=str).fillna("")
+    mask = pd.Series(True, index=df.index)
+    for item in skills.split(","):
+        name = item.strip().lstrip("+").split(":")[0]
+        if item.strip().startswith("+"):
+            mask &= df["tech_stack"].str.contains(name, case=False, regex=False)
+    if location:
+        mask &= df["location"].str.contains("|".join(l.strip() for l in location.split(",")), case=False)
+    years = pd.to_numeric(df["years_experience"], errors="coerce")
+    if lo is not None:
+        mask &= years >= lo
+    if hi is not None:
+        mask &= years <= hi
+    return int(mask.sum())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skill index search benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--store", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per query")
+    parser.add_argument("--pandas", action="store_true", help="also time a pandas read_csv + filter per query (CSV)")
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    from search import JobQuery, SkillIndex
+    tmp = Path(tempfile.mkdtemp())
+    store = write_store(args.store, tmp / ("candidates.csv" if args.store == "csv" else "candidates.db"),
+                        make_rows(args.rows))
+
+    t0 = time.perf_counter()
+    index = SkillIndex(store)
+    index.refresh()
+    build = time.perf_counter() - t0
+    # Memory: a second build under tracemalloc (tracing slows it down, so it isn't timed).
+    tracemalloc.start()
+    SkillIndex(store).refresh()
+    index_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+
+    times: List[float] = []
+    hits = []
+    for skills, pos, loc, lo, hi in QUERIES:
+        q = JobQuery.parse(skills, pos, loc, lo, hi, limit=20)
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            res = index.search(q)
+            times.append(time.perf_counter() - t)
+        hits.append(len(res))
+    report = {
+        "store": args.store, "rows": args.rows, "build_s": round(build, 2), "index_mb": round(index_mb, 1),
+        "query_p50_ms": round(1000 * percentile(times, 50), 2), "query_p95_ms": round(1000 * percentile(times, 95), 2),
+        "hits": hits,
+    }
+    if args.pandas and args.store == "csv":
+        t = time.perf_counter()
+        for skills, pos, loc, lo, hi in QUERIES:
+            pandas_query(store.path, skills, pos, loc, lo, hi)
+        report["pandas_ms"] = round(1000 * (time.perf_counter() - t) / len(QUERIES), 1)
+    print(json.dumps(report, indent=2))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# bench/bench_startup.py
+"""
+Startup benchmark for the Streamlit app (no browser, no API calls).
+
+Each measurement runs in a fresh interpreter using Streamlit's AppTest:
+
+- first_run_ms   first execution of app.py (imports + cached resources), i.e.
+                 what the first page load of a new pod pays
+- rerun_*_ms     later executions of the script (every widget interaction)
+- ready_ms       until resources.warm_up() reports ready (trees that have it)
+
+Point --app-dir at another checkout to compare, e.g.
+
+    git worktree add /tmp/ts-before HEAD~1
+    python bench/bench_startup.py --app-dir app /tmp/ts-before/app
+"""
+from __future__ import annotations
+import argparse, json, os, statistics, subprocess, sys, tempfile
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent / "app"
+
+from run_bench import percentile
+
+PROBE = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app_dir, reruns = sys.argv[1], int(sys.argv[2])
+sys.path.insert(0, app_dir)
+at = AppTest.from_file(app_dir + "/app.py", default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+first = time.perf_counter() - t0
+if at.exception:
+    raise SystemExit(f"app raised: {at.exception}")
+ready = None
+try:
+    from resources import RESOURCES
+    while not RESOURCES.ready():
+        time.sleep(0.005)
+    ready = time.perf_counter() - t0
+except ImportError:
+    pass
+times = []
+for _ in range(reruns):
+    t = time.perf_counter()
+    at.run()
+    times.append(time.perf_counter() - t)
+print(json.dumps({"first": first, "ready": ready, "reruns": times}))
+"""
+
+def probe(app_dir: Path, reruns: int) -> Dict:
+    env = dict(os.environ, GROQ_API_KEY=os.getenv("GROQ_API_KEY", "bench"))
+    tmp = tempfile.mkdtemp(prefix="talentscout-startup-")
+    env.setdefault("TALENTSCOUT_TRANSLATION_CACHE", f"{tmp}/translations.json")
+    env.setdefault("TALENTSCOUT_QUESTION_BANK", f"{tmp}/question_bank.json")
+    out = subprocess.run([sys.executable, "-c", PROBE, str(app_dir), str(reruns)],
+                         capture_output=True, text=True, env=env, check=True, cwd=tmp)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def summarize(app_dir: Path, runs: List[Dict]) -> Dict:
+    firsts = [r["first"] for r in runs]
+    reruns = [t for r in runs for t in r["reruns"]]
+    readies = [r["ready"] for r in runs if r["ready"] is not None]
+    return {
+        "app_dir": str(app_dir),
+        "first_run_ms": round(statistics.median(firsts) * 1000, 1),
+        "ready_ms": round(statistics.median(readies) * 1000, 1) if readies else None,
+        "rerun_mean_ms": round(statistics.fmean(reruns) * 1000, 2),
+        "rerun_p95_ms": round(percentile(reruns, 95) * 1000, 2),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold start / rerun benchmark for app.py")
+    parser.add_argument("--app-dir", type=Path, nargs="+", default=[APP_DIR], help="app/ directories to compare")
+    parser.add_argument("--processes", type=int, default=3, help="fresh interpreters per app dir")
+    parser.add_argument("--reruns", type=int, default=20, help="script reruns per interpreter")
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for app_dir in args.app_dir:
+        app_dir = app_dir.resolve()
+        reports.append(summarize(app_dir, [probe(app_dir, args.reruns) for _ in range(args.processes)]))
+    cols = list(reports[0].keys())
+    print(" | ".join(cols))
+    for r in reports:
+        print(" | ".join(str(r[c]) for c in cols))
+    if args.json:
+        args.json.write_text(json.dumps(reports, indent=2), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# bench/mock_groq.py
+"""
+Local stand-in for Groq's OpenAI-compatible chat completions endpoint.
+
+Serves POST /openai/v1/chat/completions (streamed as SSE or not) with
+configurable latency, token rate, chunking and error injection, and answers
+the app's prompts with plausible content:
+
+- "Tech stack: ..." (JSON mode or not) -> {tech: [questions]} for each listed tech
+- JSON mode + delta extraction prompt  -> {asked_field: newest message}
+- JSON mode otherwise                  -> {}
+- plain text                           -> a filler reply of `reply_tokens` words
+
+Point the app at it with GROQ_BASE_URL=http://127.0.0.1:<port> GROQ_API_KEY=mock.
+
+    python bench/mock_groq.py --port 8765 --latency 0.2 --token-rate 300
+"""
+from __future__ import annotations
+import argparse, json, random, re, sys, threading, time, uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+@dataclass
+class MockConfig:
+    latency: float = 0.15        # seconds before the first byte
+    token_rate: float = 400.0    # completion tokens per second (0 = instant)
+    chunk_tokens: int = 4        # tokens per streamed SSE chunk
+    error_rate: float = 0.0      # fraction of requests failing
+    error_status: int = 429      # status used for injected errors
+    reply_tokens: int = 40       # length of plain-text replies
+    seed: Optional[int] = None
+
+LIST_FIELDS = ("desired_positions", "tech_stack")
+ASKED_RE = re.compile(r"The candidate was just asked for: (\w+)\.")
+NEW_MSG_RE = re.compile(r"New message: (.*)\Z", re.S)
+STACK_RE = re.compile(r"Tech stack: ([^\n]*)")
+# Questions about as long as real ones (~25 tokens), so streaming them has something to overlap.
+QUESTION_FILLER = "how would you design, test and debug it in production under real load and failure conditions"
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def build_reply(body: Dict, cfg: MockConfig) -> str:
+    messages = body.get("messages") or []
+    last_user = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+    json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+    stack = STACK_RE.search(last_user)
+    if stack:  # question generation: JSON mode, or streamed JSON without it
+        techs = [t.strip() for t in stack.group(1).split(",") if t.strip()]
+        return json.dumps({t: [f"Q{i} about {t}: {QUESTION_FILLER}?" for i in range(1, 4)] for t in techs})
+    if json_mode:
+        asked, new = ASKED_RE.search(last_user), NEW_MSG_RE.search(last_user)
+        if asked and new:
+            field, value = asked.group(1), new.group(1).strip()
+            if field == "years_experience":
+                nums = re.findall(r"\d+(?:\.\d+)?", value)
+                return json.dumps({field: float(nums[0])} if nums else {})
+            if field in LIST_FIELDS:
+                return json.dumps({field: [v.strip() for v in re.split(r",| and ", value) if v.strip()]})
+            return json.dumps({field: value})
+        return "{}"
+    system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+    if system.startswith("Translate"):
+        return f"[translated] {last_user}"
+    return " ".join(["lorem"] * cfg.reply_tokens)
+
+class MockGroqServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: Tuple[str, int], cfg: MockConfig):
+        super().__init__(addr, _Handler)
+        self.cfg = cfg
+        self.rng = random.Random(cfg.seed)
+        self.rng_lock = threading.Lock()
+        self.requests = 0
+
+    def handle_error(self, request, client_address):
+        # Clients hang up mid-response on purpose (cancelled speculative streams, timeouts).
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def should_fail(self) -> bool:
+        with self.rng_lock:
+            self.requests += 1
+            return self.cfg.error_rate > 0 and self.rng.random() < self.cfg.error_rate
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    server: MockGroqServer
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "invalid JSON"}})
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+        cfg = self.server.cfg
+        time.sleep(cfg.latency)
+        if self.server.should_fail():
+            return self._json(
+                cfg.error_status,
+                {"error": {"message": "injected error", "type": "rate_limit_exceeded"}},
+                {"retry-after": "0"},
+            )
+
+        reply = build_reply(body, cfg)
+        words = re.findall(r"\S+\s*", reply) or [reply]
+        prompt_tokens = sum(_approx_tokens(m.get("content") or "") for m in body.get("messages") or [])
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(words),
+                 "total_tokens": prompt_tokens + len(words)}
+        rid, model, created = f"chatcmpl-{uuid.uuid4().hex[:12]}", body.get("model", "mock"), int(time.time())
+
+        if not body.get("stream"):
+            if cfg.token_rate:
+                time.sleep(len(words) / cfg.token_rate)
+            return self._json(200, {
+                "id": rid, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(payload):
+            self.wfile.write(f"data: {payload}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        step = max(1, cfg.chunk_tokens)
+        for i in range(0, len(words), step):
+            if cfg.token_rate:
+                time.sleep(step / cfg.token_rate)
+            send(json.dumps({
+                "id": rid, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {"content": "".join(words[i:i + step])}, "finish_reason": None}],
+            }))
+        send(json.dumps({
+            "id": rid, "object": "chat.completion.chunk", "created": created, "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "x_groq": {"id": rid, "usage": usage},
+        }))
+        send("[DONE]")
+
+def start_mock_server(cfg: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0) -> MockGroqServer:
+    """Start the mock in a daemon thread (port 0 = pick a free port)."""
+    server = MockGroqServer((host, port), cfg or MockConfig())
+    threading.Thread(target=server.serve_forever, name="mock-groq", daemon=True).start()
+    return server
+
+def add_config_args(parser: argparse.ArgumentParser):
+    d = MockConfig()
+    parser.add_argument("--latency", type=float, default=d.latency, help="seconds before first byte")
+    parser.add_argument("--token-rate", type=float, default=d.token_rate, help="completion tokens/s (0 = instant)")
+    parser.add_argument("--chunk-tokens", type=int, default=d.chunk_tokens, help="tokens per SSE chunk")
+    parser.add_argument("--error-rate", type=float, default=d.error_rate, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=d.error_status, help="HTTP status for injected errors")
+    parser.add_argument("--reply-tokens", type=int, default=d.reply_tokens, help="length of plain-text replies")
+    parser.add_argument("--seed", type=int, default=None)
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(args.latency, args.token_rate, args.chunk_tokens, args.error_rate,
+                      args.error_status, args.reply_tokens, args.seed)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock Groq chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_args(parser)
+    args = parser.parse_args(argv)
+    server = MockGroqServer((args.host, args.port), config_from_args(args))
+    print(f"Mock Groq listening on {server.url} (set GROQ_BASE_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# bench/run_bench.py
+"""
+Offline TalentScout benchmark against the mock Groq server.
+
+Drives scripted candidate conversations through the screening engine
+(app/engine.py: incremental extraction, localized field prompts, question
+bank, acknowledgement and free-chat streams) with N concurrent sessions, then
+reports per-turn p50/p95 latency (whole turn and first visible reply), time
+to the first and to all tech questions on the questions turn, LLM
+calls and tokens per candidate, and throughput. No API key or network access
+is needed.
+
+    python bench/run_bench.py --candidates 40 --concurrency 8
+    python bench/run_bench.py --max-llm-calls-per-candidate 6   # CI regression gate
+"""
+from __future__ import annotations
+import argparse, json, os, statistics, sys, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent / "app"
+
+from mock_groq import add_config_args, config_from_args, start_mock_server
+
+# ------------- Scripted candidates -------------
+FIRST = ["Priya", "Arjun", "Meera", "Rahul", "Sara", "Vikram", "Ananya", "Karthik"]
+LAST = ["Sharma", "Iyer", "Khan", "Das", "Patel", "Nair", "Gupta", "Reddy"]
+STACKS = [
+    "Python, Django, PostgreSQL, Docker",
+    "Java, Spring Boot, Kafka, k8s",
+    "JavaScript, React, Node.js, MongoDB",
+    "Go, gRPC, Redis, Kubernetes",
+    "python, docker, AWS",
+]
+
+def candidate_script(i: int) -> Dict:
+    """Turns for candidate `i`; every third answers one field in a way the local rules can't parse."""
+    first, last = FIRST[i % len(FIRST)], LAST[(i // len(FIRST)) % len(LAST)]
+    noisy = i % 3 == 0
+    return {
+        "lang": "hi" if i % 5 == 4 else "en",
+        "turns": [
+            f"{first} {last}",
+            f"{first.lower()}.{last.lower()}{i}@example.com",
+            f"+91 98{i:08d}",
+            "I have been working for about 4 years now" if noisy else f"{2 + i % 8}",
+            "Backend Developer, SRE",
+            "Bangalore, India",
+            STACKS[i % len(STACKS)],
+            "What does the next round look like?",
+            "bye",
+        ],
+    }
+
+# ------------- Candidate driver -------------
+@dataclass
+class CandidateResult:
+    turn_seconds: List[float] = field(default_factory=list)
+    first_reply_seconds: List[float] = field(default_factory=list)
+    first_question_seconds: List[float] = field(default_factory=list)
+    all_questions_seconds: List[float] = field(default_factory=list)
+    llm_calls: int = 0
+    tokens: int = 0
+    errors: int = 0
+
+def run_candidate(i: int, pipelined: Optional[bool] = None) -> CandidateResult:
+    """Play one scripted candidate through the real engine (the same path app.py and server.py use)."""
+    from engine import ScreeningSession, iter_turn
+
+    script = candidate_script(i)
+    sess = ScreeningSession(pipelined=pipelined)
+    if script["lang"] != "en":
+        sess.set_language(script["lang"])
+    res = CandidateResult()
+    for text in script["turns"]:
+        t0, first, first_q = time.perf_counter(), None, None
+        try:
+            for ev in iter_turn(sess, text):
+                if first is None and ev.type in ("message", "token"):
+                    first = time.perf_counter() - t0
+                # Trees without progressive questions only emit the final "questions" event.
+                if first_q is None and ev.type in ("question", "questions"):
+                    first_q = time.perf_counter() - t0
+                    res.first_question_seconds.append(first_q)
+                if ev.type == "questions":
+                    res.all_questions_seconds.append(time.perf_counter() - t0)
+        except Exception:
+            res.errors += 1
+        if first is not None:
+            res.first_reply_seconds.append(first)
+        res.turn_seconds.append(time.perf_counter() - t0)
+        for e in sess.last_trace:
+            if e["event"] == "llm_call":
+                res.llm_calls += 1
+                res.tokens += (e.get("prompt_tokens") or 0) + (e.get("completion_tokens") or 0)
+        if sess.ended:
+            break
+    return res
+
+# ------------- Reporting -------------
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+def summarize(results: List[CandidateResult], wall: float, concurrency: int) -> Dict:
+    turns = [t for r in results for t in r.turn_seconds]
+    firsts = [t for r in results for t in r.first_reply_seconds]
+    first_q = [t for r in results for t in r.first_question_seconds]
+    all_q = [t for r in results for t in r.all_questions_seconds]
+    n = max(1, len(results))
+    return {
+        "candidates": len(results),
+        "concurrency": concurrency,
+        "turns": len(turns),
+        "turn_p50_ms": round(percentile(turns, 50) * 1000, 2),
+        "turn_p95_ms": round(percentile(turns, 95) * 1000, 2),
+        "first_reply_p50_ms": round(percentile(firsts, 50) * 1000, 2),
+        "first_reply_p95_ms": round(percentile(firsts, 95) * 1000, 2),
+        "first_question_p50_ms": round(percentile(first_q, 50) * 1000, 2),
+        "all_questions_p50_ms": round(percentile(all_q, 50) * 1000, 2),
+        "turn_mean_ms": round(statistics.fmean(turns) * 1000, 2) if turns else 0.0,
+        "llm_calls_per_candidate": round(sum(r.llm_calls for r in results) / n, 2),
+        "tokens_per_candidate": round(sum(r.tokens for r in results) / n, 1),
+        "errors": sum(r.errors for r in results),
+        "wall_seconds": round(wall, 2),
+        "candidates_per_second": round(len(results) / wall, 2) if wall else 0.0,
+        "turns_per_second": round(len(turns) / wall, 2) if wall else 0.0,
+    }
+
+def reset_caches(tmp: Path):
+    """Point the translation cache and question bank at fresh files so a round starts cold."""
+    import question_bank, translation
+    tmp.mkdir(parents=True, exist_ok=True)
+    translation.CACHE_PATH = tmp / "translations.json"
+    question_bank.BANK_PATH = tmp / "question_bank.json"
+    translation._cache = None
+    question_bank._bank = None
+
+def run(candidates: int, concurrency: int, pipelined: Optional[bool] = None) -> Dict:
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda i: run_candidate(i, pipelined), range(candidates)))
+    return summarize(results, time.perf_counter() - t0, concurrency)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline TalentScout benchmark (mock Groq)")
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8],
+                        help="concurrent sessions; several values run several rounds")
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    parser.add_argument("--warm", action="store_true", help="keep translation/question caches between rounds")
+    parser.add_argument("--max-llm-calls-per-candidate", type=float, help="fail if exceeded")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if per-turn p95 exceeds this")
+    parser.add_argument("--serial", action="store_true", help="disable pipelined turns (extraction, then reply)")
+    add_config_args(parser)
+    args = parser.parse_args(argv)
+
+    server = start_mock_server(config_from_args(args))
+    tmp = Path(tempfile.mkdtemp(prefix="talentscout-bench-"))
+    os.environ.update({
+        "GROQ_BASE_URL": server.url,
+        "GROQ_API_KEY": "mock",
+        "GROQ_MAX_RETRIES": os.getenv("GROQ_MAX_RETRIES", "2"),
+        # Never touch the real data/ caches.
+        "TALENTSCOUT_TRANSLATION_CACHE": str(tmp / "translations.json"),
+        "TALENTSCOUT_QUESTION_BANK": str(tmp / "question_bank.json"),
+    })
+    sys.path.insert(0, str(APP_DIR))
+
+    reports = []
+    for i, c in enumerate(args.concurrency):
+        if not args.warm:
+            reset_caches(tmp / f"round-{i}")
+        reports.append(run(args.candidates, c, pipelined=False if args.serial else None))
+    cols = list(reports[0].keys())
+    print(" | ".join(cols))
+    for r in reports:
+        print(" | ".join(str(r[c]) for c in cols))
+    if args.json:
+        args.json.write_text(json.dumps(reports, indent=2), encoding="utf-8")
+
+    failed = False
+    for r in reports:
+        if args.max_llm_calls_per_candidate is not None and r["llm_calls_per_candidate"] > args.max_llm_calls_per_candidate:
+            print(f"FAIL: {r['llm_calls_per_candidate']} LLM calls/candidate > {args.max_llm_calls_per_candidate}")
+            failed = True
+        if args.max_p95_ms is not None and r["turn_p95_ms"] > args.max_p95_ms:
+            print(f"FAIL: turn p95 {r['turn_p95_ms']} ms > {args.max_p95_ms} ms")
+            failed = True
+    server.shutdown()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# app/ is a script directory with flat imports (`from storage import ...`), as when run via streamlit.
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
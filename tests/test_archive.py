@@ -0,0 +1,120 @@
+# tests/test_archive.py
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from archive import CandidateArchive, archive_writes, to_table
+from identity import email_key, phone_key
+from storage import CsvCandidateStore
+
+T0 = datetime(2026, 10, 1, 9, 30, tzinfo=timezone.utc)
+
+def row(name="Priya Sharma", email="priya@example.com", phone="", techs="Python, Django", years="5", location="Pune"):
+    return {"full_name": name, "email": email, "phone": phone, "years_experience": years,
+            "desired_positions": "Backend Developer", "location": location, "tech_stack": techs}
+
+@pytest.fixture
+def archive(tmp_path):
+    return CandidateArchive(tmp_path / "archive")
+
+def test_to_table_types_and_hashes():
+    t = to_table([row(phone="+91 98765 43210", years=""), row(email="hash:abc", years="n/a", techs="")], T0)
+    r0, r1 = t.to_pylist()
+    assert r0["email"] == email_key("priya@example.com") and r0["phone"] == phone_key("+919876543210")
+    assert r0["years_experience"] is None and r1["years_experience"] is None
+    assert r0["tech_stack"] == ["Python", "Django"] and r1["tech_stack"] == []
+    assert r1["email"] == "hash:abc"  # already hashed
+    assert r0["saved_at"] == T0
+
+def test_round_trip_partitions(archive):
+    archive.append([row()], T0)
+    archive.append([row(name="Rahul Kumar", email="rahul@example.com", techs="Go")], T0 + timedelta(days=1))
+    assert [p.name for p in archive.partitions()] == ["saved_date=2026-10-01", "saved_date=2026-10-02"]
+    t = archive.read(["full_name", "years_experience", "tech_stack"])
+    assert t.column_names == ["full_name", "years_experience", "tech_stack"]
+    assert t.to_pylist() == [
+        {"full_name": "Priya Sharma", "years_experience": 5.0, "tech_stack": ["Python", "Django"]},
+        {"full_name": "Rahul Kumar", "years_experience": 5.0, "tech_stack": ["Go"]},
+    ]
+    assert archive.read(["full_name"], since="2026-10-02").column("full_name").to_pylist() == ["Rahul Kumar"]
+    assert archive.read(["full_name"], until="2026-10-01").column("full_name").to_pylist() == ["Priya Sharma"]
+
+def test_resaves_count_once_newest_wins(archive):
+    archive.append([row()], T0)
+    archive.append([row(techs="Python, Django, Go")], T0 + timedelta(hours=1))
+    archive.append([row(email="", phone="98765 43210", name="Anita Desai", location="Delhi", techs="Java")], T0)
+    archive.append([row(email="", phone="9876543210", name="Anita Desai", location="Delhi", techs="Java, Spring")],
+                   T0 + timedelta(days=1))
+    archive.append([row(email="", name=" PRIYA sharma", location="pune ", techs="Rust")], T0)
+    archive.append([row(email="", name="Priya Sharma", location="Pune", techs="Rust, C")], T0 + timedelta(minutes=5))
+    assert archive.read(dedupe=False).num_rows == 6
+    assert sorted(r["tech_stack"] for r in archive.read(["tech_stack"]).to_pylist()) == [
+        ["Java", "Spring"], ["Python", "Django", "Go"], ["Rust", "C"]]
+    assert dict(archive.top_skills()) == {"python": 1, "django": 1, "go": 1, "java": 1, "spring": 1, "rust": 1, "c": 1}
+    # Within a range, the newest record in that range counts.
+    assert archive.read(["tech_stack"], until="2026-10-01").num_rows == 3
+
+def test_rows_without_identity_are_all_kept(archive):
+    archive.append([row(email="", location=""), row(email="", location="")], T0)
+    assert archive.read(["full_name"]).num_rows == 2
+
+def test_ties_go_to_the_later_row(archive):
+    archive.append([row(techs="Go"), row(techs="Go, Rust")], T0)
+    assert archive.read(["tech_stack"]).to_pylist() == [{"tech_stack": ["Go", "Rust"]}]
+
+def test_migrate_then_live_appends_and_second_migrate(archive, tmp_path):
+    store = CsvCandidateStore(tmp_path / "candidates.csv")
+    store.upsert_many([row(), row(name="Rahul Kumar", email="rahul@example.com", techs="Go")])
+    day = date(2026, 9, 30)
+    assert archive.migrate(store.iter_rows(), day)[0] == 2
+    assert archive.migrate(store.iter_rows(), day)[0] == 2
+    archive.append([row(techs="Python, Django, Rust")], T0)
+    assert archive.read(dedupe=False).num_rows == 5
+    assert sorted(n for _, n in archive.top_skills()) == [1, 1, 1, 1]
+
+def test_compact_keeps_newest_per_candidate(archive):
+    for minutes, techs in ((0, "Go"), (10, "Go, Rust"), (5, "Go, C")):
+        archive.append([row(techs=techs)], T0 + timedelta(minutes=minutes))
+    archive.append([row(name="Rahul Kumar", email="rahul@example.com", techs="Java")], T0)
+    assert archive.compact() == [("2026-10-01", 4, 2)]
+    (part,) = archive.partitions()
+    assert len(archive.files(part)) == 1
+    assert archive.read(["full_name", "tech_stack"], dedupe=False).to_pylist() == [
+        {"full_name": "Rahul Kumar", "tech_stack": ["Java"]},
+        {"full_name": "Priya Sharma", "tech_stack": ["Go", "Rust"]},
+    ]
+    assert archive.compact() == []
+
+class StuckExecutor:
+    """Executor whose queue is always full."""
+    def __init__(self):
+        self.ticks = []
+        self.hooks = []
+
+    def submit(self, kind, fn, *args, **kwargs):
+        return None
+
+    def every(self, kind, interval, fn):
+        self.ticks.append(fn)
+
+    def on_shutdown(self, fn):
+        self.hooks.append(fn)
+
+def test_store_hook_never_writes_under_the_store_lock(archive, tmp_path, monkeypatch):
+    executor = StuckExecutor()
+    store = CsvCandidateStore(tmp_path / "candidates.csv")
+    archive_writes(store, archive, executor, max_spill=3)
+    calls = []
+    append = archive.append
+    monkeypatch.setattr(archive, "append", lambda rows, *a: calls.append(len(rows)) or append(rows, *a))
+    store.upsert_many([row(), row(name="Rahul Kumar", email="rahul@example.com")])
+    store.upsert(row(techs="Rust"))
+    store.upsert(row(name="Anita Desai", email="anita@example.com"))  # spill full: dropped
+    assert calls == []
+    executor.ticks[0]()
+    assert calls == [3]
+    assert archive.read(["full_name"]).num_rows == 2  # Priya's merged row replaces her first one
+    executor.hooks[0]()
+    assert calls == [3]  # nothing left to flush
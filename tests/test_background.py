@@ -0,0 +1,56 @@
+# tests/test_background.py
+import pytest
+
+from background import WriteBehind
+
+class InlineExecutor:
+    """Executor that never ticks; the test flushes by hand."""
+    def submit(self, kind, fn, *args, **kwargs):
+        return None
+
+    def every(self, kind, interval, fn):
+        pass
+
+    def on_shutdown(self, fn):
+        pass
+
+class FlakyStore:
+    location = "flaky.csv"
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.rows = []
+
+    def upsert_many(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.rows += rows
+        return len(rows), 0
+
+def writer(store, retries=3):
+    return WriteBehind(store, InlineExecutor(), max_rows=100, max_pending=100, retries=retries)
+
+def test_failed_flush_is_retried():
+    store = FlakyStore(failures=2)
+    w = writer(store)
+    fut = w.add({"full_name": "Priya Sharma"})
+    assert w.flush() == 0 and w.flush() == 0
+    assert not fut.done() and isinstance(w.last_error, OSError)
+    assert w.flush() == 1
+    assert fut.result() is True and w.last_error is None
+    assert store.rows == [{"full_name": "Priya Sharma"}]
+
+def test_future_fails_after_the_last_retry():
+    store = FlakyStore(failures=5)
+    w = writer(store, retries=2)
+    first = w.add({"full_name": "Priya Sharma"})
+    w.flush()
+    second = w.add({"full_name": "Rahul Kumar"})
+    w.flush()
+    with pytest.raises(OSError, match="disk full"):
+        first.result(timeout=0)
+    assert not second.done() and len(w) == 1  # one attempt left
+    w.flush()
+    assert isinstance(second.exception(timeout=0), OSError)
+    assert len(w) == 0 and store.rows == []
@@ -0,0 +1,153 @@
+# tests/test_identity.py
+import hashlib
+
+import pytest
+
+import storage
+from identity import (dedup_csv, dedup_rows, email_key, fingerprint, identity_keys, merge_rows,
+                      normalize_phone, normalize_text, phone_key, phone_keys)
+from storage import CsvCandidateStore, SqliteCandidateStore
+
+def row(name="Priya Sharma", email="priya@example.com", phone="", location="Pune", techs="Python", **extra):
+    out = {"full_name": name, "email": email, "phone": phone, "years_experience": "",
+           "desired_positions": "", "location": location, "tech_stack": techs}
+    out.update(extra)
+    return out
+
+# ------------- Keys -------------
+def test_normalizers():
+    assert normalize_phone("+91 98765-43210") == "+919876543210"
+    assert normalize_phone("0091 (98765) 43210+") == "00919876543210"
+    assert normalize_text("  São Paulo,  BR ") == "sao paulo br"
+
+def test_hashed_and_raw_values_share_keys():
+    assert email_key("priya@example.com") == email_key(email_key("priya@example.com"))
+    assert phone_keys("+91 98765-43210")[0] == phone_keys("+919876543210")[0]
+    assert phone_key(phone_key("+91 98765 43210")) == phone_key("+91 98765 43210")
+    assert email_key("") == phone_key("") == "" and phone_keys("") == []
+
+def test_phone_hash_matches_what_older_saves_stored():
+    legacy = "hash:" + hashlib.sha256(b"+91 98765 43210").hexdigest()[:12] + "…"
+    assert phone_key(" +91 98765 43210") == legacy
+    assert phone_keys("+91 98765 43210")[1] == legacy
+    assert phone_keys("+919876543210") == [phone_key("+919876543210")]  # already normalized: one key
+
+def test_identity_keys_strongest_first():
+    keys = identity_keys(row(phone="98765 43210"))
+    assert [k[:2] for k in keys] == ["e:", "p:", "p:", "f:"]
+    assert identity_keys(row(email="", location="")) == []
+    assert fingerprint("PRIYA  Sharma", "pune") == fingerprint("priya sharma", "Pune")
+    assert fingerprint("Priya Sharma", "") == ""
+
+# ------------- Merging -------------
+def test_merge_rows_newer_wins_and_lists_union():
+    old = row(techs="Python, Django", desired_positions="Backend Developer", years_experience="4")
+    new = row(email="", techs="django, Go", desired_positions="SRE", years_experience="5", location="")
+    merged = merge_rows(old, new)
+    assert merged["email"] == "priya@example.com"  # empty values never overwrite
+    assert merged["location"] == "Pune"
+    assert merged["years_experience"] == "5"
+    assert merged["tech_stack"] == "Python, Django, Go"
+    assert merged["desired_positions"] == "Backend Developer, SRE"
+
+def test_dedup_rows_groups_by_any_key():
+    rows = [
+        row(),                                                      # 0
+        row(name="Rahul Kumar", email="rahul@example.com", location="Delhi"),
+        row(email="", phone="+91 98765 43210", techs="Go"),         # 2: same name+location as 0
+        row(name="Someone Else", email="", phone="+91 98765-43210"),  # 3: same phone as 2 (merged into 0)
+    ]
+    unique, sources = dedup_rows(rows)
+    assert sources == [[0, 2, 3], [1]]
+    assert unique[0]["tech_stack"] == "Python, Go"
+    assert unique[0]["full_name"] == "Someone Else"
+
+def test_dedup_rows_fingerprint_does_not_override_contacts():
+    rows = [row(), row(email="other.priya@example.com")]
+    unique, sources = dedup_rows(rows)
+    assert sources == [[0], [1]]
+
+# ------------- Stores -------------
+@pytest.fixture
+def csv_store(tmp_path):
+    return CsvCandidateStore(tmp_path / "candidates.csv")
+
+def physical_rows(store):
+    return [r["full_name"] for _, r in store.iter_all_refs()]
+
+def test_csv_merge_appends_and_supersedes(csv_store):
+    assert csv_store.upsert_many([row(), row(name="Rahul Kumar", email="rahul@example.com")]) == (2, 0)
+    inode = csv_store.path.stat().st_ino
+    assert csv_store.upsert(row(techs="Go")) is True
+    assert csv_store.path.stat().st_ino == inode  # appended, not rewritten
+    assert physical_rows(csv_store) == ["Priya Sharma", "Rahul Kumar", "Priya Sharma"]
+    assert csv_store.superseded() == {0}
+    live = list(csv_store.iter_refs())
+    assert [ref for ref, _ in live] == [1, 2]
+    assert live[1][1]["tech_stack"] == "Python, Go"
+    assert csv_store.count() == 2
+
+def test_csv_merges_chain_and_notify(csv_store):
+    seen = []
+    csv_store.subscribe(lambda written, before, after: seen.append(written))
+    csv_store.upsert(row())
+    csv_store.upsert(row(techs="Go"))
+    csv_store.upsert(row(email="", phone="+91 98765 43210", techs="Rust"))
+    assert seen[1] == [(0, None), (1, merge_rows(row(), row(techs="Go")))]
+    assert [ref for ref, _ in seen[2]] == [1, 2]
+    assert csv_store.superseded() == {0, 1}
+    (ref, live), = csv_store.iter_refs()
+    assert ref == 2 and live["tech_stack"] == "Python, Go, Rust" and live["phone"]
+
+def test_csv_replay_from_another_process(csv_store):
+    csv_store.upsert_many([row(), row(name="Rahul Kumar", email="rahul@example.com")])
+    csv_store.upsert(row(techs="Go"))
+    other = CsvCandidateStore(csv_store.path)
+    assert other.superseded() == {0}
+    assert other.upsert(row(techs="Rust")) is True
+    assert csv_store.superseded() == {0, 2}
+    assert [r["tech_stack"] for r in csv_store.iter_rows()] == ["Python", "Python, Go, Rust"]
+
+def test_csv_delete_last_merge_revives_old_row(csv_store):
+    csv_store.upsert(row())
+    csv_store.upsert(row(techs="Go"))
+    assert csv_store.delete_last()
+    assert [r["tech_stack"] for r in csv_store.iter_rows()] == ["Python"]
+    assert csv_store.superseded() == set()
+
+def test_csv_compacts_above_threshold(csv_store, monkeypatch):
+    monkeypatch.setattr(storage, "COMPACT_MIN", 2)
+    monkeypatch.setattr(storage, "COMPACT_RATIO", 1.0)
+    csv_store.upsert_many([row(), row(name="Rahul Kumar", email="rahul@example.com")])
+    csv_store.upsert(row(techs="Go"))
+    assert len(physical_rows(csv_store)) == 3  # 1 superseded: below COMPACT_MIN
+    csv_store.upsert(row(techs="Rust"))
+    assert physical_rows(csv_store) == ["Rahul Kumar", "Priya Sharma"]
+    assert csv_store.superseded() == set()
+    assert csv_store.upsert(row(techs="C")) is True
+    assert [r["tech_stack"] for r in csv_store.iter_rows()] == ["Python", "Python, Go, Rust, C"]
+
+def test_dedup_csv_drops_superseded(csv_store):
+    csv_store.upsert_many([row(), row(name="Rahul Kumar", email="rahul@example.com")])
+    csv_store.upsert(row(techs="Go"))
+    assert dedup_csv(csv_store.path) == (3, 2)
+    assert physical_rows(csv_store) == ["Priya Sharma", "Rahul Kumar"]
+    assert [r["tech_stack"] for r in csv_store.iter_rows()] == ["Python, Go", "Python"]
+
+def test_hashed_save_merges_into_legacy_hashed_row(csv_store):
+    legacy = row(email="", phone=phone_key("+91 98765 43210"), location="")
+    csv_store.upsert(legacy)
+    assert csv_store.upsert(row(email="", phone="+91 98765 43210", techs="Go")) is True
+    assert csv_store.upsert(row(email="", phone="+919876543210", techs="Rust")) is True  # via the raw row's keys
+    (live,) = csv_store.iter_rows()
+    assert live["tech_stack"] == "Python, Go, Rust"
+
+def test_sqlite_merges_in_place(tmp_path):
+    store = SqliteCandidateStore(tmp_path / "candidates.db")
+    try:
+        store.upsert_many([row(), row(name="Rahul Kumar", email="rahul@example.com")])
+        assert store.upsert(row(techs="Go")) is True
+        assert [(ref, r["tech_stack"]) for ref, r in store.iter_refs()] == [(1, "Python, Go"), (2, "Python")]
+        assert store.superseded() == set()
+    finally:
+        store.close()
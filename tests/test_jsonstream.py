@@ -0,0 +1,61 @@
+# tests/test_jsonstream.py
+import json
+
+import pytest
+
+from jsonstream import JSONPairParser
+
+def parse(text, size=None):
+    p = JSONPairParser()
+    out = []
+    step = size or len(text) or 1
+    for i in range(0, len(text), step):
+        out += p.feed(text[i:i + step])
+    return out, p
+
+DOC = json.dumps({"Python": ["What is a GIL?", "Explain \"yield\""], "Django": ["ORM vs raw SQL?"]})
+
+def test_whole_object():
+    pairs, p = parse(DOC)
+    assert pairs == [("Python", "What is a GIL?"), ("Python", 'Explain "yield"'), ("Django", "ORM vs raw SQL?")]
+    assert p.done
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_any_chunking_gives_the_same_pairs(size):
+    assert parse(DOC, size)[0] == parse(DOC)[0]
+
+def test_item_is_returned_by_the_chunk_that_closes_it():
+    p = JSONPairParser()
+    assert p.feed('{"Go": ["What is a gorou') == []
+    assert p.feed('tine?", "Chan') == [("Go", "What is a goroutine?")]
+    assert p.feed('nels?"]}') == [("Go", "Channels?")]
+    assert p.done
+
+def test_escapes_split_across_chunks():
+    text = '{"C\\u002b\\u002b": ["new \\\\ delete\\n", "caf\\u00e9"]}'
+    assert parse(text, 1)[0] == [("C++", "new \\ delete\n"), ("C++", "café")]
+
+def test_fence_and_preamble_are_skipped():
+    text = 'Sure! Here you go:\n```json\n{"SQL": ["JOIN types?"]}\n```'
+    pairs, p = parse(text, 4)
+    assert pairs == [("SQL", "JOIN types?")]
+    assert p.done
+
+def test_bare_string_value_is_one_item():
+    assert parse('{"Rust": "Ownership?", "Go": ["GC?"]}', 3)[0] == [("Rust", "Ownership?"), ("Go", "GC?")]
+
+def test_non_string_values_are_skipped():
+    text = ('{"n": 3, "obj": {"a": ["not", "this"], "b": "}"}, "Java": [1, {"x": "]"}, "JVM?", null, "GC?"],'
+            ' "t": true, "K8s": ["Pods?"]}')
+    assert parse(text, 1)[0] == [("Java", "JVM?"), ("Java", "GC?"), ("K8s", "Pods?")]
+
+def test_nothing_after_the_closing_brace():
+    pairs, p = parse('{"A": ["1"]} {"B": ["2"]}')
+    assert pairs == [("A", "1")]
+    assert p.done
+
+def test_empty_and_truncated_input():
+    assert parse("")[0] == []
+    pairs, p = parse('{"A": ["one", "tw')
+    assert pairs == [("A", "one")]
+    assert not p.done
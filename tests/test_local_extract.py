@@ -0,0 +1,63 @@
+# tests/test_local_extract.py
+import pytest
+
+from helpers import local_extract
+
+@pytest.mark.parametrize("field, text, expected", [
+    ("full_name", "Priya Sharma", "Priya Sharma"),
+    ("full_name", "my name is Rahul Kumar Singh", "Rahul Kumar Singh"),
+    ("full_name", "priya sharma", "priya sharma"),
+    ("email", "it's priya@example.com.", "priya@example.com"),
+    ("phone", "+91 98765-43210", "+91 98765-43210"),
+    ("years_experience", "about 5 years of experience", 5.0),
+    ("location", "I live in Pune, India", "Pune, India"),
+    ("desired_positions", "Backend Developer, SRE", ["Backend Developer", "SRE"]),
+    ("tech_stack", "Python, Django; k8s", ["Python", "Django", "k8s"]),
+    ("tech_stack", "Python and Django", ["Python", "Django"]),
+    ("tech_stack", "React, Node.js & MongoDB", ["React", "Node.js", "MongoDB"]),
+    ("location", "I am from Pune", "Pune"),
+    ("location", "I'm from Chennai", "Chennai"),
+    ("location", "based in Bengaluru, India", "Bengaluru, India"),
+    ("desired_positions", "IT Support", ["IT Support"]),
+])
+def test_confident_answers(field, text, expected):
+    cand = local_extract(field, text)
+    assert cand is not None
+    assert getattr(cand, field) == expected
+
+@pytest.mark.parametrize("field, text", [
+    ("full_name", "hello there"),
+    ("full_name", "good morning"),
+    ("full_name", "Hi, I am Priya"),
+    ("full_name", "I am a developer"),
+    ("full_name", "I dont know"),
+    ("full_name", "I don't know"),
+    ("full_name", "Priya"),                      # one word: could be anything, ask the LLM
+    ("location", "not sure yet"),
+    ("location", "I do not know"),
+    ("location", "no idea"),
+    ("location", "I am a developer"),
+    ("location", "it is Pune"),
+    ("tech_stack", "I use Python"),
+    ("tech_stack", "mostly python"),
+    ("tech_stack", "Python and whatever"),
+    ("desired_positions", "Any"),
+    ("desired_positions", "whatever"),
+    ("desired_positions", "anything backend"),
+    ("tech_stack", "none"),
+    ("tech_stack", "None."),
+    ("tech_stack", "Python, not sure"),
+    ("desired_positions", "not sure"),
+    ("desired_positions", "undecided"),
+    ("phone", "2023-01-01"),
+    ("phone", "01/02/2023"),
+    ("phone", "12345"),
+    ("years_experience", "a few"),
+    ("email", "a@x.com or b@y.com"),
+])
+def test_non_answers_fall_back_to_llm(field, text):
+    assert local_extract(field, text) is None
+
+def test_no_field_or_long_text():
+    assert local_extract(None, "Priya Sharma") is None
+    assert local_extract("full_name", "x " * 150) is None
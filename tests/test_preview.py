@@ -0,0 +1,112 @@
+# tests/test_preview.py
+import csv, io, os
+
+import pytest
+
+from preview import CsvPreview
+
+HEADER = ["full_name", "email", "tech_stack"]
+
+def line(*values) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(values)
+    return buf.getvalue().encode("utf-8")
+
+@pytest.fixture
+def path(tmp_path):
+    p = tmp_path / "candidates.csv"
+    p.write_bytes(line(*HEADER) + line("Priya Sharma", "priya@example.com", "Python, Django"))
+    return p
+
+def names(preview):
+    return [r["full_name"] for _, r in sorted(preview.records(range(len(preview))).items())]
+
+def bump_mtime(p):
+    st = os.stat(p)
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+def test_initial_index(path):
+    preview = CsvPreview(path)
+    assert len(preview) == 1
+    assert preview.columns == HEADER
+    assert preview.records([0]) == {0: {"full_name": "Priya Sharma", "email": "priya@example.com",
+                                        "tech_stack": "Python, Django"}}
+
+def test_append_is_incremental(path):
+    preview = CsvPreview(path)
+    len(preview)
+    with open(path, "ab") as fh:
+        fh.write(line("Rahul Kumar", "rahul@example.com", "Go"))
+    assert names(preview) == ["Priya Sharma", "Rahul Kumar"]
+    assert preview.resets == 0
+
+def test_quoted_newline_and_partial_write(path):
+    preview = CsvPreview(path)
+    with open(path, "ab") as fh:
+        fh.write(line("Multi Line", "m@example.com", "Python,\nRust"))
+        fh.write(b"Half Writ")
+    assert names(preview) == ["Priya Sharma", "Multi Line"]
+    assert preview.records([1])[1]["tech_stack"] == "Python,\nRust"
+    with open(path, "ab") as fh:
+        fh.write(b"ten,h@example.com,C\n")
+    assert names(preview)[-1] == "Half Written"
+
+def test_delete_last_drops_offsets(path):
+    with open(path, "ab") as fh:
+        fh.write(line("Rahul Kumar", "rahul@example.com", "Go"))
+    preview = CsvPreview(path)
+    assert len(preview) == 2
+    size = len(line(*HEADER)) + len(line("Priya Sharma", "priya@example.com", "Python, Django"))
+    os.truncate(path, size)
+    assert names(preview) == ["Priya Sharma"]
+    assert preview.resets == 0
+
+def test_truncate_then_append_longer_row_resets(path):
+    """Delete-last then append between refreshes: same inode, size >= what was indexed."""
+    with open(path, "ab") as fh:
+        fh.write(line("Rahul Kumar", "rahul@example.com", "Go"))
+    preview = CsvPreview(path)
+    assert len(preview) == 2
+    data = path.read_bytes()
+    cut = data.rindex(b"Rahul")
+    with open(path, "r+b") as fh:
+        fh.truncate(cut)
+        fh.seek(cut)
+        fh.write(line("Anita Desai", "anita.desai@example.com", "Java, Spring, Kafka"))
+    assert names(preview) == ["Priya Sharma", "Anita Desai"]
+    assert preview.records([1])[1]["tech_stack"] == "Java, Spring, Kafka"
+    assert preview.resets == 1
+
+def test_same_size_rewrite_resets(path):
+    preview = CsvPreview(path)
+    len(preview)
+    data = path.read_bytes().replace(b"Priya Sharma", b"Meera Iyer12")
+    with open(path, "r+b") as fh:
+        fh.write(data)
+    bump_mtime(path)
+    assert names(preview) == ["Meera Iyer12"]
+    assert preview.resets == 1
+
+def test_truncate_mid_row_resets(path):
+    preview = CsvPreview(path)
+    len(preview)
+    os.truncate(path, os.path.getsize(path) - 5)  # 'ngo"\n'
+    with open(path, "ab") as fh:
+        fh.write(b'n"\n')
+    assert names(preview) == ["Priya Sharma"]
+    assert preview.records([0])[0]["tech_stack"] == "Python, Djan"
+    assert preview.resets == 1
+
+def test_replaced_file_resets(path, tmp_path):
+    preview = CsvPreview(path)
+    len(preview)
+    other = tmp_path / "new.csv"
+    other.write_bytes(line(*HEADER) + line("Rahul Kumar", "rahul@example.com", "Go"))
+    os.replace(other, path)
+    assert names(preview) == ["Rahul Kumar"]
+    assert preview.resets == 1
+
+def test_missing_file(tmp_path):
+    preview = CsvPreview(tmp_path / "nope.csv")
+    assert len(preview) == 0
+    assert preview.rows(0, 10).empty
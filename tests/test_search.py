@@ -0,0 +1,90 @@
+# tests/test_search.py
+import pytest
+
+from search import JobQuery, SkillIndex
+from storage import CsvCandidateStore
+
+def row(name, email, techs, positions="Backend Developer", location="Pune", years="5"):
+    return {"full_name": name, "email": email, "phone": "", "years_experience": years,
+            "desired_positions": positions, "location": location, "tech_stack": techs}
+
+@pytest.fixture
+def store(tmp_path):
+    s = CsvCandidateStore(tmp_path / "candidates.csv")
+    s.upsert_many([
+        row("Priya Sharma", "priya@example.com", "Python, Django, k8s", years="6"),
+        row("Rahul Kumar", "rahul@example.com", "Python, Flask", location="Delhi", years="2"),
+        row("Anita Desai", "anita@example.com", "Java, Spring", positions="Frontend Developer", years=""),
+    ])
+    return s
+
+def names(matches):
+    return [m.row["full_name"] for m in matches]
+
+def test_parse_weights_required_and_aliases():
+    q = JobQuery.parse("python:3, +Django, k8s, go:x, , +:2", positions="Backend Developer",
+                       locations="Pune, Delhi", min_years=2, limit=5)
+    assert q.skills == {"python": 3.0, "django": 1.0, "kubernetes": 1.0, "go": 1.0}
+    assert q.required == {"django"}
+    assert q.positions == ["Backend Developer"]
+    assert q.locations == ["Pune", "Delhi"]
+    assert (q.min_years, q.max_years, q.limit) == (2, None, 5)
+    assert q.max_score == 6.0 + 1.0
+
+def test_parse_empty():
+    q = JobQuery.parse()
+    assert q.skills == {} and q.required == set() and q.max_score == 0.0
+
+def test_ranking_by_weight(store):
+    index = SkillIndex(store)
+    matches = index.search(JobQuery.parse("python:2, k8s"))
+    assert names(matches) == ["Priya Sharma", "Rahul Kumar"]
+    assert [m.score for m in matches] == [3.0, 2.0]
+    assert matches[0].matched == ["python", "kubernetes"]
+
+def test_required_and_filters(store):
+    index = SkillIndex(store)
+    assert names(index.search(JobQuery.parse("python, +flask"))) == ["Rahul Kumar"]
+    assert names(index.search(JobQuery.parse("python", locations="pune"))) == ["Priya Sharma"]
+    assert names(index.search(JobQuery.parse("python", min_years=3))) == ["Priya Sharma"]
+    # Unknown years fail any range.
+    assert names(index.search(JobQuery.parse(positions="frontend", max_years=50))) == []
+
+def test_no_skills_lists_newest_first(store):
+    index = SkillIndex(store)
+    assert names(index.search(JobQuery.parse(limit=2))) == ["Anita Desai", "Rahul Kumar"]
+
+def test_merge_tombstones_old_document(store):
+    index = SkillIndex(store)
+    index.refresh()
+    store.upsert(row("Rahul Kumar", "rahul@example.com", "Rust", location="Delhi", years="2"))
+    matches = index.search(JobQuery.parse("rust"))
+    assert names(matches) == ["Rahul Kumar"]
+    assert "Flask" in matches[0].row["tech_stack"]
+    assert len(index) == 3
+
+def test_catches_up_on_appends_by_other_writers(store):
+    index = SkillIndex(store)
+    index.refresh()
+    CsvCandidateStore(store.path).upsert(row("Meera Iyer", "meera@example.com", "Go"))
+    assert names(index.search(JobQuery.parse("go"))) == ["Meera Iyer"]
+    assert len(index) == 4
+
+def test_rebuilds_after_truncate_and_append_by_other_writers(store):
+    index = SkillIndex(store)
+    index.refresh()
+    other = CsvCandidateStore(store.path)
+    assert other.delete_last()
+    other.upsert(row("Vikram Rao Menon", "vikram@example.com", "Golang, gRPC, Postgres, Redis"))
+    assert names(index.search(JobQuery.parse("java"))) == []
+    assert names(index.search(JobQuery.parse("golang"))) == ["Vikram Rao Menon"]
+    assert len(index) == 3
+
+def test_catches_up_on_merges_by_other_writers(store):
+    index = SkillIndex(store)
+    index.refresh()
+    CsvCandidateStore(store.path).upsert(row("Rahul Kumar", "rahul@example.com", "Rust", location="Delhi"))
+    matches = index.search(JobQuery.parse("python"))
+    assert names(matches) == ["Rahul Kumar", "Priya Sharma"]
+    assert matches[0].ref == 3 and "Rust" in matches[0].row["tech_stack"]
+    assert len(index) == 3
@@ -0,0 +1,65 @@
+# tests/test_translation.py
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import translation
+from routing import route
+from translation import TranslationCache
+
+def reply(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    c = TranslationCache(tmp_path / "translations.json", save_batch=3, save_interval=3600)
+    monkeypatch.setattr(translation, "_cache", c)
+    return c
+
+def saved(c):
+    return json.loads(c.path.read_text(encoding="utf-8")) if c.path.exists() else []
+
+def test_keyed_by_the_model_that_answered(cache, monkeypatch):
+    r = route("translation")
+    monkeypatch.setattr(translation, "llm_chat", lambda *a, **kw: (reply(" Hola "), r.fallback))
+    assert translation.translate("Hello", "es") == "Hola"
+    assert cache.get("es", "Hello", r.fallback) == "Hola"
+    assert cache.get("es", "Hello", r.model) is None
+    assert cache.get("es", "Hello") == "Hola"  # primary missing: the fallback's translation serves
+    cache.put("es", "Hello", "Hola!", r.model)
+    assert cache.get("es", "Hello") == "Hola!"
+
+def test_failed_calls_are_not_cached(cache, monkeypatch):
+    def boom(*a, **kw):
+        raise RuntimeError("down")
+    monkeypatch.setattr(translation, "llm_chat", boom)
+    assert translation.translate("Hello", "es") == "Hello"
+    assert len(cache) == 0
+
+def test_writes_are_batched(cache):
+    cache.put("es", "a", "A", "m")
+    cache.put("fr", "a", "A", "m")
+    assert saved(cache) == []
+    cache.put("de", "a", "A", "m")
+    assert len(saved(cache)) == 3
+    cache.put("it", "a", "A", "m")
+    cache.flush()
+    assert {e["lang"] for e in saved(cache)} == {"es", "fr", "de", "it"}
+    assert TranslationCache(cache.path).get("it", "a", "m") == "A"
+
+def test_interval_forces_a_write(tmp_path):
+    c = TranslationCache(tmp_path / "t.json", save_batch=100, save_interval=0)
+    c.put("es", "a", "A", "m")
+    assert len(saved(c)) == 1
+
+def test_english_needs_no_call(cache, monkeypatch):
+    monkeypatch.setattr(translation, "llm_chat", None)
+    assert translation.translate("Hello", "en") == "Hello"
+
+def test_warm_reuses_a_texts_generator_for_every_language(cache, monkeypatch):
+    monkeypatch.setattr(translation, "llm_chat", lambda messages, **kw: (reply("x:" + messages[1]["content"]), "m"))
+    added = translation.warm(["es", "fr"], (t for t in ["Name?", "Email?"]))
+    assert added == 4
+    assert {(l, t) for l, t, _ in cache._data} == {("es", "Name?"), ("es", "Email?"), ("fr", "Name?"), ("fr", "Email?")}
+    assert len(saved(cache)) == 4